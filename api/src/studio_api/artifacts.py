@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gzip
+import json
+from functools import lru_cache
+from typing import Any
+
+from minio import Minio
+from minio.error import S3Error
+
+from studio_api.settings import settings
+from studio_api.token_columns import TOKEN_COLUMNS_FORMAT, TokenColumnsFormatError, decode_token_columns
+
+
+class ResultDetailUnavailable(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=1)
+def _minio_client() -> Minio:
+    return Minio(
+        settings.minio_endpoint,
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        secure=settings.minio_secure,
+    )
+
+
+def _read_object(key: str) -> bytes:
+    try:
+        response = _minio_client().get_object(settings.minio_bucket, key)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+    except (S3Error, OSError) as exc:
+        raise ResultDetailUnavailable(f"Artifact {key} could not be fetched: {exc}") from exc
+
+
+# Result artifacts are written once per run, so cached copies never go stale.
+@lru_cache(maxsize=settings.result_detail_cache_size)
+def _fetch_result_detail(key: str, encoding: str | None) -> dict[str, Any]:
+    body = _read_object(key)
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def _merge_detail(result_json: dict[str, Any]) -> dict[str, Any]:
+    if not isinstance(result_json.get("detail_ref"), dict):
+        return result_json
+    ref = result_json["detail_ref"]
+    detail = _fetch_result_detail(ref["key"], ref.get("encoding"))
+    return {**result_json, **{field: detail[field] for field in ref.get("fields", []) if field in detail}}
+
+
+def hydrate_result(result_json: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Merge offloaded heavy fields back into a stored result.
+
+    Fields offloaded to the JSON artifact (``detail_ref``) or carried only by the token-columns
+    artifact (``token_artifact.fields``) are attached as plain lists; other results pass through.
+    """
+    if not result_json:
+        return result_json
+    hydrated = _merge_detail(result_json)
+    if _token_fields(result_json):
+        columns = _token_columns(result_json["token_artifact"])
+        hydrated = {
+            **hydrated,
+            **{name: values if name == "tokens" else values.tolist() for name, values in columns.items()},
+        }
+    return hydrated
+
+
+@lru_cache(maxsize=settings.result_detail_cache_size)
+def fetch_token_artifact(key: str) -> bytes:
+    return _read_object(key)
+
+
+def _token_fields(result_json: dict[str, Any]) -> list[str]:
+    """Token fields that live only in the result's token-columns artifact."""
+    ref = result_json.get("token_artifact")
+    if not isinstance(ref, dict) or ref.get("format") != TOKEN_COLUMNS_FORMAT:
+        return []
+    return list(ref.get("fields", []))
+
+
+def _token_columns(ref: dict[str, Any]) -> dict[str, Any]:
+    try:
+        return decode_token_columns(fetch_token_artifact(ref["key"]))
+    except TokenColumnsFormatError as exc:
+        raise ResultDetailUnavailable(f"Artifact {ref['key']} is not readable: {exc}") from exc
+
+
+def compare_input(result_json: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Result with per-token arrays attached, preferring the columnar artifact over JSON detail."""
+    ref = (result_json or {}).get("token_artifact")
+    if isinstance(ref, dict) and ref.get("format") == TOKEN_COLUMNS_FORMAT:
+        if _token_fields(result_json):
+            # The artifact holds the only copy of the token arrays.
+            return {**_merge_detail(result_json), **_token_columns(ref)}
+        try:
+            return {**result_json, **decode_token_columns(fetch_token_artifact(ref["key"]))}
+        except (ResultDetailUnavailable, TokenColumnsFormatError):
+            # Fall back to the JSON copy of the token arrays.
+            pass
+    return hydrate_result(result_json)
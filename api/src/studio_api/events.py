@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import psycopg
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from studio_api.models import RunEvent
+from studio_api.settings import settings
+
+
+def record_run_event(
+    session: Session,
+    run_id: str,
+    event_type: str,
+    status: str | None,
+    payload: dict[str, Any] | None = None,
+) -> None:
+    """Append a lifecycle event and notify stream subscribers when the transaction commits."""
+    event_id = session.execute(
+        insert(RunEvent)
+        .values(run_id=run_id, event_type=event_type, status=status, payload=payload or {})
+        .returning(RunEvent.id)
+    ).scalar_one()
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.run_events_channel, "payload": str(event_id)},
+    )
+
+
+def record_run_events(session: Session, events: list[dict[str, Any]]) -> None:
+    """Bulk variant of ``record_run_event``; one notification wakes streams for the whole batch."""
+    if not events:
+        return
+    session.execute(insert(RunEvent), [{"payload": {}, **event} for event in events])
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.run_events_channel, "payload": "batch"},
+    )
+
+
+def latest_run_event_id(session: Session) -> int:
+    return int(session.execute(text("SELECT coalesce(max(id), 0) FROM run_events")).scalar_one())
+
+
+def format_sse(event_id: int, data: str) -> str:
+    return f"id: {event_id}\nevent: run\ndata: {data}\n\n"
+
+
+class RunEventBroker:
+    """Single LISTEN connection per API process that wakes every open event stream.
+
+    Subscribers re-query ``run_events`` after their own cursor on wake-up, so a missed
+    notification only delays delivery until the subscriber's fallback timeout.
+    """
+
+    def __init__(self, reconnect_delay_seconds: float = 2.0) -> None:
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._connected = threading.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._listen, name="studio-run-event-broker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def subscribe(self) -> asyncio.Event:
+        wakeup = asyncio.Event()
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), wakeup))
+        return wakeup
+
+    def unsubscribe(self, wakeup: asyncio.Event) -> None:
+        with self._lock:
+            self._subscribers = {entry for entry in self._subscribers if entry[1] is not wakeup}
+
+    def publish(self) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, wakeup in subscribers:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _listen(self) -> None:
+        dsn = make_url(settings.db_dsn).set(drivername="postgresql").render_as_string(hide_password=False)
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(dsn, autocommit=True) as conn:
+                    conn.execute(f'LISTEN "{settings.run_events_channel}"')
+                    self._connected.set()
+                    self.publish()
+                    while not self._stop_event.is_set():
+                        if any(True for _ in conn.notifies(timeout=1.0)):
+                            self.publish()
+            except psycopg.Error:
+                pass
+            finally:
+                self._connected.clear()
+            self._stop_event.wait(self.reconnect_delay_seconds)
+
+
+broker = RunEventBroker()
+
+
+class RunEventCursor:
+    """Stream position plus recently skipped event ids.
+
+    Event ids come from a sequence at insert time but become visible at commit, so a
+    slower concurrent transaction can commit a lower id after a higher one was streamed.
+    Skipped ids are re-polled for ``gap_timeout_seconds`` before being treated as rolled back.
+    """
+
+    max_tracked_gaps = 1000
+
+    def __init__(self, last_id: int, gap_timeout_seconds: float = 10.0) -> None:
+        self.last_id = last_id
+        self.gap_timeout_seconds = gap_timeout_seconds
+        self._gaps: dict[int, float] = {}
+
+    def pending_gaps(self) -> list[int]:
+        now = time.monotonic()
+        self._gaps = {event_id: deadline for event_id, deadline in self._gaps.items() if deadline > now}
+        return sorted(self._gaps)
+
+    def advance(self, event_id: int) -> None:
+        if self._gaps.pop(event_id, None) is not None:
+            return
+        if event_id > self.last_id + 1:
+            deadline = time.monotonic() + self.gap_timeout_seconds
+            first_missing = max(self.last_id + 1, event_id - self.max_tracked_gaps)
+            for missing in range(first_missing, event_id):
+                self._gaps[missing] = deadline
+        self.last_id = max(self.last_id, event_id)
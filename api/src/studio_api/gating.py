@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+# Latency samples loaded for one gate, both sides together (score-load runs keep up to 5000 each).
+GATE_MAX_LATENCY_SAMPLES = 500_000
+
+# Upper bound on the cells of each (resamples x runs) block, so memory stays flat however many
+# resamples or runs a gate asks for.
+_CHUNK_CELLS = 1_000_000
+
+
+def _chunk_rows(resamples: int, width: int) -> list[int]:
+    rows = max(1, _CHUNK_CELLS // max(width, 1))
+    return [min(rows, resamples - start) for start in range(0, resamples, rows)]
+
+
+def run_summaries(runs: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Mean and standard error of the mean of each run's samples (runs without samples are skipped)."""
+    runs = [samples for samples in runs if samples.size]
+    means = np.asarray([samples.mean() for samples in runs], dtype=np.float64)
+    std_errors = np.asarray(
+        [samples.std(ddof=1) / np.sqrt(samples.size) if samples.size > 1 else 0.0 for samples in runs],
+        dtype=np.float64,
+    )
+    return means, std_errors
+
+
+def _resample_means(
+    means: np.ndarray,
+    resamples: int,
+    rng: np.random.Generator,
+    std_errors: np.ndarray | None = None,
+) -> np.ndarray:
+    """Two-level bootstrap of the mean over runs.
+
+    Runs are resampled with replacement; each drawn run then contributes a draw from the
+    sampling distribution of its own mean (normal with ``std_errors``), so within-run noise is
+    kept without treating requests from different runs as interchangeable.
+    """
+    blocks = []
+    for rows in _chunk_rows(resamples, means.size):
+        indices = rng.integers(0, means.size, size=(rows, means.size))
+        drawn = means[indices]
+        if std_errors is not None and std_errors.any():
+            drawn = drawn + std_errors[indices] * rng.standard_normal(indices.shape)
+        blocks.append(drawn.mean(axis=1))
+    return np.concatenate(blocks)
+
+
+def permutation_p_value(
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    resamples: int,
+    rng: np.random.Generator,
+) -> float:
+    """Two-sided permutation test p-value for a difference in means of per-run values."""
+    observed = abs(candidate.mean() - baseline.mean())
+    pooled = np.concatenate([baseline, candidate])
+    extreme = 0
+    for rows in _chunk_rows(resamples, pooled.size):
+        shuffled = rng.permuted(np.broadcast_to(pooled, (rows, pooled.size)), axis=1)
+        diffs = np.abs(shuffled[:, baseline.size :].mean(axis=1) - shuffled[:, : baseline.size].mean(axis=1))
+        # Small tolerance so ties with the observed difference count as "at least as extreme".
+        extreme += int(np.count_nonzero(diffs >= observed - 1e-12 * max(1.0, observed)))
+    return float((extreme + 1) / (resamples + 1))
+
+
+def _summary(
+    metric: str,
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    threshold: float,
+    sample_counts: tuple[int, int] | None = None,
+) -> dict[str, Any]:
+    baseline_n, candidate_n = sample_counts or (baseline.size, candidate.size)
+    return {
+        "metric": metric,
+        "baseline_n": int(baseline_n),
+        "candidate_n": int(candidate_n),
+        "baseline_runs": int(baseline.size),
+        "candidate_runs": int(candidate.size),
+        "baseline_mean": float(baseline.mean()) if baseline.size else None,
+        "candidate_mean": float(candidate.mean()) if candidate.size else None,
+        "threshold": threshold,
+    }
+
+
+def gate_latency_regression(
+    baseline: list[np.ndarray],
+    candidate: list[np.ndarray],
+    max_regression_pct: float,
+    confidence: float,
+    resamples: int,
+    min_samples: int,
+    rng: np.random.Generator,
+) -> dict[str, Any]:
+    """One-sided regression gate on the % change in mean latency (candidate vs baseline).
+
+    ``baseline`` and ``candidate`` hold one array of latency samples per run. Each side's mean is
+    the mean of its run means, and both the bootstrap and the permutation test work on runs, so
+    run-to-run variance is not hidden behind a large pool of per-request samples.
+
+    ``pass`` when the whole CI sits below ``max_regression_pct``; ``fail`` when the whole CI sits
+    above it and the difference is significant; ``inconclusive`` otherwise.
+    """
+    sample_counts = (sum(run.size for run in baseline), sum(run.size for run in candidate))
+    baseline_means, baseline_errors = run_summaries(baseline)
+    candidate_means, candidate_errors = run_summaries(candidate)
+    result = _summary("latency_ms", baseline_means, candidate_means, max_regression_pct, sample_counts)
+    if min(sample_counts) < min_samples:
+        return {
+            **result,
+            "verdict": "inconclusive",
+            "diff": None,
+            "ci_low": None,
+            "ci_high": None,
+            "p_value": None,
+            "reason": f"need at least {min_samples} samples per side",
+        }
+    if baseline_means.mean() <= 0.0:
+        return {
+            **result,
+            "verdict": "inconclusive",
+            "diff": None,
+            "ci_low": None,
+            "ci_high": None,
+            "p_value": None,
+            "reason": "baseline latency is not positive",
+        }
+
+    baseline_draws = _resample_means(baseline_means, resamples, rng, baseline_errors)
+    candidate_draws = _resample_means(candidate_means, resamples, rng, candidate_errors)
+    pct = (candidate_draws / np.where(baseline_draws > 0.0, baseline_draws, np.nan) - 1.0) * 100.0
+    alpha = 1.0 - confidence
+    ci_low, ci_high = np.nanquantile(pct, [alpha / 2.0, 1.0 - alpha / 2.0])
+    p_value = permutation_p_value(baseline_means, candidate_means, resamples, rng)
+
+    if ci_high <= max_regression_pct:
+        verdict, reason = "pass", "confidence interval below regression threshold"
+    elif ci_low > max_regression_pct and p_value < alpha:
+        verdict, reason = "fail", "confidence interval above regression threshold"
+    else:
+        verdict, reason = "inconclusive", "confidence interval straddles regression threshold"
+    return {
+        **result,
+        "verdict": verdict,
+        "diff": float((candidate_means.mean() / baseline_means.mean() - 1.0) * 100.0),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "p_value": p_value,
+        "reason": reason,
+    }
+
+
+def gate_score_parity(
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    abs_tolerance: float,
+    confidence: float,
+    resamples: int,
+    rng: np.random.Generator,
+) -> dict[str, Any]:
+    """Equivalence gate on the difference in mean score; each side holds one score per run.
+
+    ``pass`` when the CI of the difference lies within ``±abs_tolerance``; ``fail`` when it lies
+    entirely outside; ``inconclusive`` otherwise. Deterministic scores give a zero-width interval.
+    """
+    result = _summary("score", baseline, candidate, abs_tolerance)
+    if baseline.size == 0 or candidate.size == 0:
+        return {
+            **result,
+            "verdict": "inconclusive",
+            "diff": None,
+            "ci_low": None,
+            "ci_high": None,
+            "p_value": None,
+            "reason": "no score samples",
+        }
+
+    diffs = _resample_means(candidate, resamples, rng) - _resample_means(baseline, resamples, rng)
+    alpha = 1.0 - confidence
+    ci_low, ci_high = np.quantile(diffs, [alpha / 2.0, 1.0 - alpha / 2.0])
+    single_samples = baseline.size < 2 or candidate.size < 2
+    p_value = None if single_samples else permutation_p_value(baseline, candidate, resamples, rng)
+
+    if -abs_tolerance <= ci_low and ci_high <= abs_tolerance:
+        verdict, reason = "pass", "confidence interval within score tolerance"
+    elif ci_low > abs_tolerance or ci_high < -abs_tolerance:
+        verdict, reason = "fail", "confidence interval outside score tolerance"
+    else:
+        verdict, reason = "inconclusive", "confidence interval straddles score tolerance"
+    return {
+        **result,
+        "verdict": verdict,
+        "diff": float(candidate.mean() - baseline.mean()),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "p_value": p_value,
+        "reason": reason,
+    }
+
+
+def combine_verdicts(verdicts: list[str]) -> str:
+    if "fail" in verdicts:
+        return "fail"
+    if "inconclusive" in verdicts:
+        return "inconclusive"
+    return "pass"
+
+
+def latency_samples(result: dict[str, Any]) -> list[float]:
+    """Per-request latency samples recorded by the adapter, else the run's single latency."""
+    samples = result.get("latency_samples_ms")
+    if isinstance(samples, list):
+        values = [float(value) for value in samples if isinstance(value, (int, float))]
+        if values:
+            return values
+    latency = result.get("latency_ms")
+    return [float(latency)] if isinstance(latency, (int, float)) else []
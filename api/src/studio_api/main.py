@@ -1,20 +1,80 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from datetime import datetime, timezone
+import asyncio
+import base64
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
 import hashlib
 import json
+from typing import Literal
+from uuid import uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+import numpy as np
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import select, text
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import case, func, insert, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 
-from studio_api.db import Base, engine, get_session
-from studio_api.metrics import compare_results
-from studio_api.models import Run
-from studio_api.schemas import CompareRequest, CompareResponse, RunCreate, RunView, ToleranceConfig
+from studio_api.artifacts import ResultDetailUnavailable, compare_input, fetch_token_artifact, hydrate_result
+from studio_api.db import Base, SessionLocal, engine, get_session
+from studio_api.events import (
+    RunEventCursor,
+    broker,
+    format_sse,
+    latest_run_event_id,
+    record_run_event,
+    record_run_events,
+)
+from studio_api.gating import (
+    GATE_MAX_LATENCY_SAMPLES,
+    combine_verdicts,
+    gate_latency_regression,
+    gate_score_parity,
+    latency_samples,
+)
+from studio_api.metrics import COMPARE_RESULTS_VERSION, compare_many, compare_results
+from studio_api.models import Compare, Run, RunEvent, Runner, Suite
+from studio_api.queue import PRIORITY_NAMES, PRIORITY_RANKS, priority_name, queue_position, unserved_lane_warnings
+from studio_api.schemas import (
+    CompareMatrixRequest,
+    CompareMatrixResponse,
+    CompareRequest,
+    CompareResponse,
+    CompareSummary,
+    GateMetricResult,
+    GateRequest,
+    GateResponse,
+    GateThresholds,
+    PriorityClass,
+    QueueEntry,
+    QueueView,
+    RunBatchCreate,
+    RunBatchItem,
+    RunBatchResponse,
+    RunCreate,
+    RunEventView,
+    RunnerView,
+    RunPage,
+    RunSummary,
+    RunView,
+    SuiteCellRollup,
+    SuiteCreate,
+    SuiteRollup,
+    SuiteView,
+    TimingAggregate,
+    TimingView,
+    TokenDiffPage,
+    TokenDiffWindow,
+    ToleranceConfig,
+)
 from studio_api.settings import settings
+from studio_api.suites import build_suite_children, expand_matrix, matrix_cell_key, suite_run_count, suite_status
+from studio_api.telemetry import metrics_response, observe_request, record_runs_created
+from studio_api.timing import timing_aggregate_columns, timing_stats
 
 
 app = FastAPI(title=settings.api_name)
@@ -26,12 +86,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(observe_request)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
     _apply_online_schema_migrations()
+    broker.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    broker.stop()
 
 
 @app.get("/health")
@@ -39,6 +106,11 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    return metrics_response()
+
+
 def _apply_online_schema_migrations() -> None:
     statements = [
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS mode VARCHAR(16) NOT NULL DEFAULT 'benchmark'",
@@ -48,9 +120,45 @@ def _apply_online_schema_migrations() -> None:
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS repro_metadata JSON",
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS score_input_hash VARCHAR(64)",
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS mask_hash VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(128)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS attempt_count INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS cache_key VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS cached_from_run_id VARCHAR(36)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS progress_json JSON",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS suite_id VARCHAR(36)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS suite_case_index INTEGER",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS matrix_cell JSON",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS matrix_cell_key VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(128)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS priority SMALLINT NOT NULL DEFAULT 0",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS submitter VARCHAR(128) NOT NULL DEFAULT 'anonymous'",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS device_class VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS timing_json JSON",
         "CREATE INDEX IF NOT EXISTS ix_runs_mode ON runs (mode)",
         "CREATE INDEX IF NOT EXISTS ix_runs_score_input_hash ON runs (score_input_hash)",
         "CREATE INDEX IF NOT EXISTS ix_runs_mask_hash ON runs (mask_hash)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_running_lease ON runs (lease_expires_at) WHERE status = 'running'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_created_at_id ON runs (created_at DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_suite_id ON runs (suite_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_runs_idempotency_key ON runs (idempotency_key)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_succeeded_cache_key ON runs (cache_key, completed_at DESC) WHERE status = 'succeeded'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_pending_queue ON runs (priority, created_at) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_pending_fair_share ON runs (priority, submitter, backend, created_at) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_running_share ON runs (submitter, backend) WHERE status = 'running'",
+        """
+        CREATE TABLE IF NOT EXISTS run_events (
+            id BIGSERIAL PRIMARY KEY,
+            run_id VARCHAR(36) NOT NULL,
+            event_type VARCHAR(32) NOT NULL,
+            status VARCHAR(16),
+            payload JSON NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_run_events_run_id ON run_events (run_id)",
+        "ALTER TABLE suites ADD COLUMN IF NOT EXISTS gate_thresholds JSON",
     ]
     with engine.begin() as conn:
         for stmt in statements:
@@ -64,6 +172,76 @@ def _stable_json_hash(payload: dict | None) -> str | None:
     return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
 
+# Labels that tag a run without changing what it computes.
+_CACHE_IGNORED_REPRO_FIELDS = {"branch", "pr_label"}
+
+
+def _run_cache_key(
+    backend: str,
+    mode: str,
+    prompt: str,
+    parameters: dict,
+    score_input_hash: str | None,
+    mask_hash: str | None,
+    repro_metadata: dict | None,
+) -> str | None:
+    # Without a pinned backend commit and model revision two runs are not provably the same work.
+    if not repro_metadata or not repro_metadata.get("backend_commit_sha") or not repro_metadata.get("model_revision"):
+        return None
+    return _stable_json_hash(
+        {
+            "backend": backend,
+            "mode": mode,
+            "prompt": prompt,
+            "parameters": parameters,
+            "score_input_hash": score_input_hash,
+            "mask_hash": mask_hash,
+            "repro_metadata": {
+                key: value for key, value in repro_metadata.items() if key not in _CACHE_IGNORED_REPRO_FIELDS
+            },
+        }
+    )
+
+
+def _find_cached_runs(session: Session, cache_keys: set[str]) -> dict[str, Run]:
+    """Latest succeeded run per cache key, in one query."""
+    if not cache_keys:
+        return {}
+    runs = session.scalars(
+        select(Run)
+        .where(Run.cache_key.in_(cache_keys), Run.status == "succeeded")
+        .order_by(Run.cache_key, Run.completed_at.desc())
+        .distinct(Run.cache_key)
+    ).all()
+    return {run.cache_key: run for run in runs}
+
+
+def _cached_result_values(cached: Run) -> dict:
+    # Point at the run that actually executed, even when the match was itself a cache hit.
+    source_run_id = cached.cached_from_run_id or cached.id
+    return {
+        "status": "succeeded",
+        "cached_from_run_id": source_run_id,
+        "result_json": {**(cached.result_json or {}), "cache_hit": True, "cached_from_run_id": source_run_id},
+        "artifact_key": cached.artifact_key,
+        "completed_at": datetime.now(tz=timezone.utc),
+    }
+
+
+def _created_event_payload(values: dict) -> dict:
+    if values.get("cached_from_run_id"):
+        return {"cache_hit": True, "cached_from_run_id": values["cached_from_run_id"]}
+    return {}
+
+
+def _notify_run_enqueued(session: Session, run_id: str) -> None:
+    # Delivered to LISTENing runners when the surrounding transaction commits.
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.run_notify_channel, "payload": run_id},
+    )
+
+
 def _to_run_view(run: Run) -> RunView:
     return RunView(
         id=run.id,
@@ -81,14 +259,29 @@ def _to_run_view(run: Run) -> RunView:
         result_json=run.result_json,
         artifact_key=run.artifact_key,
         error=run.error,
+        lease_owner=run.lease_owner,
+        lease_expires_at=run.lease_expires_at,
+        heartbeat_at=run.heartbeat_at,
+        attempt_count=run.attempt_count or 0,
+        cache_key=run.cache_key,
+        cached_from_run_id=run.cached_from_run_id,
+        progress_json=run.progress_json,
+        suite_id=run.suite_id,
+        suite_case_index=run.suite_case_index,
+        matrix_cell=run.matrix_cell,
+        idempotency_key=run.idempotency_key,
+        priority=priority_name(run.priority),
+        submitter=run.submitter or "anonymous",
+        device_class=run.device_class,
+        timing_json=run.timing_json,
         created_at=run.created_at,
         updated_at=run.updated_at,
         completed_at=run.completed_at,
     )
 
 
-@app.post("/api/v1/runs", response_model=RunView)
-def create_run(payload: RunCreate, session: Session = Depends(get_session)) -> RunView:
+def _build_run_values(payload: RunCreate, default_priority: PriorityClass = "interactive") -> dict:
+    """Column values for a new pending run; shared by single, suite and batch creation."""
     score_input = payload.score_input.model_dump() if payload.score_input else None
     mask_config = payload.mask_config.model_dump() if payload.mask_config else None
     tolerance = (
@@ -98,45 +291,513 @@ def create_run(payload: RunCreate, session: Session = Depends(get_session)) -> R
     )
     repro_metadata = payload.repro_metadata.model_dump() if payload.repro_metadata else None
     prompt = payload.prompt if payload.prompt is not None else payload.score_input.query
-
-    run = Run(
-        backend=payload.backend,
-        mode=payload.mode,
-        prompt=prompt,
-        parameters=payload.parameters,
-        score_input=score_input,
-        mask_config=mask_config,
-        tolerance=tolerance,
-        repro_metadata=repro_metadata,
-        score_input_hash=_stable_json_hash(score_input),
-        mask_hash=_stable_json_hash(mask_config),
-        status="pending",
+    score_input_hash = _stable_json_hash(score_input)
+    mask_hash = _stable_json_hash(mask_config)
+    cache_key = _run_cache_key(
+        payload.backend, payload.mode, prompt, payload.parameters, score_input_hash, mask_hash, repro_metadata
     )
+    return {
+        "id": str(uuid4()),
+        "backend": payload.backend,
+        "mode": payload.mode,
+        "prompt": prompt,
+        "parameters": payload.parameters,
+        "score_input": score_input,
+        "mask_config": mask_config,
+        "tolerance": tolerance,
+        "repro_metadata": repro_metadata,
+        "score_input_hash": score_input_hash,
+        "mask_hash": mask_hash,
+        "cache_key": cache_key,
+        "idempotency_key": payload.idempotency_key,
+        "priority": PRIORITY_RANKS[payload.priority or default_priority],
+        "submitter": payload.submitter or "anonymous",
+        "device_class": payload.device_class,
+        "status": "pending",
+    }
+
+
+def _find_run_by_idempotency_key(session: Session, idempotency_key: str) -> Run | None:
+    return session.scalars(select(Run).where(Run.idempotency_key == idempotency_key)).first()
+
+
+@app.post("/api/v1/runs", response_model=RunView)
+def create_run(payload: RunCreate, session: Session = Depends(get_session)) -> RunView:
+    if payload.idempotency_key is not None:
+        existing = _find_run_by_idempotency_key(session, payload.idempotency_key)
+        if existing is not None:
+            return _to_run_view(existing)
+
+    values = _build_run_values(payload)
+    cache_key = values["cache_key"]
+    if payload.reuse_cached_result and cache_key:
+        cached = _find_cached_runs(session, {cache_key}).get(cache_key)
+        if cached is not None:
+            values.update(_cached_result_values(cached))
+
+    run = Run(**values)
     session.add(run)
+    try:
+        session.flush()
+    except IntegrityError:
+        # A concurrent request with the same idempotency key won the insert.
+        session.rollback()
+        existing = _find_run_by_idempotency_key(session, payload.idempotency_key) if payload.idempotency_key else None
+        if existing is None:
+            raise
+        return _to_run_view(existing)
+    if run.status == "pending":
+        _notify_run_enqueued(session, run.id)
+    record_run_event(session, run.id, "created", run.status, _created_event_payload(values))
     session.commit()
+    record_runs_created([values])
     session.refresh(run)
-    return _to_run_view(run)
+    view = _to_run_view(run)
+    view.queue_position = queue_position(session, run)
+    if run.status == "pending":
+        view.warnings = unserved_lane_warnings(session, [(run.backend, run.mode, run.device_class)])
+    return view
+
 
+@app.post("/api/v1/runs/batch", response_model=RunBatchResponse)
+def create_runs_batch(payload: RunBatchCreate, session: Session = Depends(get_session)) -> RunBatchResponse:
+    if len(payload.runs) > settings.run_batch_max_size:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch has {len(payload.runs)} runs; the limit is {settings.run_batch_max_size}",
+        )
 
-@app.get("/api/v1/runs", response_model=list[RunView])
+    rows = [_build_run_values(run, default_priority="batch") for run in payload.runs]
+    cached = _find_cached_runs(
+        session,
+        {row["cache_key"] for row, run in zip(rows, payload.runs) if run.reuse_cached_result and row["cache_key"]},
+    )
+    for row, run in zip(rows, payload.runs):
+        if run.reuse_cached_result and row["cache_key"] in cached:
+            row.update(_cached_result_values(cached[row["cache_key"]]))
+
+    # Keys that already exist are skipped by ON CONFLICT, so retried CI submissions never double-enqueue.
+    inserted_ids = set(
+        session.scalars(
+            pg_insert(Run).on_conflict_do_nothing(index_elements=[Run.idempotency_key]).returning(Run.id),
+            rows,
+        ).all()
+    )
+    created_rows = [row for row in rows if row["id"] in inserted_ids]
+    existing_keys = [row["idempotency_key"] for row in rows if row["id"] not in inserted_ids]
+    existing: dict[str, tuple[str, str]] = {}
+    if existing_keys:
+        existing = {
+            key: (run_id, status)
+            for run_id, key, status in session.execute(
+                select(Run.id, Run.idempotency_key, Run.status).where(Run.idempotency_key.in_(existing_keys))
+            ).all()
+        }
+
+    record_run_events(
+        session,
+        [
+            {
+                "run_id": row["id"],
+                "event_type": "created",
+                "status": row["status"],
+                "payload": _created_event_payload(row),
+            }
+            for row in created_rows
+        ],
+    )
+    if any(row["status"] == "pending" for row in created_rows):
+        _notify_run_enqueued(session, "batch")
+    session.commit()
+    record_runs_created(created_rows)
+
+    items = []
+    for index, row in enumerate(rows):
+        created = row["id"] in inserted_ids
+        run_id, status = (row["id"], row["status"]) if created else existing[row["idempotency_key"]]
+        items.append(
+            RunBatchItem(
+                index=index, run_id=run_id, status=status, idempotency_key=row["idempotency_key"], created=created
+            )
+        )
+    return RunBatchResponse(
+        items=items,
+        created_count=len(created_rows),
+        existing_count=len(rows) - len(created_rows),
+        warnings=unserved_lane_warnings(
+            session,
+            [(row["backend"], row["mode"], row["device_class"]) for row in created_rows if row["status"] == "pending"],
+        ),
+    )
+
+
+_RUN_SUMMARY_PROMPT_CHARS = 200
+
+
+def _encode_run_cursor(created_at: datetime, run_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), run_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_run_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(run_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _run_summary_columns() -> list:
+    # Project scalar result fields server-side so heavy JSON payloads never leave Postgres.
+    return [
+        Run.id,
+        Run.backend,
+        Run.mode,
+        func.left(Run.prompt, _RUN_SUMMARY_PROMPT_CHARS).label("prompt_preview"),
+        Run.status,
+        Run.score_input_hash,
+        Run.mask_hash,
+        Run.artifact_key,
+        Run.error,
+        Run.attempt_count,
+        Run.cached_from_run_id,
+        Run.suite_id,
+        case(PRIORITY_NAMES, value=Run.priority, else_="batch").label("priority"),
+        Run.submitter,
+        Run.result_json["score"].as_float().label("score"),
+        Run.result_json["latency_ms"].as_float().label("latency_ms"),
+        Run.result_json["throughput_items_per_s"].as_float().label("throughput_items_per_s"),
+        Run.created_at,
+        Run.updated_at,
+        Run.completed_at,
+    ]
+
+
+@app.get("/api/v1/runs", response_model=RunPage)
 def list_runs(
     limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    backend: str | None = Query(default=None),
+    mode: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    score_input_hash: str | None = Query(default=None),
+    mask_hash: str | None = Query(default=None),
+    suite_id: str | None = Query(default=None),
+    priority: PriorityClass | None = Query(default=None),
+    submitter: str | None = Query(default=None),
     session: Session = Depends(get_session),
-) -> list[RunView]:
-    rows: Sequence[Run] = session.scalars(select(Run).order_by(Run.created_at.desc()).limit(limit)).all()
-    return [_to_run_view(run) for run in rows]
+) -> RunPage:
+    query = select(*_run_summary_columns())
+    for column, value in (
+        (Run.backend, backend),
+        (Run.mode, mode),
+        (Run.status, status),
+        (Run.score_input_hash, score_input_hash),
+        (Run.mask_hash, mask_hash),
+        (Run.suite_id, suite_id),
+        (Run.priority, PRIORITY_RANKS[priority] if priority is not None else None),
+        (Run.submitter, submitter),
+    ):
+        if value is not None:
+            query = query.where(column == value)
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_run_cursor(cursor)
+        query = query.where(tuple_(Run.created_at, Run.id) < tuple_(cursor_created_at, cursor_id))
+
+    query = query.order_by(Run.created_at.desc(), Run.id.desc()).limit(limit + 1)
+    rows = session.execute(query).mappings().all()
+
+    items = [RunSummary(**row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = _encode_run_cursor(last.created_at, last.id)
+    return RunPage(items=items, next_cursor=next_cursor)
+
+
+def _hydrated_result(run: Run, for_compare: bool = False) -> dict | None:
+    try:
+        return compare_input(run.result_json) if for_compare else hydrate_result(run.result_json)
+    except ResultDetailUnavailable as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
 
 
 @app.get("/api/v1/runs/{run_id}", response_model=RunView)
-def get_run(run_id: str, session: Session = Depends(get_session)) -> RunView:
+def get_run(
+    run_id: str,
+    include_detail: bool = Query(default=True),
+    session: Session = Depends(get_session),
+) -> RunView:
     run = session.get(Run, run_id)
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
-    return _to_run_view(run)
+    view = _to_run_view(run)
+    view.queue_position = queue_position(session, run)
+    if run.status == "pending":
+        view.warnings = unserved_lane_warnings(session, [(run.backend, run.mode, run.device_class)])
+    if include_detail:
+        view.result_json = _hydrated_result(run)
+    return view
+
+
+@app.get("/api/v1/runners", response_model=list[RunnerView])
+def list_runners(session: Session = Depends(get_session)) -> list[RunnerView]:
+    alive_after = datetime.now(tz=timezone.utc) - timedelta(seconds=settings.runner_stale_seconds)
+    views = []
+    for runner in session.scalars(select(Runner).order_by(Runner.device_class, Runner.id)).all():
+        capabilities = runner.capabilities or {}
+        views.append(
+            RunnerView(
+                id=runner.id,
+                device_class=runner.device_class,
+                lanes=capabilities.get("lanes", []),
+                adapter_modes=capabilities.get("adapter_modes", {}),
+                slots=capabilities.get("slots", 0),
+                lane_slots=capabilities.get("lane_slots", {}),
+                global_slot_limits=capabilities.get("global_slot_limits", {}),
+                in_flight=runner.in_flight,
+                alive=runner.heartbeat_at >= alive_after,
+                started_at=runner.started_at,
+                heartbeat_at=runner.heartbeat_at,
+            )
+        )
+    return views
+
+
+@app.get("/api/v1/queue", response_model=QueueView)
+def get_queue(session: Session = Depends(get_session)) -> QueueView:
+    rows = session.execute(
+        select(
+            Run.priority,
+            Run.submitter,
+            Run.backend,
+            func.count().filter(Run.status == "pending").label("pending"),
+            func.count().filter(Run.status == "running").label("running"),
+            func.min(Run.created_at).filter(Run.status == "pending").label("oldest_pending_at"),
+        )
+        .where(Run.status.in_(("pending", "running")))
+        .group_by(Run.priority, Run.submitter, Run.backend)
+        .order_by(Run.priority, Run.submitter, Run.backend)
+    ).all()
+    entries = [
+        QueueEntry(
+            priority=priority_name(row.priority),
+            submitter=row.submitter,
+            backend=row.backend,
+            pending=row.pending,
+            running=row.running,
+            oldest_pending_at=row.oldest_pending_at,
+        )
+        for row in rows
+    ]
+    pending_lanes = session.execute(
+        select(Run.backend, Run.mode, Run.device_class).where(Run.status == "pending").distinct()
+    ).all()
+    return QueueView(
+        pending=sum(entry.pending for entry in entries),
+        running=sum(entry.running for entry in entries),
+        entries=entries,
+        warnings=unserved_lane_warnings(session, [tuple(lane) for lane in pending_lanes]),
+    )
+
+
+@app.get("/api/v1/timing", response_model=TimingView)
+def get_timing(
+    backend: str | None = Query(default=None),
+    mode: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    submitter: str | None = Query(default=None),
+    suite_id: str | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    session: Session = Depends(get_session),
+) -> TimingView:
+    query = select(
+        Run.backend, Run.mode, func.count().label("run_count"), *timing_aggregate_columns()
+    ).where(Run.timing_json.is_not(None))
+    for column, value in (
+        (Run.backend, backend),
+        (Run.mode, mode),
+        (Run.status, status),
+        (Run.submitter, submitter),
+        (Run.suite_id, suite_id),
+    ):
+        if value is not None:
+            query = query.where(column == value)
+    if since is not None:
+        query = query.where(Run.created_at >= since)
+    rows = session.execute(query.group_by(Run.backend, Run.mode).order_by(Run.backend, Run.mode)).mappings().all()
+    return TimingView(
+        items=[
+            TimingAggregate(backend=row["backend"], mode=row["mode"], run_count=row["run_count"], spans=timing_stats(row))
+            for row in rows
+        ]
+    )
+
+
+@app.get("/api/v1/runs/{run_id}/tokens")
+def download_run_tokens(run_id: str, session: Session = Depends(get_session)) -> Response:
+    run = session.get(Run, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    ref = (run.result_json or {}).get("token_artifact")
+    if not isinstance(ref, dict):
+        raise HTTPException(status_code=404, detail="Run has no token artifact")
+    try:
+        body = fetch_token_artifact(ref["key"])
+    except ResultDetailUnavailable as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+    return Response(
+        content=body,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="{run_id}.stcol"',
+            "X-Studio-Token-Format": ref.get("format", ""),
+        },
+    )
+
+
+def _suite_view(session: Session, suite: Suite) -> SuiteView:
+    status_counts = {
+        status: count
+        for status, count in session.execute(
+            select(Run.status, func.count()).where(Run.suite_id == suite.id).group_by(Run.status)
+        ).all()
+    }
+    status, completed_count, progress = suite_status(status_counts, suite.run_count)
+    return SuiteView(
+        id=suite.id,
+        name=suite.name,
+        description=suite.description,
+        mode=suite.mode,
+        backends=suite.backends,
+        matrix=suite.matrix,
+        gate_thresholds=suite.gate_thresholds,
+        case_count=len(suite.cases),
+        run_count=suite.run_count,
+        status=status,
+        status_counts=status_counts,
+        completed_count=completed_count,
+        progress=progress,
+        created_at=suite.created_at,
+    )
+
+
+@app.post("/api/v1/suites", response_model=SuiteView)
+def create_suite(payload: SuiteCreate, session: Session = Depends(get_session)) -> SuiteView:
+    run_count = suite_run_count(payload)
+    if run_count > settings.suite_max_runs:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Suite expands to {run_count} runs; the limit is {settings.suite_max_runs}",
+        )
+    children = build_suite_children(payload)
+
+    suite = Suite(
+        id=str(uuid4()),
+        name=payload.name,
+        description=payload.description,
+        mode=payload.mode,
+        backends=list(payload.backends),
+        cases=[case.model_dump() for case in payload.cases],
+        matrix=payload.matrix,
+        parameters=payload.parameters,
+        gate_thresholds=payload.gate_thresholds.model_dump() if payload.gate_thresholds else None,
+        run_count=run_count,
+    )
+    session.add(suite)
+    session.flush()
+
+    rows = [
+        {
+            **_build_run_values(child),
+            "suite_id": suite.id,
+            "suite_case_index": case_index,
+            "matrix_cell": cell,
+            "matrix_cell_key": matrix_cell_key(cell),
+        }
+        for child, case_index, cell in children
+    ]
+    # One multi-row insert and one wake-up per channel, however large the matrix.
+    session.execute(insert(Run), rows)
+    record_run_events(
+        session,
+        [
+            {"run_id": row["id"], "event_type": "created", "status": "pending", "payload": {"suite_id": suite.id}}
+            for row in rows
+        ],
+    )
+    _notify_run_enqueued(session, suite.id)
+    session.commit()
+    record_runs_created(rows)
+    session.refresh(suite)
+    return _suite_view(session, suite)
+
+
+@app.get("/api/v1/suites/{suite_id}", response_model=SuiteView)
+def get_suite(suite_id: str, session: Session = Depends(get_session)) -> SuiteView:
+    suite = session.get(Suite, suite_id)
+    if suite is None:
+        raise HTTPException(status_code=404, detail="Suite not found")
+    return _suite_view(session, suite)
+
+
+@app.get("/api/v1/suites/{suite_id}/rollup", response_model=SuiteRollup)
+def get_suite_rollup(suite_id: str, session: Session = Depends(get_session)) -> SuiteRollup:
+    suite = session.get(Suite, suite_id)
+    if suite is None:
+        raise HTTPException(status_code=404, detail="Suite not found")
+
+    score = Run.result_json["score"].as_float()
+    latency = Run.result_json["latency_ms"].as_float()
+    throughput = Run.result_json["throughput_items_per_s"].as_float()
+    succeeded = Run.status == "succeeded"
+    rows = session.execute(
+        select(
+            Run.backend,
+            Run.matrix_cell_key,
+            func.count().label("run_count"),
+            func.count().filter(succeeded).label("succeeded"),
+            func.count().filter(Run.status == "failed").label("failed"),
+            func.avg(score).filter(succeeded).label("score_mean"),
+            func.min(score).filter(succeeded).label("score_min"),
+            func.max(score).filter(succeeded).label("score_max"),
+            func.avg(latency).filter(succeeded).label("latency_ms_mean"),
+            func.percentile_cont(0.5).within_group(latency).filter(succeeded).label("latency_ms_p50"),
+            func.percentile_cont(0.95).within_group(latency).filter(succeeded).label("latency_ms_p95"),
+            func.avg(throughput).filter(succeeded).label("throughput_items_per_s_mean"),
+        )
+        .where(Run.suite_id == suite_id)
+        .group_by(Run.backend, Run.matrix_cell_key)
+    ).mappings().all()
+
+    # Cells are recomputed from the stored matrix so the rollup keeps matrix order.
+    cells = {matrix_cell_key(cell): cell for cell in expand_matrix(suite.matrix)}
+    order = {key: index for index, key in enumerate(cells)}
+    backend_order = {backend: index for index, backend in enumerate(suite.backends)}
+    items = [
+        SuiteCellRollup(**{**row, "cell_key": row["matrix_cell_key"], "cell": cells.get(row["matrix_cell_key"], {})})
+        for row in rows
+    ]
+    items.sort(key=lambda item: (order.get(item.cell_key, len(order)), backend_order.get(item.backend, 0)))
+    return SuiteRollup(suite_id=suite_id, cells=items)
+
+
+def _compare_is_current(compare: Compare, left: Run, right: Run) -> bool:
+    return (
+        compare.compare_version == COMPARE_RESULTS_VERSION
+        and compare.left_completed_at == left.completed_at
+        and compare.right_completed_at == right.completed_at
+    )
+
+
+def _compare_token_rows(left: Run, right: Run, tolerance: dict | None, window: dict) -> list[dict]:
+    left_result = _hydrated_result(left, for_compare=True) or {}
+    right_result = _hydrated_result(right, for_compare=True) or {}
+    return compare_results(left_result, right_result, tolerance=tolerance, token_window=window)["token_diffs"]
 
 
 @app.post("/api/v1/compares", response_model=CompareResponse)
-def compare_runs(payload: CompareRequest, session: Session = Depends(get_session)) -> CompareResponse:
+def compare_runs(payload: CompareRequest, session: Session = Depends(get_session)) -> CompareResponse | JSONResponse:
     left = session.get(Run, payload.left_run_id)
     right = session.get(Run, payload.right_run_id)
 
@@ -145,25 +806,344 @@ def compare_runs(payload: CompareRequest, session: Session = Depends(get_session
     if left.status != "succeeded" or right.status != "succeeded":
         raise HTTPException(status_code=409, detail="Both runs must be succeeded before comparison")
 
-    left_result = left.result_json or {}
-    right_result = right.result_json or {}
-    tolerance = left.tolerance or right.tolerance
-    diff = compare_results(left_result, right_result, tolerance=tolerance)
+    tolerance = payload.tolerance.model_dump() if payload.tolerance else (left.tolerance or right.tolerance)
+    tolerance_hash = _stable_json_hash(tolerance or {})
+    existing = session.scalars(
+        select(Compare).where(
+            Compare.left_run_id == left.id,
+            Compare.right_run_id == right.id,
+            Compare.tolerance_hash == tolerance_hash,
+        )
+    ).first()
+    window = payload.token_window.model_dump()
+    if existing is not None and _compare_is_current(existing, left, right):
+        cached = {**existing.result, "compare_id": existing.id, "cached": True}
+        if cached.get("token_diffs_window") != window:
+            cached["token_diffs"] = _compare_token_rows(left, right, tolerance, window)
+            cached["token_diffs_window"] = window
+        # Stored output was validated when it was computed; skip re-validating it.
+        return JSONResponse(cached)
+
+    left_result = _hydrated_result(left, for_compare=True) or {}
+    right_result = _hydrated_result(right, for_compare=True) or {}
+    response = CompareResponse(
+        left_run_id=left.id,
+        right_run_id=right.id,
+        token_diffs_window=window,
+        **compare_results(
+            left_result,
+            right_result,
+            tolerance=tolerance,
+            token_window=window,
+            envelope_buckets=settings.compare_envelope_buckets,
+        ),
+    )
+    stored = response.model_dump(mode="json", exclude={"compare_id", "cached"})
+    values = {
+        "left_completed_at": left.completed_at,
+        "right_completed_at": right.completed_at,
+        "compare_version": COMPARE_RESULTS_VERSION,
+        "overall_pass": response.overall_pass,
+        "result": stored,
+        "tolerance": tolerance,
+        "updated_at": func.now(),
+    }
+    compare_id = session.execute(
+        pg_insert(Compare)
+        .values(
+            id=str(uuid4()),
+            left_run_id=left.id,
+            right_run_id=right.id,
+            tolerance_hash=tolerance_hash,
+            **values,
+        )
+        .on_conflict_do_update(constraint="uq_compares_pair", set_=values)
+        .returning(Compare.id)
+    ).scalar_one()
+    session.commit()
+    response.compare_id = compare_id
+    return response
+
+
+@app.post("/api/v1/compares/matrix", response_model=CompareMatrixResponse)
+def compare_run_matrix(payload: CompareMatrixRequest, session: Session = Depends(get_session)) -> CompareMatrixResponse:
+    runs = {run.id: run for run in session.scalars(select(Run).where(Run.id.in_(payload.run_ids))).all()}
+    missing = [run_id for run_id in payload.run_ids if run_id not in runs]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Runs not found: {', '.join(missing)}")
+    not_succeeded = [run_id for run_id in payload.run_ids if runs[run_id].status != "succeeded"]
+    if not_succeeded:
+        raise HTTPException(
+            status_code=409, detail=f"Runs must be succeeded before comparison: {', '.join(not_succeeded)}"
+        )
+
+    reference_run_id = payload.reference_run_id or payload.run_ids[0]
+    tolerance = payload.tolerance.model_dump() if payload.tolerance else runs[reference_run_id].tolerance
+    matrix = compare_many(
+        [(run_id, _hydrated_result(runs[run_id], for_compare=True) or {}) for run_id in payload.run_ids],
+        reference_run_id=reference_run_id,
+        tolerance=tolerance,
+        kendall_max_items=settings.compare_kendall_max_items,
+    )
+    return CompareMatrixResponse(run_ids=payload.run_ids, reference_run_id=reference_run_id, **matrix)
+
 
-    return CompareResponse(left_run_id=left.id, right_run_id=right.id, **diff)
+@app.get("/api/v1/compares/{compare_id}", response_model=CompareResponse)
+def get_compare(compare_id: str, session: Session = Depends(get_session)) -> JSONResponse:
+    compare = session.get(Compare, compare_id)
+    if compare is None:
+        raise HTTPException(status_code=404, detail="Compare not found")
+    return JSONResponse({**compare.result, "compare_id": compare.id, "cached": True})
+
+
+@app.get("/api/v1/compares/{compare_id}/token-diffs", response_model=TokenDiffPage)
+def get_compare_token_diffs(
+    compare_id: str,
+    mode: Literal["range", "first_divergence", "top_k"] = Query(default="range"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=200, ge=1, le=5000),
+    session: Session = Depends(get_session),
+) -> TokenDiffPage:
+    compare = session.get(Compare, compare_id)
+    if compare is None:
+        raise HTTPException(status_code=404, detail="Compare not found")
+    left = session.get(Run, compare.left_run_id)
+    right = session.get(Run, compare.right_run_id)
+    if left is None or right is None:
+        raise HTTPException(status_code=404, detail="One or both runs not found")
+    if not _compare_is_current(compare, left, right):
+        raise HTTPException(status_code=409, detail="Compare is stale; re-run the compare")
+
+    window = TokenDiffWindow(mode=mode, offset=offset, limit=limit)
+    return TokenDiffPage(
+        compare_id=compare.id,
+        window=window,
+        token_pair_count=compare.result.get("token_pair_count", 0),
+        rows=_compare_token_rows(left, right, compare.tolerance, window.model_dump()),
+    )
+
+
+@app.get("/api/v1/runs/{run_id}/compares", response_model=list[CompareSummary])
+def list_run_compares(
+    run_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    session: Session = Depends(get_session),
+) -> list[CompareSummary]:
+    left = aliased(Run)
+    right = aliased(Run)
+    rows = session.execute(
+        select(
+            Compare.id,
+            Compare.left_run_id,
+            Compare.right_run_id,
+            Compare.tolerance,
+            Compare.overall_pass,
+            Compare.result["score_abs_diff"].as_float().label("score_abs_diff"),
+            Compare.result["latency_pct_diff"].as_float().label("latency_pct_diff"),
+            Compare.result["token_mismatch_count"].as_integer().label("token_mismatch_count"),
+            or_(
+                Compare.compare_version != COMPARE_RESULTS_VERSION,
+                Compare.left_completed_at.is_distinct_from(left.completed_at),
+                Compare.right_completed_at.is_distinct_from(right.completed_at),
+            ).label("stale"),
+            Compare.created_at,
+            Compare.updated_at,
+        )
+        .join(left, left.id == Compare.left_run_id)
+        .join(right, right.id == Compare.right_run_id)
+        .where(or_(Compare.left_run_id == run_id, Compare.right_run_id == run_id))
+        .order_by(Compare.updated_at.desc())
+        .limit(limit)
+    ).mappings().all()
+    return [CompareSummary(**row) for row in rows]
+
+
+@app.post("/api/v1/gates", response_model=GateResponse)
+def evaluate_gate(payload: GateRequest, session: Session = Depends(get_session)) -> GateResponse:
+    thresholds = payload.thresholds
+    if thresholds is None and payload.suite_id is not None:
+        suite = session.get(Suite, payload.suite_id)
+        if suite is None:
+            raise HTTPException(status_code=404, detail="Suite not found")
+        if suite.gate_thresholds:
+            thresholds = GateThresholds.model_validate(suite.gate_thresholds)
+    thresholds = thresholds or GateThresholds()
+
+    run_ids = set(payload.baseline_run_ids) | set(payload.candidate_run_ids)
+    rows = {
+        run_id: (status, result_json)
+        for run_id, status, result_json in session.execute(
+            select(Run.id, Run.status, Run.result_json).where(Run.id.in_(run_ids))
+        ).all()
+    }
+    missing = sorted(run_ids - rows.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Runs not found: {', '.join(missing)}")
+    not_succeeded = sorted(run_id for run_id, (status, _) in rows.items() if status != "succeeded")
+    if not_succeeded:
+        raise HTTPException(status_code=409, detail=f"Runs must be succeeded before gating: {', '.join(not_succeeded)}")
+
+    def _samples(group: list[str]) -> tuple[list[np.ndarray], np.ndarray]:
+        results = [rows[run_id][1] or {} for run_id in group]
+        latencies = [np.asarray(latency_samples(result), dtype=np.float64) for result in results]
+        scores = [float(result["score"]) for result in results if isinstance(result.get("score"), (int, float))]
+        return latencies, np.asarray(scores, dtype=np.float64)
+
+    baseline_latency, baseline_score = _samples(payload.baseline_run_ids)
+    candidate_latency, candidate_score = _samples(payload.candidate_run_ids)
+    sample_count = sum(samples.size for samples in [*baseline_latency, *candidate_latency])
+    if sample_count > GATE_MAX_LATENCY_SAMPLES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Gate runs hold {sample_count} latency samples; at most {GATE_MAX_LATENCY_SAMPLES} are allowed",
+        )
+    rng = np.random.default_rng(payload.seed)
+    latency = gate_latency_regression(
+        baseline_latency,
+        candidate_latency,
+        max_regression_pct=thresholds.latency_regression_pct,
+        confidence=thresholds.confidence,
+        resamples=thresholds.bootstrap_resamples,
+        min_samples=thresholds.min_latency_samples,
+        rng=rng,
+    )
+    score = gate_score_parity(
+        baseline_score,
+        candidate_score,
+        abs_tolerance=thresholds.score_abs_tolerance,
+        confidence=thresholds.confidence,
+        resamples=thresholds.bootstrap_resamples,
+        rng=rng,
+    )
+    return GateResponse(
+        verdict=combine_verdicts([latency["verdict"], score["verdict"]]),
+        thresholds=thresholds,
+        latency=GateMetricResult(**latency),
+        score=GateMetricResult(**score),
+    )
+
+
+_TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
 
 
 @app.post("/api/v1/runs/{run_id}/cancel", response_model=RunView)
 def cancel_run(run_id: str, session: Session = Depends(get_session)) -> RunView:
-    run = session.get(Run, run_id)
+    # Row lock serializes with the runner's final status write so neither overwrites the other.
+    run = session.get(Run, run_id, with_for_update=True)
     if run is None:
         raise HTTPException(status_code=404, detail="Run not found")
-    if run.status in {"succeeded", "failed"}:
+    if run.status in _TERMINAL_STATUSES:
         return _to_run_view(run)
 
-    run.status = "failed"
+    lease_owner = run.lease_owner
+    run.status = "canceled"
     run.error = "Canceled"
     run.completed_at = datetime.now(tz=timezone.utc)
+    run.lease_owner = None
+    run.lease_expires_at = None
+    record_run_event(session, run.id, "canceled", run.status, {"canceled_lease_owner": lease_owner})
+    # Tells the runner holding the run to kill its bench process or abort its score call.
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.run_cancel_channel, "payload": run.id},
+    )
     session.commit()
     session.refresh(run)
     return _to_run_view(run)
+
+
+def _load_run_events(cursor: RunEventCursor, limit: int) -> list[RunEventView]:
+    # Each event carries the run's current summary row so clients can upsert without refetching.
+    query = (
+        select(
+            RunEvent.id.label("event_id"),
+            RunEvent.run_id.label("event_run_id"),
+            RunEvent.event_type,
+            RunEvent.status.label("event_status"),
+            RunEvent.payload,
+            RunEvent.created_at.label("event_created_at"),
+            *_run_summary_columns(),
+        )
+        .select_from(RunEvent)
+        .outerjoin(Run, Run.id == RunEvent.run_id)
+    )
+    gaps = cursor.pending_gaps()
+    if gaps:
+        query = query.where(or_(RunEvent.id > cursor.last_id, RunEvent.id.in_(gaps)))
+    else:
+        query = query.where(RunEvent.id > cursor.last_id)
+    query = query.order_by(RunEvent.id.asc()).limit(limit)
+
+    session = SessionLocal()
+    try:
+        rows = session.execute(query).mappings().all()
+    finally:
+        session.close()
+
+    summary_fields = RunSummary.model_fields
+    return [
+        RunEventView(
+            id=row["event_id"],
+            run_id=row["event_run_id"],
+            event_type=row["event_type"],
+            status=row["event_status"],
+            payload=row["payload"] or {},
+            created_at=row["event_created_at"],
+            run=RunSummary(**{name: row[name] for name in summary_fields}) if row["id"] is not None else None,
+        )
+        for row in rows
+    ]
+
+
+def _latest_run_event_id() -> int:
+    session = SessionLocal()
+    try:
+        return latest_run_event_id(session)
+    finally:
+        session.close()
+
+
+async def _run_event_stream(request: Request, cursor: RunEventCursor) -> AsyncIterator[str]:
+    wakeup = broker.subscribe()
+    limit = settings.run_events_batch_limit
+    try:
+        yield "retry: 2000\n\n"
+        while not await request.is_disconnected():
+            # Clear before querying so a notification that lands mid-query still wakes the next wait.
+            wakeup.clear()
+            events = await run_in_threadpool(_load_run_events, cursor, limit)
+            for event in events:
+                cursor.advance(event.id)
+                yield format_sse(cursor.last_id, event.model_dump_json())
+            if len(events) >= limit:
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=settings.run_events_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+    finally:
+        broker.unsubscribe(wakeup)
+
+
+@app.get("/api/v1/run-events")
+async def stream_run_events(
+    request: Request,
+    after: int | None = Query(default=None, ge=0),
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    if last_event_id is not None:
+        # Browsers resend the last seen id on reconnect; it wins over the original ?after=.
+        try:
+            start_id = int(last_event_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from exc
+    elif after is not None:
+        start_id = after
+    else:
+        start_id = await run_in_threadpool(_latest_run_event_id)
+
+    return StreamingResponse(
+        _run_event_stream(request, RunEventCursor(start_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
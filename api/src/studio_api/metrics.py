@@ -2,6 +2,15 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
+
+# Bump whenever compare_results output changes so persisted compares are recomputed.
+COMPARE_RESULTS_VERSION = 2
+
+SCORE_PARITY_THRESHOLD = 0.02
+LATENCY_REGRESSION_PCT_THRESHOLD = 10.0
+
+
 def _as_float(value: object) -> float:
     if value is None:
         return 0.0
@@ -30,6 +39,39 @@ def _as_int_list(value: object) -> list[int]:
     return out
 
 
+def _try_numeric_array(value: list) -> np.ndarray | None:
+    try:
+        arr = np.array(value)
+    except (TypeError, ValueError):
+        return None
+    if arr.ndim == 1 and arr.dtype.kind in "biuf":
+        return arr
+    return None
+
+
+def _as_float_array(value: object) -> np.ndarray:
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float64, copy=False).ravel()
+    if not isinstance(value, list):
+        return np.empty(0, dtype=np.float64)
+    # Fast path for homogeneous numeric lists; anything else keeps the lenient list semantics.
+    arr = _try_numeric_array(value)
+    if arr is not None:
+        return arr.astype(np.float64, copy=False)
+    return np.asarray(_as_float_list(value), dtype=np.float64)
+
+
+def _as_int_array(value: object) -> np.ndarray:
+    if isinstance(value, np.ndarray):
+        return value.astype(np.int64, copy=False).ravel()
+    if not isinstance(value, list):
+        return np.empty(0, dtype=np.int64)
+    arr = _try_numeric_array(value)
+    if arr is not None and (arr.dtype.kind != "f" or np.isfinite(arr).all()):
+        return arr.astype(np.int64, copy=False)
+    return np.asarray(_as_int_list(value), dtype=np.int64)
+
+
 def _get_tolerance(tolerance: dict[str, Any] | None) -> tuple[float, float]:
     tolerance = tolerance or {}
     abs_epsilon = tolerance.get("abs_epsilon", 1e-6)
@@ -37,67 +79,154 @@ def _get_tolerance(tolerance: dict[str, Any] | None) -> tuple[float, float]:
     return _as_float(abs_epsilon), _as_float(rel_epsilon)
 
 
+def logprob_diff_arrays(
+    left_logprobs: np.ndarray,
+    right_logprobs: np.ndarray,
+    abs_epsilon: float,
+    rel_epsilon: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    pair_count = min(left_logprobs.size, right_logprobs.size)
+    left_lp = left_logprobs[:pair_count]
+    right_lp = right_logprobs[:pair_count]
+
+    abs_diff = np.abs(left_lp - right_lp)
+    right_abs = np.abs(right_lp)
+    denom = np.where(right_abs > 1e-12, right_abs, 1.0)
+    rel_diff = abs_diff / denom
+
+    is_match = abs_diff <= abs_epsilon
+    if rel_epsilon > 0.0:
+        is_match |= rel_diff <= rel_epsilon
+    return abs_diff, rel_diff, is_match
+
+
+def _token_label(left_tokens: list, right_tokens: list, index: int) -> str:
+    if index < len(left_tokens):
+        return str(left_tokens[index])
+    if index < len(right_tokens):
+        return str(right_tokens[index])
+    return f"tok_{index}"
+
+
+def _token_diff_rows(
+    indices: np.ndarray,
+    left_tokens: list,
+    right_tokens: list,
+    left_logprobs: np.ndarray,
+    right_logprobs: np.ndarray,
+    abs_diff: np.ndarray,
+    rel_diff: np.ndarray,
+    is_match: np.ndarray,
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "index": idx,
+            "token": _token_label(left_tokens, right_tokens, idx),
+            "left_logprob": left_lp,
+            "right_logprob": right_lp,
+            "abs_diff": abs_value,
+            "rel_diff": rel_value,
+            "is_match": match,
+        }
+        for idx, left_lp, right_lp, abs_value, rel_value, match in zip(
+            indices.tolist(),
+            left_logprobs[indices].tolist(),
+            right_logprobs[indices].tolist(),
+            abs_diff[indices].tolist(),
+            rel_diff[indices].tolist(),
+            is_match[indices].tolist(),
+        )
+    ]
+
+
+def select_token_window(
+    abs_diff: np.ndarray,
+    is_match: np.ndarray,
+    mode: str = "range",
+    offset: int = 0,
+    limit: int | None = None,
+) -> np.ndarray:
+    """Indices of the token rows to return.
+
+    ``range`` pages from ``offset``; ``first_divergence`` centres the window on the first
+    mismatch; ``top_k`` returns the ``limit`` largest abs diffs, worst first.
+    """
+    pair_count = int(abs_diff.size)
+    if limit is None:
+        limit = pair_count
+    limit = max(0, min(limit, pair_count))
+    if mode == "top_k":
+        if limit == 0:
+            return np.empty(0, dtype=np.int64)
+        worst = np.argpartition(-abs_diff, limit - 1)[:limit]
+        return worst[np.argsort(-abs_diff[worst], kind="stable")]
+    if mode == "first_divergence":
+        mismatches = np.flatnonzero(~is_match)
+        center = int(mismatches[0]) if mismatches.size else 0
+        offset = max(0, min(center - limit // 2, pair_count - limit))
+    start = min(max(offset, 0), pair_count)
+    return np.arange(start, min(start + limit, pair_count), dtype=np.int64)
+
+
+def abs_diff_envelope(abs_diff: np.ndarray, buckets: int) -> list[dict[str, Any]]:
+    """Min/max of ``abs_diff`` over at most ``buckets`` contiguous index ranges, for plotting."""
+    pair_count = int(abs_diff.size)
+    if pair_count == 0 or buckets <= 0:
+        return []
+    edges = np.unique(np.linspace(0, pair_count, min(buckets, pair_count) + 1).astype(np.int64))
+    starts = edges[:-1]
+    mins = np.minimum.reduceat(abs_diff, starts)
+    maxs = np.maximum.reduceat(abs_diff, starts)
+    return [
+        {"start": start, "end": end, "min": low, "max": high}
+        for start, end, low, high in zip(starts.tolist(), edges[1:].tolist(), mins.tolist(), maxs.tolist())
+    ]
+
+
 def _build_token_diff(
     left: dict[str, Any],
     right: dict[str, Any],
     abs_epsilon: float,
     rel_epsilon: float,
+    token_window: dict[str, Any] | None = None,
+    envelope_buckets: int = 0,
 ) -> dict[str, Any]:
     left_tokens = left.get("tokens") if isinstance(left.get("tokens"), list) else []
     right_tokens = right.get("tokens") if isinstance(right.get("tokens"), list) else []
-    left_logprobs = _as_float_list(left.get("token_logprobs"))
-    right_logprobs = _as_float_list(right.get("token_logprobs"))
-
-    pair_count = min(len(left_logprobs), len(right_logprobs))
-    token_diffs: list[dict[str, Any]] = []
-    mismatch_count = 0
-    first_divergence_index: int | None = None
-    max_abs_diff = 0.0
-    sum_abs_diff = 0.0
-
-    for idx in range(pair_count):
-        left_lp = left_logprobs[idx]
-        right_lp = right_logprobs[idx]
-        abs_diff = abs(left_lp - right_lp)
-        denom = abs(right_lp) if abs(right_lp) > 1e-12 else 1.0
-        rel_diff = abs_diff / denom
-
-        is_match = abs_diff <= abs_epsilon or (rel_epsilon > 0.0 and rel_diff <= rel_epsilon)
-        if not is_match:
-            mismatch_count += 1
-            if first_divergence_index is None:
-                first_divergence_index = idx
-
-        max_abs_diff = max(max_abs_diff, abs_diff)
-        sum_abs_diff += abs_diff
-
-        token_value = (
-            str(left_tokens[idx])
-            if idx < len(left_tokens)
-            else (str(right_tokens[idx]) if idx < len(right_tokens) else f"tok_{idx}")
-        )
-        token_diffs.append(
-            {
-                "index": idx,
-                "token": token_value,
-                "left_logprob": left_lp,
-                "right_logprob": right_lp,
-                "abs_diff": abs_diff,
-                "rel_diff": rel_diff,
-                "is_match": is_match,
-            }
-        )
+    left_logprobs = _as_float_array(left.get("token_logprobs"))
+    right_logprobs = _as_float_array(right.get("token_logprobs"))
+
+    abs_diff, rel_diff, is_match = logprob_diff_arrays(left_logprobs, right_logprobs, abs_epsilon, rel_epsilon)
+    pair_count = int(abs_diff.size)
+    mismatch_count = pair_count - int(np.count_nonzero(is_match))
+    first_divergence_index = int(np.argmin(is_match)) if mismatch_count > 0 else None
+    max_abs_diff = float(abs_diff.max()) if pair_count > 0 else 0.0
+    mean_abs_diff = float(abs_diff.mean()) if pair_count > 0 else 0.0
+
+    window = token_window or {}
+    row_indices = select_token_window(
+        abs_diff, is_match, window.get("mode", "range"), window.get("offset", 0), window.get("limit")
+    )
+    token_diffs = _token_diff_rows(
+        row_indices,
+        left_tokens,
+        right_tokens,
+        left_logprobs,
+        right_logprobs,
+        abs_diff,
+        rel_diff,
+        is_match,
+    )
 
-    mean_abs_diff = (sum_abs_diff / pair_count) if pair_count > 0 else 0.0
-    left_nll = _as_float_list(left.get("token_nll"))
-    right_nll = _as_float_list(right.get("token_nll"))
-    nll_pair_count = min(len(left_nll), len(right_nll))
+    left_nll = _as_float_array(left.get("token_nll"))
+    right_nll = _as_float_array(right.get("token_nll"))
+    nll_pair_count = min(left_nll.size, right_nll.size)
     if nll_pair_count > 0:
-        nll_abs_diffs = [abs(left_nll[idx] - right_nll[idx]) for idx in range(nll_pair_count)]
+        nll_abs_diffs = np.abs(left_nll[:nll_pair_count] - right_nll[:nll_pair_count])
         token_loss_diff_summary = {
-            "pair_count": nll_pair_count,
-            "max_abs_nll_diff": max(nll_abs_diffs),
-            "mean_abs_nll_diff": sum(nll_abs_diffs) / nll_pair_count,
+            "pair_count": int(nll_pair_count),
+            "max_abs_nll_diff": float(nll_abs_diffs.max()),
+            "mean_abs_nll_diff": float(nll_abs_diffs.mean()),
         }
     else:
         token_loss_diff_summary = {
@@ -106,15 +235,17 @@ def _build_token_diff(
             "mean_abs_nll_diff": 0.0,
         }
 
-    left_ranks = _as_int_list(left.get("token_ranks"))
-    right_ranks = _as_int_list(right.get("token_ranks"))
-    rank_pair_count = min(len(left_ranks), len(right_ranks))
+    left_ranks = _as_int_array(left.get("token_ranks"))
+    right_ranks = _as_int_array(right.get("token_ranks"))
+    rank_pair_count = min(left_ranks.size, right_ranks.size)
     if rank_pair_count > 0:
-        rank_deltas = [left_ranks[idx] - right_ranks[idx] for idx in range(rank_pair_count)]
-        worst_rank_drop = max(rank_deltas)
-        mean_abs_rank_delta = sum(abs(delta) for delta in rank_deltas) / rank_pair_count
-        mrr_left = sum(1.0 / max(rank, 1) for rank in left_ranks[:rank_pair_count]) / rank_pair_count
-        mrr_right = sum(1.0 / max(rank, 1) for rank in right_ranks[:rank_pair_count]) / rank_pair_count
+        left_ranks = left_ranks[:rank_pair_count]
+        right_ranks = right_ranks[:rank_pair_count]
+        rank_deltas = left_ranks - right_ranks
+        worst_rank_drop = rank_deltas.max()
+        mean_abs_rank_delta = np.abs(rank_deltas).mean()
+        mrr_left = (1.0 / np.maximum(left_ranks, 1)).mean()
+        mrr_right = (1.0 / np.maximum(right_ranks, 1)).mean()
     else:
         worst_rank_drop = 0.0
         mean_abs_rank_delta = 0.0
@@ -138,6 +269,7 @@ def _build_token_diff(
         "max_token_abs_diff": max_abs_diff,
         "mean_token_abs_diff": mean_abs_diff,
         "token_diffs": token_diffs,
+        "abs_diff_envelope": abs_diff_envelope(abs_diff, envelope_buckets),
         "token_loss_diff_summary": token_loss_diff_summary,
         "rank_delta_summary": rank_delta_summary,
     }
@@ -147,7 +279,14 @@ def compare_results(
     left: dict[str, Any],
     right: dict[str, Any],
     tolerance: dict[str, Any] | None = None,
+    token_window: dict[str, Any] | None = None,
+    envelope_buckets: int = 0,
 ) -> dict[str, Any]:
+    """Score, latency and token-level parity between two results.
+
+    ``token_diffs`` holds the rows selected by ``token_window`` (all rows when omitted); see
+    ``select_token_window``. Pass ``envelope_buckets`` to get a downsampled abs-diff envelope.
+    """
     left_score = _as_float(left.get("score"))
     right_score = _as_float(right.get("score"))
     left_latency_ms = _as_float(left.get("latency_ms"))
@@ -156,15 +295,22 @@ def compare_results(
     right_tp = _as_float(right.get("throughput_items_per_s"))
     abs_epsilon, rel_epsilon = _get_tolerance(tolerance)
 
-    token_diff = _build_token_diff(left=left, right=right, abs_epsilon=abs_epsilon, rel_epsilon=rel_epsilon)
+    token_diff = _build_token_diff(
+        left=left,
+        right=right,
+        abs_epsilon=abs_epsilon,
+        rel_epsilon=rel_epsilon,
+        token_window=token_window,
+        envelope_buckets=envelope_buckets,
+    )
 
     latency_pct_diff = 0.0
     if right_latency_ms > 0.0:
         latency_pct_diff = ((left_latency_ms - right_latency_ms) / right_latency_ms) * 100.0
 
     score_abs_diff = abs(left_score - right_score)
-    score_parity_threshold = 0.02
-    latency_regression_pct_threshold = 10.0
+    score_parity_threshold = SCORE_PARITY_THRESHOLD
+    latency_regression_pct_threshold = LATENCY_REGRESSION_PCT_THRESHOLD
     score_parity_pass = score_abs_diff <= score_parity_threshold
     latency_regression_pass = latency_pct_diff <= latency_regression_pct_threshold
     token_parity_pass = token_diff["token_mismatch_count"] == 0
@@ -190,6 +336,169 @@ def compare_results(
         "max_token_abs_diff": token_diff["max_token_abs_diff"],
         "mean_token_abs_diff": token_diff["mean_token_abs_diff"],
         "token_diffs": token_diff["token_diffs"],
+        "abs_diff_envelope": token_diff["abs_diff_envelope"],
         "token_loss_diff_summary": token_diff["token_loss_diff_summary"],
         "rank_delta_summary": token_diff["rank_delta_summary"],
     }
+
+
+def _rankdata(values: np.ndarray) -> np.ndarray:
+    """1-based ranks with ties sharing their average rank."""
+    order = np.argsort(values, kind="mergesort")
+    ordered = values[order]
+    group_starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    group_ends = np.append(group_starts[1:], values.size)
+    group_ids = np.repeat(np.arange(group_starts.size), group_ends - group_starts)
+    ranks = np.empty(values.size, dtype=np.float64)
+    ranks[order] = ((group_starts + 1 + group_ends) / 2.0)[group_ids]
+    return ranks
+
+
+def rank_agreement(item_scores: np.ndarray, kendall_max_items: int) -> tuple[np.ndarray, np.ndarray | None]:
+    """Pairwise Spearman rho and Kendall tau-b between the rows of ``item_scores`` (runs x items).
+
+    Both are single matrix products over per-run rank / pair-sign vectors. Kendall is skipped
+    (``None``) above ``kendall_max_items`` items because its pair-sign vectors grow quadratically.
+    """
+    ranks = np.vstack([_rankdata(row) for row in item_scores])
+    centered = ranks - ranks.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spearman = (centered @ centered.T) / np.outer(norms, norms)
+
+    item_count = item_scores.shape[1]
+    if item_count > kendall_max_items:
+        return spearman, None
+    upper_i, upper_j = np.triu_indices(item_count, k=1)
+    signs = np.vstack([np.sign(row[upper_j] - row[upper_i]).astype(np.float32) for row in item_scores])
+    untied = np.count_nonzero(signs, axis=1).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kendall = (signs @ signs.T).astype(np.float64) / np.sqrt(np.outer(untied, untied))
+    return spearman, kendall
+
+
+def _finite_or_none(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+def compare_many(
+    runs: list[tuple[str, dict[str, Any]]],
+    reference_run_id: str,
+    tolerance: dict[str, Any] | None = None,
+    kendall_max_items: int = 1000,
+) -> dict[str, Any]:
+    """N-way parity over ``(run_id, result)`` pairs: pairwise token/score parity, rank agreement on
+    ``item_scores`` and each run's deviation from ``reference_run_id``.
+
+    Token logprobs are zero-padded to the longest run with token data and stacked once; each
+    run's row is then diffed against all later rows in one vectorized step, masked so every pair
+    covers ``min(len_left, len_right)`` tokens exactly like a two-run compare.
+    """
+    abs_epsilon, rel_epsilon = _get_tolerance(tolerance)
+    run_ids = [run_id for run_id, _ in runs]
+    results = [result for _, result in runs]
+
+    logprobs = [_as_float_array(result.get("token_logprobs")) for result in results]
+    with_tokens = [index for index, values in enumerate(logprobs) if values.size > 0]
+    lengths = np.asarray([logprobs[index].size for index in with_tokens], dtype=np.int64)
+    width = int(lengths.max()) if lengths.size else 0
+    stacked = np.zeros((len(with_tokens), width), dtype=np.float64)
+    for row, index in enumerate(with_tokens):
+        stacked[row, : lengths[row]] = logprobs[index]
+
+    item_arrays = [_as_float_array(result.get("item_scores")) for result in results]
+    item_sizes = [values.size for values in item_arrays if values.size > 0]
+    item_count = max(set(item_sizes), key=item_sizes.count) if item_sizes else 0
+    with_items = [index for index, values in enumerate(item_arrays) if item_count and values.size == item_count]
+    item_rows = {index: row for row, index in enumerate(with_items)}
+    spearman = kendall = None
+    if len(with_items) >= 2:
+        spearman, kendall = rank_agreement(np.vstack([item_arrays[index] for index in with_items]), kendall_max_items)
+
+    token_stats: dict[tuple[int, int], dict[str, Any]] = {}
+    columns = np.arange(width)
+    for left_row, left_index in enumerate(with_tokens[:-1]):
+        right = stacked[left_row + 1 :]
+        pair_counts = np.minimum(lengths[left_row], lengths[left_row + 1 :])
+        in_pair = columns < pair_counts[:, None]
+        abs_diff = np.where(in_pair, np.abs(stacked[left_row] - right), 0.0)
+        right_abs = np.abs(right)
+        rel_diff = abs_diff / np.where(right_abs > 1e-12, right_abs, 1.0)
+        is_match = abs_diff <= abs_epsilon
+        if rel_epsilon > 0.0:
+            is_match |= rel_diff <= rel_epsilon
+        mismatched = in_pair & ~is_match
+        mismatches = np.count_nonzero(mismatched, axis=1)
+        first_divergence = np.argmax(mismatched, axis=1)
+        for offset, right_index in enumerate(with_tokens[left_row + 1 :]):
+            pair_count = int(pair_counts[offset])
+            token_stats[(left_index, right_index)] = {
+                "token_data_available": True,
+                "token_pair_count": pair_count,
+                "token_mismatch_count": int(mismatches[offset]),
+                "first_divergence_index": int(first_divergence[offset]) if mismatches[offset] else None,
+                "max_token_abs_diff": float(abs_diff[offset].max()),
+                "mean_token_abs_diff": float(abs_diff[offset].sum() / pair_count),
+            }
+
+    empty_token_stats = {
+        "token_data_available": False,
+        "token_pair_count": 0,
+        "token_mismatch_count": 0,
+        "first_divergence_index": None,
+        "max_token_abs_diff": 0.0,
+        "mean_token_abs_diff": 0.0,
+    }
+    scores = [_as_float(result.get("score")) for result in results]
+    pairs = []
+    for left_index in range(len(runs)):
+        for right_index in range(left_index + 1, len(runs)):
+            stats = token_stats.get((left_index, right_index), empty_token_stats)
+            score_abs_diff = abs(scores[left_index] - scores[right_index])
+            rank_pair = (item_rows.get(left_index), item_rows.get(right_index))
+            has_ranks = spearman is not None and None not in rank_pair
+            pairs.append(
+                {
+                    "left_run_id": run_ids[left_index],
+                    "right_run_id": run_ids[right_index],
+                    **stats,
+                    "token_parity_pass": stats["token_mismatch_count"] == 0,
+                    "score_abs_diff": score_abs_diff,
+                    "score_parity_pass": score_abs_diff <= SCORE_PARITY_THRESHOLD,
+                    "spearman": _finite_or_none(spearman[rank_pair]) if has_ranks else None,
+                    "kendall_tau": _finite_or_none(kendall[rank_pair]) if has_ranks and kendall is not None else None,
+                }
+            )
+
+    reference_index = run_ids.index(reference_run_id)
+    reference = results[reference_index]
+    reference_latency = _as_float(reference.get("latency_ms"))
+    reference_throughput = _as_float(reference.get("throughput_items_per_s"))
+    deviations = []
+    for index, result in enumerate(results):
+        key = (min(index, reference_index), max(index, reference_index))
+        stats = token_stats.get(key, empty_token_stats)
+        latency = _as_float(result.get("latency_ms"))
+        deviations.append(
+            {
+                "run_id": run_ids[index],
+                "score_diff": scores[index] - scores[reference_index],
+                "latency_ms_diff": latency - reference_latency,
+                "latency_pct_diff": ((latency - reference_latency) / reference_latency) * 100.0
+                if reference_latency > 0.0
+                else 0.0,
+                "throughput_items_per_s_diff": _as_float(result.get("throughput_items_per_s")) - reference_throughput,
+                "token_mismatch_count": stats["token_mismatch_count"],
+                "max_token_abs_diff": stats["max_token_abs_diff"],
+            }
+        )
+
+    return {
+        # Tokens every pair covers; individual pairs report their own ``token_pair_count``.
+        "token_pair_count": int(lengths.min()) if lengths.size else 0,
+        "item_count": item_count,
+        "token_abs_epsilon": abs_epsilon,
+        "token_rel_epsilon": rel_epsilon,
+        "pairs": pairs,
+        "deviations": deviations,
+    }
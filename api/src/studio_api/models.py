@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, JSON, String, Text, func
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, JSON, SmallInteger, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from studio_api.db import Base
@@ -27,6 +27,26 @@ class Run(Base):
     result_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     artifact_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    cache_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    cached_from_run_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    progress_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    suite_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)
+    suite_case_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    matrix_cell: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    matrix_cell_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    idempotency_key: Mapped[str | None] = mapped_column(String(128), nullable=True, unique=True, index=True)
+    # Priority class rank (0 = interactive, 1 = ci, 2 = batch); lower ranks are claimed first.
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
+    submitter: Mapped[str] = mapped_column(
+        String(128), nullable=False, default="anonymous", server_default="anonymous"
+    )
+    device_class: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Per-phase runner timings (queue wait, claim, execute, upload, ...) written when the run finishes.
+    timing_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -34,3 +54,74 @@ class Run(Base):
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class RunEvent(Base):
+    __tablename__ = "run_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class Runner(Base):
+    """Runner replicas and what they can execute; written by the runners themselves."""
+
+    __tablename__ = "runners"
+
+    id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    device_class: Mapped[str] = mapped_column(String(64), nullable=False)
+    capabilities: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    in_flight: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class Suite(Base):
+    __tablename__ = "suites"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    name: Mapped[str] = mapped_column(String(256), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    mode: Mapped[str] = mapped_column(String(16), nullable=False)
+    backends: Mapped[list] = mapped_column(JSON, nullable=False)
+    cases: Mapped[list] = mapped_column(JSON, nullable=False)
+    matrix: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    parameters: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    gate_thresholds: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class Compare(Base):
+    __tablename__ = "compares"
+    __table_args__ = (UniqueConstraint("left_run_id", "right_run_id", "tolerance_hash", name="uq_compares_pair"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    left_run_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    right_run_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    tolerance: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    tolerance_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Completion stamps of the compared runs; a re-executed run no longer matches them.
+    left_completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    right_completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    compare_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    overall_pass: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    result: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from studio_api.models import Run, Runner
+from studio_api.settings import settings
+
+# Lower ranks are claimed first; the runner keeps the same table (studio_runner.scheduling).
+PRIORITY_RANKS = {"interactive": 0, "ci": 1, "batch": 2}
+PRIORITY_NAMES = {rank: name for name, rank in PRIORITY_RANKS.items()}
+
+
+def priority_name(rank: int | None) -> str:
+    return PRIORITY_NAMES.get(rank if rank is not None else 0, "batch")
+
+
+def queue_position(session: Session, run: Run) -> int | None:
+    """1-based position of a pending run in priority, then FIFO, order.
+
+    Fair share between submitters can move a run ahead of older work in its class, so this is
+    an estimate of how many runs start first rather than a promise.
+    """
+    if run.status != "pending":
+        return None
+    ahead = session.scalar(
+        select(func.count())
+        .select_from(Run)
+        .where(
+            Run.status == "pending",
+            or_(
+                Run.priority < run.priority,
+                and_(Run.priority == run.priority, Run.created_at < run.created_at),
+            ),
+        )
+    )
+    return int(ahead or 0) + 1
+
+
+def unserved_lane_warnings(session: Session, lanes: Iterable[tuple[str, str, str | None]]) -> list[str]:
+    """Warnings for ``(backend, mode, device_class)`` lanes that no live runner advertises.
+
+    Runners only claim runs in lanes they advertise, so such runs would otherwise sit in
+    ``pending`` without any signal.
+    """
+    wanted = sorted(set(lanes), key=lambda lane: (lane[0], lane[1], lane[2] or ""))
+    if not wanted:
+        return []
+    alive_after = datetime.now(tz=timezone.utc) - timedelta(seconds=settings.runner_stale_seconds)
+    runners = session.execute(
+        select(Runner.device_class, Runner.capabilities).where(Runner.heartbeat_at >= alive_after)
+    ).all()
+    warnings = []
+    for backend, mode, device_class in wanted:
+        lane = f"{backend}:{mode}"
+        if any(
+            lane in (capabilities or {}).get("lanes", []) and device_class in (None, runner_device_class)
+            for runner_device_class, capabilities in runners
+        ):
+            continue
+        target = f"lane {lane}" if device_class is None else f"lane {lane} on device class {device_class}"
+        warnings.append(f"No registered runner can serve {target}; its runs stay pending until one registers")
+    return warnings
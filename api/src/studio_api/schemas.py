@@ -6,6 +6,9 @@ from typing import Any, Literal
 from pydantic import BaseModel, Field, model_validator
 
 
+PriorityClass = Literal["interactive", "ci", "batch"]
+
+
 class ScoreInput(BaseModel):
     query: str = Field(min_length=1, max_length=20000)
     items: list[str] = Field(min_length=1)
@@ -57,6 +60,13 @@ class RunCreate(BaseModel):
     mask_config: MaskConfig | None = None
     tolerance: ToleranceConfig | None = None
     repro_metadata: ReproMetadata | None = None
+    reuse_cached_result: bool = False
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=128)
+    # Unset priority means interactive for single runs and batch for batch/suite submissions.
+    priority: PriorityClass | None = None
+    submitter: str | None = Field(default=None, min_length=1, max_length=128)
+    # Only runners advertising this device class (STUDIO_RUNNER_DEVICE_CLASS) claim the run.
+    device_class: str | None = Field(default=None, min_length=1, max_length=64)
 
     @model_validator(mode="after")
     def validate_mode_fields(self) -> RunCreate:
@@ -66,6 +76,65 @@ class RunCreate(BaseModel):
             raise ValueError("score_input is required in score mode")
         return self
 
+
+class RunBatchCreate(BaseModel):
+    runs: list[RunCreate] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def validate_idempotency_keys(self) -> RunBatchCreate:
+        seen: set[str] = set()
+        duplicates: set[str] = set()
+        for run in self.runs:
+            if run.idempotency_key is not None:
+                if run.idempotency_key in seen:
+                    duplicates.add(run.idempotency_key)
+                seen.add(run.idempotency_key)
+        if duplicates:
+            raise ValueError(f"duplicate idempotency_key values in batch: {', '.join(sorted(duplicates))}")
+        return self
+
+
+class GateThresholds(BaseModel):
+    latency_regression_pct: float = Field(default=10.0, ge=0.0)
+    score_abs_tolerance: float = Field(default=0.02, ge=0.0)
+    confidence: float = Field(default=0.95, gt=0.5, lt=1.0)
+    bootstrap_resamples: int = Field(default=2000, ge=100, le=20000)
+    min_latency_samples: int = Field(default=3, ge=2)
+
+
+class SuiteCase(BaseModel):
+    name: str | None = Field(default=None, max_length=256)
+    prompt: str | None = Field(default=None, max_length=20000)
+    parameters: dict[str, Any] = Field(default_factory=dict)
+    score_input: ScoreInput | None = None
+    mask_config: MaskConfig | None = None
+
+
+class SuiteCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=256)
+    description: str | None = Field(default=None, max_length=4000)
+    backends: list[Literal["sglang-jax", "sglang-pytorch", "mock"]] = Field(min_length=1)
+    mode: Literal["benchmark", "score"] = "benchmark"
+    cases: list[SuiteCase] = Field(min_length=1)
+    matrix: dict[str, list[Any]] = Field(default_factory=dict)
+    parameters: dict[str, Any] = Field(default_factory=dict)
+    tolerance: ToleranceConfig | None = None
+    repro_metadata: ReproMetadata | None = None
+    gate_thresholds: GateThresholds | None = None
+    priority: PriorityClass = "batch"
+    submitter: str | None = Field(default=None, min_length=1, max_length=128)
+    device_class: str | None = Field(default=None, min_length=1, max_length=64)
+
+    @model_validator(mode="after")
+    def validate_matrix(self) -> SuiteCreate:
+        empty = [name for name, values in self.matrix.items() if not values]
+        if empty:
+            raise ValueError(f"matrix dimensions must not be empty: {', '.join(empty)}")
+        if len(set(self.backends)) != len(self.backends):
+            raise ValueError("backends must not contain duplicates")
+        return self
+
+
 class RunView(BaseModel):
     id: str
     backend: str
@@ -82,14 +151,179 @@ class RunView(BaseModel):
     result_json: dict[str, Any] | None
     artifact_key: str | None
     error: str | None
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
+    heartbeat_at: datetime | None = None
+    attempt_count: int = 0
+    cache_key: str | None = None
+    cached_from_run_id: str | None = None
+    progress_json: dict[str, Any] | None = None
+    suite_id: str | None = None
+    suite_case_index: int | None = None
+    matrix_cell: dict[str, Any] | None = None
+    idempotency_key: str | None = None
+    priority: PriorityClass = "interactive"
+    submitter: str = "anonymous"
+    device_class: str | None = None
+    queue_position: int | None = None
+    timing_json: dict[str, Any] | None = None
+    warnings: list[str] = []
     created_at: datetime
     updated_at: datetime
     completed_at: datetime | None
 
 
+class RunSummary(BaseModel):
+    id: str
+    backend: str
+    mode: str
+    prompt_preview: str
+    status: str
+    score_input_hash: str | None
+    mask_hash: str | None
+    artifact_key: str | None
+    error: str | None
+    attempt_count: int
+    cached_from_run_id: str | None
+    suite_id: str | None = None
+    priority: PriorityClass = "interactive"
+    submitter: str = "anonymous"
+    score: float | None
+    latency_ms: float | None
+    throughput_items_per_s: float | None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: datetime | None
+
+
+class RunPage(BaseModel):
+    items: list[RunSummary]
+    next_cursor: str | None
+
+
+class RunBatchItem(BaseModel):
+    index: int
+    run_id: str
+    status: str
+    idempotency_key: str | None
+    created: bool
+
+
+class RunBatchResponse(BaseModel):
+    items: list[RunBatchItem]
+    created_count: int
+    existing_count: int
+    warnings: list[str] = []
+
+
+class QueueEntry(BaseModel):
+    priority: PriorityClass
+    submitter: str
+    backend: str
+    pending: int
+    running: int
+    oldest_pending_at: datetime | None
+
+
+class QueueView(BaseModel):
+    pending: int
+    running: int
+    entries: list[QueueEntry]
+    warnings: list[str] = []
+
+
+class SpanStats(BaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class TimingAggregate(BaseModel):
+    backend: str
+    mode: str
+    run_count: int
+    spans: dict[str, SpanStats]
+
+
+class TimingView(BaseModel):
+    items: list[TimingAggregate]
+
+
+class RunnerView(BaseModel):
+    id: str
+    device_class: str
+    lanes: list[str]
+    adapter_modes: dict[str, str]
+    slots: int
+    lane_slots: dict[str, int]
+    global_slot_limits: dict[str, int]
+    in_flight: int
+    alive: bool
+    started_at: datetime
+    heartbeat_at: datetime
+
+
+class RunEventView(BaseModel):
+    id: int
+    run_id: str
+    event_type: str
+    status: str | None
+    payload: dict[str, Any]
+    created_at: datetime
+    run: RunSummary | None
+
+
+class SuiteView(BaseModel):
+    id: str
+    name: str
+    description: str | None
+    mode: str
+    backends: list[str]
+    matrix: dict[str, list[Any]]
+    gate_thresholds: GateThresholds | None = None
+    case_count: int
+    run_count: int
+    status: str
+    status_counts: dict[str, int]
+    completed_count: int
+    progress: float
+    created_at: datetime
+
+
+class SuiteCellRollup(BaseModel):
+    backend: str
+    cell_key: str
+    cell: dict[str, Any]
+    run_count: int
+    succeeded: int
+    failed: int
+    score_mean: float | None
+    score_min: float | None
+    score_max: float | None
+    latency_ms_mean: float | None
+    latency_ms_p50: float | None
+    latency_ms_p95: float | None
+    throughput_items_per_s_mean: float | None
+
+
+class SuiteRollup(BaseModel):
+    suite_id: str
+    cells: list[SuiteCellRollup]
+
+
+class TokenDiffWindow(BaseModel):
+    mode: Literal["range", "first_divergence", "top_k"] = "range"
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=200, ge=1, le=5000)
+
+
 class CompareRequest(BaseModel):
     left_run_id: str
     right_run_id: str
+    tolerance: ToleranceConfig | None = None
+    token_window: TokenDiffWindow = Field(default_factory=TokenDiffWindow)
 
 
 class TokenDiffRow(BaseModel):
@@ -102,6 +336,20 @@ class TokenDiffRow(BaseModel):
     is_match: bool
 
 
+class AbsDiffBucket(BaseModel):
+    start: int
+    end: int
+    min: float
+    max: float
+
+
+class TokenDiffPage(BaseModel):
+    compare_id: str
+    window: TokenDiffWindow
+    token_pair_count: int
+    rows: list[TokenDiffRow]
+
+
 class TokenLossDiffSummary(BaseModel):
     pair_count: int
     max_abs_nll_diff: float
@@ -139,5 +387,116 @@ class CompareResponse(BaseModel):
     max_token_abs_diff: float
     mean_token_abs_diff: float
     token_diffs: list[TokenDiffRow]
+    token_diffs_window: TokenDiffWindow | None = None
+    abs_diff_envelope: list[AbsDiffBucket] = Field(default_factory=list)
     token_loss_diff_summary: TokenLossDiffSummary
     rank_delta_summary: RankDeltaSummary
+    compare_id: str | None = None
+    cached: bool = False
+
+
+class CompareSummary(BaseModel):
+    id: str
+    left_run_id: str
+    right_run_id: str
+    tolerance: dict[str, Any] | None
+    overall_pass: bool
+    score_abs_diff: float
+    latency_pct_diff: float
+    token_mismatch_count: int
+    stale: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class CompareMatrixRequest(BaseModel):
+    run_ids: list[str] = Field(min_length=2, max_length=32)
+    reference_run_id: str | None = None
+    tolerance: ToleranceConfig | None = None
+
+    @model_validator(mode="after")
+    def validate_run_ids(self) -> CompareMatrixRequest:
+        if len(set(self.run_ids)) != len(self.run_ids):
+            raise ValueError("run_ids must not contain duplicates")
+        if self.reference_run_id is not None and self.reference_run_id not in self.run_ids:
+            raise ValueError("reference_run_id must be one of run_ids")
+        return self
+
+
+class PairwiseParity(BaseModel):
+    left_run_id: str
+    right_run_id: str
+    token_data_available: bool
+    token_pair_count: int
+    token_mismatch_count: int
+    first_divergence_index: int | None
+    max_token_abs_diff: float
+    mean_token_abs_diff: float
+    token_parity_pass: bool
+    score_abs_diff: float
+    score_parity_pass: bool
+    spearman: float | None
+    kendall_tau: float | None
+
+
+class RunDeviation(BaseModel):
+    run_id: str
+    score_diff: float
+    latency_ms_diff: float
+    latency_pct_diff: float
+    throughput_items_per_s_diff: float
+    token_mismatch_count: int
+    max_token_abs_diff: float
+
+
+class CompareMatrixResponse(BaseModel):
+    run_ids: list[str]
+    reference_run_id: str
+    token_pair_count: int
+    item_count: int
+    token_abs_epsilon: float
+    token_rel_epsilon: float
+    pairs: list[PairwiseParity]
+    deviations: list[RunDeviation]
+
+
+# Runs referenced by one gate, both sides together; each run can carry thousands of samples.
+GATE_MAX_RUNS = 500
+
+
+class GateRequest(BaseModel):
+    baseline_run_ids: list[str] = Field(min_length=1, max_length=GATE_MAX_RUNS)
+    candidate_run_ids: list[str] = Field(min_length=1, max_length=GATE_MAX_RUNS)
+    suite_id: str | None = None
+    thresholds: GateThresholds | None = None
+    seed: int | None = None
+
+    @model_validator(mode="after")
+    def validate_run_count(self) -> GateRequest:
+        if len(self.baseline_run_ids) + len(self.candidate_run_ids) > GATE_MAX_RUNS:
+            raise ValueError(f"a gate may reference at most {GATE_MAX_RUNS} runs across both sides")
+        return self
+
+
+class GateMetricResult(BaseModel):
+    metric: str
+    verdict: Literal["pass", "fail", "inconclusive"]
+    baseline_n: int
+    candidate_n: int
+    baseline_runs: int
+    candidate_runs: int
+    baseline_mean: float | None
+    candidate_mean: float | None
+    diff: float | None
+    ci_low: float | None
+    ci_high: float | None
+    p_value: float | None
+    threshold: float
+    reason: str
+
+
+class GateResponse(BaseModel):
+    verdict: Literal["pass", "fail", "inconclusive"]
+    thresholds: GateThresholds
+    latency: GateMetricResult
+    score: GateMetricResult
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from studio_api.schemas import RunCreate, SuiteCreate
+
+_ACTIVE_STATUSES = ("pending", "running")
+
+
+def expand_matrix(matrix: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of the matrix dimensions, varying the last dimension fastest."""
+    names = list(matrix)
+    return [dict(zip(names, values)) for values in itertools.product(*(matrix[name] for name in names))]
+
+
+def matrix_cell_key(cell: dict[str, Any]) -> str:
+    serialized = json.dumps(cell, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def suite_run_count(suite: SuiteCreate) -> int:
+    cells = 1
+    for values in suite.matrix.values():
+        cells *= len(values)
+    return cells * len(suite.cases) * len(suite.backends)
+
+
+def build_suite_children(suite: SuiteCreate) -> list[tuple[RunCreate, int, dict[str, Any]]]:
+    """Child run payloads as ``(payload, case_index, cell)`` ordered by cell, case, then backend.
+
+    Parameters layer as suite defaults, then case overrides, then the matrix cell.
+    """
+    cells = expand_matrix(suite.matrix)
+    shared = {
+        "mode": suite.mode,
+        "tolerance": suite.tolerance.model_dump() if suite.tolerance else None,
+        "repro_metadata": suite.repro_metadata.model_dump() if suite.repro_metadata else None,
+        "priority": suite.priority,
+        "submitter": suite.submitter,
+        "device_class": suite.device_class,
+    }
+    children: list[tuple[RunCreate, int, dict[str, Any]]] = []
+    for cell in cells:
+        for case_index, case in enumerate(suite.cases):
+            for backend in suite.backends:
+                try:
+                    payload = RunCreate.model_validate(
+                        {
+                            **shared,
+                            "backend": backend,
+                            "prompt": case.prompt,
+                            "parameters": {**suite.parameters, **case.parameters, **cell},
+                            "score_input": case.score_input.model_dump() if case.score_input else None,
+                            "mask_config": case.mask_config.model_dump() if case.mask_config else None,
+                        }
+                    )
+                except ValidationError as exc:
+                    raise HTTPException(
+                        status_code=422,
+                        detail={"case_index": case_index, "errors": exc.errors(include_context=False)},
+                    ) from exc
+                children.append((payload, case_index, cell))
+    return children
+
+
+def suite_status(status_counts: dict[str, int], run_count: int) -> tuple[str, int, float]:
+    """Aggregate ``(status, completed_count, progress)`` for a suite from its child status counts.
+
+    A finished suite is ``failed`` if any child failed, ``partial`` if some children were canceled
+    and the rest succeeded, ``canceled`` if all were canceled, else ``succeeded``.
+    """
+    active = sum(status_counts.get(status, 0) for status in _ACTIVE_STATUSES)
+    completed = run_count - active
+    progress = completed / run_count if run_count else 1.0
+    if active:
+        status = "running" if completed or status_counts.get("running") else "pending"
+    elif status_counts.get("failed"):
+        status = "failed"
+    elif status_counts.get("canceled"):
+        # Only a suite whose every child succeeded is green.
+        status = "partial" if status_counts.get("succeeded") else "canceled"
+    else:
+        status = "succeeded"
+    return status, completed, progress
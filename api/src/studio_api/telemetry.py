@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from datetime import datetime, timezone
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from studio_api.db import SessionLocal
+from studio_api.models import Run
+from studio_api.queue import priority_name
+
+# Request latency spans cheap lookups up to matrix compares over many runs.
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_SECONDS = Histogram(
+    "studio_api_request_duration_seconds",
+    "API request latency until the response starts, by route template.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+RUNS_CREATED = Counter(
+    "studio_api_runs_created_total",
+    "Runs created through the API; source is queued or cached (served from the result cache).",
+    ["backend", "mode", "priority", "source"],
+)
+
+
+def record_runs_created(rows: Iterable[dict]) -> None:
+    for row in rows:
+        RUNS_CREATED.labels(
+            row["backend"],
+            row["mode"],
+            priority_name(row.get("priority")),
+            "cached" if row.get("cached_from_run_id") else "queued",
+        ).inc()
+
+
+async def observe_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """HTTP middleware timing every request; streaming responses are timed to their first byte."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        # Label by template, never by raw path, so run ids cannot blow up the series count.
+        REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - started)
+
+
+class RunStatusCollector(Collector):
+    """Pending/running run counts per backend, queried from Postgres at scrape time."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        runs = GaugeMetricFamily("studio_runs", "Runs currently pending or running.", labels=["status", "backend"])
+        oldest = GaugeMetricFamily(
+            "studio_runs_oldest_pending_age_seconds", "Age of the oldest pending run.", labels=["backend"]
+        )
+        session = SessionLocal()
+        try:
+            rows = session.execute(
+                select(Run.status, Run.backend, func.count(), func.min(Run.created_at))
+                .where(Run.status.in_(("pending", "running")))
+                .group_by(Run.status, Run.backend)
+            ).all()
+        except SQLAlchemyError:
+            # A scrape must not fail because the database is briefly unavailable.
+            return
+        finally:
+            session.close()
+        now = datetime.now(tz=timezone.utc)
+        for status, backend, count, oldest_created_at in rows:
+            runs.add_metric([status, backend], count)
+            if status == "pending" and oldest_created_at is not None:
+                oldest.add_metric([backend], (now - oldest_created_at).total_seconds())
+        yield runs
+        yield oldest
+
+
+REGISTRY.register(RunStatusCollector())
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
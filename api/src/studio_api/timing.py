@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import func
+
+from studio_api.models import Run
+
+# Must match the runner's span names (studio_runner.spans); "total" and "overhead" are rollups.
+SPAN_NAMES = (
+    "queue_wait",
+    "claim",
+    "adapter_setup",
+    "worker_startup",
+    "execute",
+    "parse",
+    "artifact_io",
+    "upload",
+    "finalize",
+)
+ROLLUPS = {"total": ("total_ms",), "overhead": ("overhead_ms",)}
+
+
+def _span_value(name: str):
+    path = ROLLUPS.get(name, ("spans_ms", name))
+    return Run.timing_json[path].as_float()
+
+
+def timing_aggregate_columns() -> list:
+    """``count``/``mean``/``p50``/``p95``/``max`` columns for every span, labelled ``<span>__<stat>``."""
+    columns = []
+    for name in (*SPAN_NAMES, *ROLLUPS):
+        value = _span_value(name)
+        columns.extend(
+            [
+                func.count(value).label(f"{name}__count"),
+                func.avg(value).label(f"{name}__mean_ms"),
+                func.percentile_cont(0.5).within_group(value).label(f"{name}__p50_ms"),
+                func.percentile_cont(0.95).within_group(value).label(f"{name}__p95_ms"),
+                func.max(value).label(f"{name}__max_ms"),
+            ]
+        )
+    return columns
+
+
+def timing_stats(row: Any) -> dict[str, dict[str, float | int]]:
+    """Spans with at least one sample, keyed by name, from a row selected with ``timing_aggregate_columns``."""
+    stats: dict[str, dict[str, float | int]] = {}
+    for name in (*SPAN_NAMES, *ROLLUPS):
+        count = row[f"{name}__count"]
+        if not count:
+            continue
+        stats[name] = {"count": count}
+        for stat in ("mean_ms", "p50_ms", "p95_ms", "max_ms"):
+            stats[name][stat] = round(float(row[f"{name}__{stat}"]), 3)
+    return stats
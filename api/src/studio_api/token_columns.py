@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+# Must match the runner's writer (studio_runner.token_columns).
+TOKEN_COLUMNS_MAGIC = b"STOKCOL\x00"
+TOKEN_COLUMNS_VERSION = 1
+TOKEN_COLUMNS_FORMAT = "studio-token-columns-v1"
+
+
+class TokenColumnsFormatError(ValueError):
+    pass
+
+
+def decode_token_columns(data: bytes | memoryview) -> dict[str, Any]:
+    """Decode a token-columns artifact.
+
+    Numeric columns are read-only numpy views over ``data`` (no copy); ``tokens`` is a list of str.
+    """
+    view = memoryview(data)
+    prefix = len(TOKEN_COLUMNS_MAGIC) + 8
+    if len(view) < prefix or bytes(view[: len(TOKEN_COLUMNS_MAGIC)]) != TOKEN_COLUMNS_MAGIC:
+        raise TokenColumnsFormatError("Not a token columns artifact")
+    (header_length,) = struct.unpack_from("<Q", view, len(TOKEN_COLUMNS_MAGIC))
+    try:
+        header = json.loads(bytes(view[prefix : prefix + header_length]).rstrip(b"\x00"))
+    except ValueError as exc:
+        raise TokenColumnsFormatError("Corrupt token columns header") from exc
+    if header.get("version") != TOKEN_COLUMNS_VERSION:
+        raise TokenColumnsFormatError(f"Unsupported token columns version: {header.get('version')}")
+
+    body = view[prefix + header_length :]
+    columns: dict[str, Any] = {}
+    for column in header["columns"]:
+        buffers = [body[offset : offset + length] for offset, length in column["buffers"]]
+        if column["dtype"] == "utf8":
+            offsets = np.frombuffer(buffers[0], dtype="<i4")
+            raw = bytes(buffers[1])
+            columns[column["name"]] = [
+                raw[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+            ]
+        else:
+            columns[column["name"]] = np.frombuffer(buffers[0], dtype=column["dtype"])
+    return columns
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from prometheus_client import REGISTRY
+
+from studio_api import telemetry
+from studio_api.main import app
+from studio_api.queue import PRIORITY_RANKS
+
+
+class _Rows:
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[tuple]:
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+
+    def execute(self, statement):
+        return _Rows(self.rows)
+
+    def close(self) -> None:
+        pass
+
+
+def _get(path: str) -> int:
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route_template() -> None:
+    labels = {"method": "GET", "route": "/health", "status": "200"}
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = (
+        _sample("studio_api_request_duration_seconds_count", labels),
+        _sample("studio_api_request_duration_seconds_count", unmatched),
+    )
+
+    assert _get("/health") == 200
+    assert _get("/api/v1/no-such-route") == 404
+
+    assert _sample("studio_api_request_duration_seconds_count", labels) == before[0] + 1
+    assert _sample("studio_api_request_duration_seconds_count", unmatched) == before[1] + 1
+
+
+def test_runs_created_counts_cache_hits_separately() -> None:
+    queued = {"backend": "mock", "mode": "score", "priority": "batch", "source": "queued"}
+    cached = {**queued, "source": "cached"}
+    before = (_sample("studio_api_runs_created_total", queued), _sample("studio_api_runs_created_total", cached))
+
+    telemetry.record_runs_created(
+        [
+            {"backend": "mock", "mode": "score", "priority": PRIORITY_RANKS["batch"]},
+            {"backend": "mock", "mode": "score", "priority": PRIORITY_RANKS["batch"], "cached_from_run_id": "run-0"},
+        ]
+    )
+
+    assert _sample("studio_api_runs_created_total", queued) == before[0] + 1
+    assert _sample("studio_api_runs_created_total", cached) == before[1] + 1
+
+
+def test_run_status_collector_reports_queue_depth(monkeypatch: pytest.MonkeyPatch) -> None:
+    oldest = datetime.now(tz=timezone.utc) - timedelta(minutes=5)
+    rows = [("pending", "sglang-jax", 7, oldest), ("running", "sglang-jax", 2, oldest)]
+    monkeypatch.setattr(telemetry, "SessionLocal", lambda: _FakeSession(rows))
+
+    families = {family.name: family for family in telemetry.RunStatusCollector().collect()}
+
+    depth = {(sample.labels["status"], sample.labels["backend"]): sample.value for sample in families["studio_runs"].samples}
+    assert depth == {("pending", "sglang-jax"): 7, ("running", "sglang-jax"): 2}
+    [age] = families["studio_runs_oldest_pending_age_seconds"].samples
+    assert age.value == pytest.approx(300.0, abs=5.0)
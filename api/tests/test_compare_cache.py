@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from studio_api.main import _compare_is_current
+from studio_api.metrics import COMPARE_RESULTS_VERSION
+from studio_api.models import Compare, Run
+
+_T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+_T1 = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def _compare(**overrides) -> Compare:
+    values = {
+        "left_run_id": "left",
+        "right_run_id": "right",
+        "tolerance_hash": "h",
+        "left_completed_at": _T0,
+        "right_completed_at": _T0,
+        "compare_version": COMPARE_RESULTS_VERSION,
+        "overall_pass": True,
+        "result": {},
+    }
+    values.update(overrides)
+    return Compare(**values)
+
+
+def test_compare_is_current_until_a_run_is_re_executed() -> None:
+    left = Run(id="left", completed_at=_T0)
+    right = Run(id="right", completed_at=_T0)
+    assert _compare_is_current(_compare(), left, right)
+
+    right.completed_at = _T1
+    assert not _compare_is_current(_compare(), left, right)
+
+
+def test_compare_is_stale_after_compare_logic_changes() -> None:
+    left = Run(id="left", completed_at=_T0)
+    right = Run(id="right", completed_at=_T0)
+    assert not _compare_is_current(_compare(compare_version=COMPARE_RESULTS_VERSION - 1), left, right)
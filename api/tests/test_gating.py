@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from studio_api import gating
+from studio_api.gating import (
+    combine_verdicts,
+    gate_latency_regression,
+    gate_score_parity,
+    latency_samples,
+    permutation_p_value,
+)
+from studio_api.schemas import GateRequest
+
+
+def _latency_gate(baseline: list[np.ndarray], candidate: list[np.ndarray], **overrides) -> dict:
+    options = {"max_regression_pct": 10.0, "confidence": 0.95, "resamples": 2000, "min_samples": 3}
+    options.update(overrides)
+    return gate_latency_regression(baseline, candidate, rng=np.random.default_rng(7), **options)
+
+
+def _runs(rng: np.random.Generator, run_means: np.ndarray, per_run: int, noise: float = 5.0) -> list[np.ndarray]:
+    return [rng.normal(mean, noise, size=per_run) for mean in run_means]
+
+
+def test_latency_gate_passes_noise_and_fails_real_regressions() -> None:
+    rng = np.random.default_rng(0)
+    baseline = _runs(rng, rng.normal(100.0, 2.0, size=20), per_run=50)
+
+    noisy = _latency_gate(baseline, _runs(rng, rng.normal(101.0, 2.0, size=20), per_run=50))
+    assert noisy["verdict"] == "pass"
+    assert noisy["ci_low"] < noisy["diff"] < noisy["ci_high"] < 10.0
+    assert (noisy["baseline_runs"], noisy["baseline_n"]) == (20, 1000)
+
+    regressed = _latency_gate(baseline, _runs(rng, rng.normal(130.0, 2.0, size=20), per_run=50))
+    assert regressed["verdict"] == "fail"
+    assert regressed["ci_low"] > 10.0
+    assert regressed["p_value"] < 0.05
+
+
+def test_latency_gate_accounts_for_run_to_run_variance() -> None:
+    rng = np.random.default_rng(2)
+    # Each run settles at its own level; thousands of requests per run do not remove that spread.
+    baseline = _runs(rng, rng.normal(100.0, 15.0, size=3), per_run=2000, noise=1.0)
+    candidate = _runs(rng, rng.normal(120.0, 15.0, size=3), per_run=2000, noise=1.0)
+
+    gate = _latency_gate(baseline, candidate)
+
+    assert gate["verdict"] == "inconclusive"
+    assert gate["p_value"] > 0.05
+    assert gate["ci_high"] - gate["ci_low"] > 10.0
+
+
+def test_latency_gate_is_inconclusive_near_threshold_or_without_samples() -> None:
+    rng = np.random.default_rng(1)
+    baseline = [rng.normal(100.0, 20.0, size=1) for _ in range(6)]
+    candidate = [rng.normal(110.0, 20.0, size=1) for _ in range(6)]
+    assert _latency_gate(baseline, candidate)["verdict"] == "inconclusive"
+
+    single = _latency_gate([np.array([100.0])], [np.array([150.0])])
+    assert single["verdict"] == "inconclusive"
+    assert single["reason"] == "need at least 3 samples per side"
+
+
+def test_resampling_works_in_bounded_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(gating, "_CHUNK_CELLS", 64)
+    rng = np.random.default_rng(4)
+    baseline = _runs(rng, np.full(40, 100.0), per_run=5)
+    candidate = _runs(rng, np.full(40, 100.0), per_run=5)
+
+    gate = _latency_gate(baseline, candidate, resamples=1000)
+
+    assert gate["verdict"] == "pass"
+    assert 0.0 < gate["p_value"] <= 1.0
+
+
+def test_score_gate_handles_deterministic_scores() -> None:
+    def gate(baseline: list[float], candidate: list[float]) -> dict:
+        return gate_score_parity(
+            np.array(baseline), np.array(candidate), 0.02, 0.95, 500, np.random.default_rng(3)
+        )
+
+    assert gate([0.5], [0.51])["verdict"] == "pass"
+    assert gate([0.5], [0.6])["verdict"] == "fail"
+    assert gate([0.5, 0.5, 0.5], [0.49, 0.53, 0.52])["verdict"] == "inconclusive"
+
+
+def test_permutation_p_value_separates_identical_and_shifted_samples() -> None:
+    rng = np.random.default_rng(5)
+    same = np.array([1.0, 2.0, 3.0, 4.0])
+    assert permutation_p_value(same, same.copy(), 999, rng) == 1.0
+    assert permutation_p_value(same, same + 10.0, 999, rng) < 0.05
+
+
+def test_verdicts_and_samples_helpers() -> None:
+    assert combine_verdicts(["pass", "inconclusive"]) == "inconclusive"
+    assert combine_verdicts(["inconclusive", "fail"]) == "fail"
+    assert combine_verdicts(["pass", "pass"]) == "pass"
+    assert latency_samples({"latency_ms": 12.0, "latency_samples_ms": [10.0, 11.0]}) == [10.0, 11.0]
+    assert latency_samples({"latency_ms": 12.0}) == [12.0]
+    assert latency_samples({}) == []
+
+
+def test_gate_request_caps_the_total_run_count() -> None:
+    GateRequest(baseline_run_ids=["b"] * 250, candidate_run_ids=["c"] * 250)
+    with pytest.raises(ValidationError, match="at most 500 runs"):
+        GateRequest(baseline_run_ids=["b"] * 300, candidate_run_ids=["c"] * 201)
@@ -1,6 +1,8 @@
-from studio_api.metrics import compare_results
+import numpy as np
 import pytest
 
+from studio_api.metrics import abs_diff_envelope, compare_many, compare_results, rank_agreement, select_token_window
+
 
 def test_compare_results_computes_expected_deltas() -> None:
     left = {"score": 0.82, "latency_ms": 120.0, "throughput_items_per_s": 8.0}
@@ -54,3 +56,132 @@ def test_compare_results_token_rel_tolerance_can_pass() -> None:
     out = compare_results(left, right, tolerance={"abs_epsilon": 0.0, "rel_epsilon": 0.02})
     assert out["token_parity_pass"] is True
     assert out["token_mismatch_count"] == 0
+
+
+def test_compare_results_tolerates_mixed_token_payloads() -> None:
+    left = {
+        "score": 0.0,
+        "latency_ms": 10.0,
+        "throughput_items_per_s": 1.0,
+        "tokens": ["A"],
+        "token_logprobs": [-0.1, "bad", None, -0.5, -0.7],
+        "token_ranks": [1.0, 3, 2],
+    }
+    right = {
+        "score": 0.0,
+        "latency_ms": 10.0,
+        "throughput_items_per_s": 1.0,
+        "tokens": ["A", "B"],
+        "token_logprobs": [-0.1, -0.5, -0.9],
+        "token_ranks": [1, 1, 4],
+    }
+
+    out = compare_results(left, right)
+
+    assert out["token_pair_count"] == 3
+    assert [row["token"] for row in out["token_diffs"]] == ["A", "B", "tok_2"]
+    assert out["token_mismatch_count"] == 1
+    assert out["first_divergence_index"] == 2
+    assert out["max_token_abs_diff"] == pytest.approx(0.2)
+    assert out["rank_delta_summary"]["worst_rank_drop"] == pytest.approx(2.0)
+    assert out["rank_delta_summary"]["mrr_left"] == pytest.approx((1.0 + 1 / 3 + 0.5) / 3)
+
+
+def test_compare_results_without_token_data_has_empty_summaries() -> None:
+    out = compare_results({"score": 1.0}, {"score": 1.0})
+
+    assert out["token_data_available"] is False
+    assert out["first_divergence_index"] is None
+    assert out["token_diffs"] == []
+    assert out["rank_delta_summary"]["pair_count"] == 0.0
+
+
+def test_select_token_window_modes() -> None:
+    abs_diff = np.array([0.0, 0.0, 0.5, 0.0, 0.9, 0.1, 0.0, 0.0])
+    is_match = abs_diff <= 1e-6
+
+    assert select_token_window(abs_diff, is_match, "range", offset=6, limit=4).tolist() == [6, 7]
+    assert select_token_window(abs_diff, is_match, "first_divergence", limit=4).tolist() == [0, 1, 2, 3]
+    assert select_token_window(abs_diff, is_match, "first_divergence", limit=2).tolist() == [1, 2]
+    assert select_token_window(abs_diff, is_match, "top_k", limit=3).tolist() == [4, 2, 5]
+    assert select_token_window(abs_diff, is_match).tolist() == list(range(8))
+
+
+def test_abs_diff_envelope_downsamples_min_max() -> None:
+    envelope = abs_diff_envelope(np.array([0.1, 0.4, 0.2, 0.0, 0.3]), buckets=2)
+    assert envelope == [
+        {"start": 0, "end": 2, "min": 0.1, "max": 0.4},
+        {"start": 2, "end": 5, "min": 0.0, "max": 0.3},
+    ]
+    assert len(abs_diff_envelope(np.zeros(3), buckets=10)) == 3
+    assert abs_diff_envelope(np.zeros(0), buckets=10) == []
+
+
+def test_compare_results_windows_token_rows() -> None:
+    left = {"tokens": ["a", "b", "c", "d"], "token_logprobs": [-0.1, -0.2, -0.3, -0.4]}
+    right = {"tokens": ["a", "b", "c", "d"], "token_logprobs": [-0.1, -0.9, -0.3, -0.4]}
+
+    out = compare_results(left, right, token_window={"mode": "top_k", "limit": 1}, envelope_buckets=2)
+
+    assert out["token_pair_count"] == 4
+    assert [row["token"] for row in out["token_diffs"]] == ["b"]
+    assert len(out["abs_diff_envelope"]) == 2
+
+
+def test_rank_agreement_matches_reference_values() -> None:
+    scores = np.array([[1.0, 2.0, 3.0, 4.0, 5.0], [5.0, 4.0, 3.0, 2.0, 1.0], [1.0, 3.0, 2.0, 4.0, 5.0]])
+
+    spearman, kendall = rank_agreement(scores, kendall_max_items=100)
+
+    assert spearman[0, 1] == pytest.approx(-1.0)
+    assert spearman[0, 2] == pytest.approx(0.9)
+    assert kendall is not None
+    assert kendall[0, 2] == pytest.approx(0.8)
+    assert rank_agreement(scores, kendall_max_items=4)[1] is None
+
+
+def test_compare_many_builds_pairwise_parity_and_reference_deviation() -> None:
+    runs = [
+        ("jax", {"score": 1.0, "latency_ms": 10.0, "token_logprobs": [-0.1, -0.2, -0.3], "item_scores": [1, 2, 3]}),
+        ("torch", {"score": 1.01, "latency_ms": 12.0, "token_logprobs": [-0.1, -0.25], "item_scores": [1, 3, 2]}),
+        ("baseline", {"score": 2.0, "latency_ms": 8.0}),
+    ]
+
+    out = compare_many(runs, reference_run_id="jax")
+
+    assert out["token_pair_count"] == 2
+    assert out["item_count"] == 3
+    jax_torch, jax_baseline, _ = out["pairs"]
+    assert (jax_torch["left_run_id"], jax_torch["right_run_id"]) == ("jax", "torch")
+    assert jax_torch["token_mismatch_count"] == 1
+    assert jax_torch["first_divergence_index"] == 1
+    assert jax_torch["spearman"] == pytest.approx(0.5)
+    assert jax_torch["kendall_tau"] == pytest.approx(1 / 3)
+    assert jax_baseline["token_data_available"] is False
+    assert jax_baseline["spearman"] is None
+
+    deviations = {row["run_id"]: row for row in out["deviations"]}
+    assert deviations["jax"]["score_diff"] == 0.0
+    assert deviations["torch"]["latency_pct_diff"] == pytest.approx(20.0)
+    assert deviations["torch"]["token_mismatch_count"] == 1
+    assert deviations["baseline"]["score_diff"] == pytest.approx(1.0)
+
+
+def test_compare_many_pairs_match_two_run_compares_despite_a_short_run() -> None:
+    runs = [
+        ("a", {"token_logprobs": [-0.1, -0.2, -0.3, -0.4]}),
+        ("b", {"token_logprobs": [-0.1, -0.2, -0.3, -0.9, -0.5]}),
+        ("short", {"token_logprobs": [-0.1]}),
+    ]
+
+    out = compare_many(runs, reference_run_id="a")
+
+    assert out["token_pair_count"] == 1
+    pairs = {(pair["left_run_id"], pair["right_run_id"]): pair for pair in out["pairs"]}
+    for (left, right), pair in pairs.items():
+        expected = compare_results(dict(runs)[left], dict(runs)[right])
+        for key in ("token_pair_count", "token_mismatch_count", "first_divergence_index", "max_token_abs_diff"):
+            assert pair[key] == expected[key], (left, right, key)
+        assert pair["mean_token_abs_diff"] == pytest.approx(expected["mean_token_abs_diff"])
+    assert pairs[("a", "b")]["token_pair_count"] == 4
+    assert pairs[("a", "b")]["first_divergence_index"] == 3
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from studio_api import artifacts
+from studio_api.artifacts import ResultDetailUnavailable, hydrate_result
+
+
+def test_hydrate_passes_through_inline_results() -> None:
+    result = {"score": 1.0, "tokens": ["a"]}
+    assert hydrate_result(result) is result
+    assert hydrate_result(None) is None
+
+
+def test_hydrate_merges_offloaded_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    fetched: list[tuple[str, str | None]] = []
+
+    def _fetch(key: str, encoding: str | None) -> dict:
+        fetched.append((key, encoding))
+        return {"score": 1.0, "tokens": ["a", "b"], "token_logprobs": [-0.1, -0.2], "extra": True}
+
+    monkeypatch.setattr(artifacts, "_fetch_result_detail", _fetch)
+    stored = {
+        "score": 1.0,
+        "token_count": 2,
+        "detail_ref": {"key": "runs/r/result.json.gz", "encoding": "gzip", "fields": ["tokens", "token_logprobs"]},
+    }
+
+    hydrated = hydrate_result(stored)
+
+    assert fetched == [("runs/r/result.json.gz", "gzip")]
+    assert hydrated["tokens"] == ["a", "b"]
+    assert hydrated["token_logprobs"] == [-0.1, -0.2]
+    assert "extra" not in hydrated
+    assert "tokens" not in stored
+
+
+def test_hydrate_surfaces_fetch_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fetch(key: str, encoding: str | None) -> dict:
+        raise ResultDetailUnavailable("gone")
+
+    monkeypatch.setattr(artifacts, "_fetch_result_detail", _fetch)
+    with pytest.raises(ResultDetailUnavailable):
+        hydrate_result({"detail_ref": {"key": "k", "fields": ["tokens"]}})
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from studio_api.main import _run_cache_key
+
+_REPRO = {"backend_commit_sha": "abc123", "model_revision": "rev-1", "branch": "main", "pr_label": None}
+
+
+def _key(**overrides):
+    args = {
+        "backend": "sglang-jax",
+        "mode": "score",
+        "prompt": "q",
+        "parameters": {},
+        "score_input_hash": "s" * 64,
+        "mask_hash": "m" * 64,
+        "repro_metadata": _REPRO,
+    }
+    args.update(overrides)
+    return _run_cache_key(**args)
+
+
+def test_cache_key_requires_pinned_commit_and_model_revision() -> None:
+    assert _key(repro_metadata=None) is None
+    assert _key(repro_metadata={"backend_commit_sha": "abc123"}) is None
+    assert _key(repro_metadata={"model_revision": "rev-1"}) is None
+    assert _key() is not None
+
+
+def test_cache_key_ignores_branch_and_pr_labels() -> None:
+    relabeled = {**_REPRO, "branch": "feature/x", "pr_label": "PR-42"}
+    assert _key(repro_metadata=relabeled) == _key()
+
+
+def test_cache_key_changes_with_work_inputs() -> None:
+    baseline = _key()
+    assert _key(repro_metadata={**_REPRO, "backend_commit_sha": "def456"}) != baseline
+    assert _key(mask_hash=None) != baseline
+    assert _key(parameters={"load": {"concurrency": [1]}}) != baseline
+    assert _key(backend="sglang-pytorch") != baseline
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+from studio_api.events import RunEventBroker, RunEventCursor, format_sse
+
+
+def test_format_sse_frames_id_and_data() -> None:
+    assert format_sse(7, '{"a":1}') == 'id: 7\nevent: run\ndata: {"a":1}\n\n'
+
+
+def test_event_cursor_tracks_and_fills_sequence_gaps() -> None:
+    cursor = RunEventCursor(last_id=10)
+
+    cursor.advance(11)
+    cursor.advance(14)
+    assert cursor.last_id == 14
+    assert cursor.pending_gaps() == [12, 13]
+
+    cursor.advance(12)
+    assert cursor.last_id == 14
+    assert cursor.pending_gaps() == [13]
+
+
+def test_event_cursor_expires_gaps() -> None:
+    cursor = RunEventCursor(last_id=0, gap_timeout_seconds=0.0)
+    cursor.advance(3)
+    assert cursor.pending_gaps() == []
+
+
+def test_broker_publish_wakes_subscribers_from_other_threads() -> None:
+    broker = RunEventBroker()
+
+    async def _scenario() -> bool:
+        wakeup = broker.subscribe()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, broker.publish)
+        await asyncio.wait_for(wakeup.wait(), timeout=1.0)
+        broker.unsubscribe(wakeup)
+        return wakeup.is_set()
+
+    assert asyncio.run(_scenario()) is True
+    assert broker._subscribers == set()
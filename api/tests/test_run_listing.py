@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from studio_api.main import _decode_run_cursor, _encode_run_cursor
+
+
+def test_run_cursor_round_trips_created_at_and_id() -> None:
+    created_at = datetime(2026, 2, 7, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = _encode_run_cursor(created_at, "run-123")
+
+    assert _decode_run_cursor(cursor) == (created_at, "run-123")
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90LWpzb24=", "WyJhIl0="])
+def test_run_cursor_rejects_malformed_input(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_run_cursor(cursor)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from studio_api.main import _build_run_values
+from studio_api.models import Run
+from studio_api.queue import PRIORITY_RANKS, priority_name, queue_position, unserved_lane_warnings
+from studio_api.schemas import RunCreate, SuiteCreate
+from studio_api.suites import build_suite_children
+
+
+class _CapturingSession:
+    def __init__(self, ahead: int) -> None:
+        self.ahead = ahead
+        self.statements: list[str] = []
+
+    def scalar(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self.ahead
+
+
+def test_run_priority_defaults_depend_on_submission_path() -> None:
+    payload = RunCreate(backend="mock", prompt="hello")
+
+    assert _build_run_values(payload)["priority"] == PRIORITY_RANKS["interactive"]
+    assert _build_run_values(payload, default_priority="batch")["priority"] == PRIORITY_RANKS["batch"]
+    explicit = RunCreate(backend="mock", prompt="hello", priority="ci", submitter="ci-bot")
+    values = _build_run_values(explicit, default_priority="batch")
+    assert values["priority"] == PRIORITY_RANKS["ci"]
+    assert values["submitter"] == "ci-bot"
+    assert _build_run_values(payload)["submitter"] == "anonymous"
+
+
+def test_suite_children_inherit_priority_and_submitter() -> None:
+    suite = SuiteCreate(name="nightly", backends=["mock"], cases=[{"prompt": "hi"}], submitter="nightly-sweep")
+    [(child, _, _)] = build_suite_children(suite)
+
+    assert child.priority == "batch"
+    assert child.submitter == "nightly-sweep"
+
+
+def test_queue_position_counts_runs_ahead_in_priority_order() -> None:
+    run = Run(
+        id="run-1",
+        status="pending",
+        priority=PRIORITY_RANKS["ci"],
+        created_at=datetime(2026, 3, 1, tzinfo=timezone.utc),
+    )
+    session = _CapturingSession(ahead=4)
+
+    assert queue_position(session, run) == 5
+    [sql] = session.statements
+    assert "runs.priority < %(priority_1)s OR runs.priority = %(priority_2)s AND runs.created_at <" in sql
+
+    run.status = "running"
+    assert queue_position(session, run) is None
+    assert priority_name(PRIORITY_RANKS["batch"]) == "batch"
+
+
+class _RunnerRows:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+def test_unserved_lanes_are_reported_instead_of_pending_silently() -> None:
+    session = _RunnerRows(
+        [
+            ("cpu", {"lanes": ["mock:benchmark", "mock:score", "sglang-jax:benchmark"]}),
+            ("tpu-v5e", {"lanes": ["sglang-jax:benchmark", "sglang-jax:score"]}),
+        ]
+    )
+
+    warnings = unserved_lane_warnings(
+        session,
+        [
+            ("sglang-jax", "benchmark", None),
+            ("sglang-jax", "score", "tpu-v5e"),
+            ("sglang-jax", "score", "cpu"),
+            ("sglang-pytorch", "score", None),
+            ("sglang-pytorch", "score", None),
+        ],
+    )
+
+    assert warnings == [
+        "No registered runner can serve lane sglang-jax:score on device class cpu; its runs stay pending until one registers",
+        "No registered runner can serve lane sglang-pytorch:score; its runs stay pending until one registers",
+    ]
+    [sql] = session.statements
+    assert "runners.heartbeat_at >=" in sql
+    assert unserved_lane_warnings(session, []) == []
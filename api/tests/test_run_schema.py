@@ -3,7 +3,7 @@ from __future__ import annotations
 import pytest
 from pydantic import ValidationError
 
-from studio_api.schemas import RunCreate
+from studio_api.schemas import RunBatchCreate, RunCreate
 
 
 def test_benchmark_mode_requires_prompt() -> None:
@@ -55,3 +55,20 @@ def test_custom_mask_requires_payload_or_artifact_ref() -> None:
             score_input={"query": "q", "items": ["a"]},
             mask_config={"preset": "custom"},
         )
+
+
+def test_batch_rejects_duplicate_idempotency_keys() -> None:
+    with pytest.raises(ValidationError, match="duplicate idempotency_key values in batch: ci-1"):
+        RunBatchCreate(
+            runs=[
+                {"backend": "mock", "prompt": "a", "idempotency_key": "ci-1"},
+                {"backend": "mock", "prompt": "b", "idempotency_key": "ci-1"},
+                {"backend": "mock", "prompt": "c"},
+                {"backend": "mock", "prompt": "d"},
+            ]
+        )
+
+
+def test_batch_validates_every_run() -> None:
+    with pytest.raises(ValidationError, match="runs.1"):
+        RunBatchCreate(runs=[{"backend": "mock", "prompt": "a"}, {"backend": "mock", "mode": "score"}])
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from sqlalchemy.dialects import postgresql
+
+from studio_api.main import get_timing
+from studio_api.timing import SPAN_NAMES, timing_stats
+
+
+class _Rows:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self) -> "_Rows":
+        return self
+
+    def all(self) -> list[dict]:
+        return self._rows
+
+
+class _CapturingSession:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return _Rows(self.rows)
+
+
+def _aggregate_row(**spans: float) -> dict:
+    row: dict = defaultdict(lambda: None)
+    for name in (*SPAN_NAMES, "total", "overhead"):
+        row[f"{name}__count"] = 0
+    for name, value in spans.items():
+        row[f"{name}__count"] = 3
+        for stat in ("mean_ms", "p50_ms", "p95_ms", "max_ms"):
+            row[f"{name}__{stat}"] = value
+    return row
+
+
+def test_timing_stats_skip_spans_without_samples() -> None:
+    stats = timing_stats(_aggregate_row(execute=1200.12345, queue_wait=40.0))
+
+    assert set(stats) == {"execute", "queue_wait"}
+    assert stats["execute"] == {"count": 3, "mean_ms": 1200.123, "p50_ms": 1200.123, "p95_ms": 1200.123, "max_ms": 1200.123}
+
+
+def test_timing_endpoint_groups_runs_by_backend_and_mode() -> None:
+    row = _aggregate_row(execute=900.0, upload=12.0, overhead=20.0)
+    row.update({"backend": "sglang-jax", "mode": "benchmark", "run_count": 3})
+    session = _CapturingSession([row])
+
+    view = get_timing(
+        backend="sglang-jax", mode=None, status="succeeded", submitter=None, suite_id=None, since=None, session=session
+    )
+
+    [item] = view.items
+    assert (item.backend, item.mode, item.run_count) == ("sglang-jax", "benchmark", 3)
+    assert item.spans["upload"].p95_ms == 12.0
+    assert "claim" not in item.spans
+    [sql] = session.statements
+    assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP (ORDER BY CAST(runs.timing_json #>>" in sql
+    assert "runs.timing_json IS NOT NULL" in sql
+    assert "GROUP BY runs.backend, runs.mode" in sql
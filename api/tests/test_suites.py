@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+
+from studio_api.schemas import SuiteCreate
+from studio_api.suites import build_suite_children, expand_matrix, matrix_cell_key, suite_run_count, suite_status
+
+
+def _suite(**overrides) -> SuiteCreate:
+    payload = {
+        "name": "batch sweep",
+        "backends": ["sglang-jax", "sglang-pytorch"],
+        "cases": [{"prompt": "a", "parameters": {"max_tokens": 8}}, {"prompt": "b"}],
+        "matrix": {"batch_size": [1, 8], "dtype": ["bf16"]},
+        "parameters": {"max_tokens": 16, "temperature": 0.0},
+    }
+    payload.update(overrides)
+    return SuiteCreate.model_validate(payload)
+
+
+def test_expand_matrix_is_cartesian_in_key_order() -> None:
+    assert expand_matrix({"a": [1, 2], "b": ["x", "y"]}) == [
+        {"a": 1, "b": "x"},
+        {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"},
+        {"a": 2, "b": "y"},
+    ]
+    assert expand_matrix({}) == [{}]
+
+
+def test_matrix_cell_key_ignores_dimension_order() -> None:
+    assert matrix_cell_key({"a": 1, "b": 2}) == matrix_cell_key({"b": 2, "a": 1})
+    assert matrix_cell_key({"a": 1}) != matrix_cell_key({"a": 2})
+
+
+def test_build_suite_children_layers_parameters_and_orders_by_cell() -> None:
+    suite = _suite()
+    children = build_suite_children(suite)
+
+    assert len(children) == suite_run_count(suite) == 8
+    first, case_index, cell = children[0]
+    assert (first.backend, case_index, cell) == ("sglang-jax", 0, {"batch_size": 1, "dtype": "bf16"})
+    assert first.parameters == {"max_tokens": 8, "temperature": 0.0, "batch_size": 1, "dtype": "bf16"}
+    assert children[2][0].parameters["max_tokens"] == 16
+    assert [child[2]["batch_size"] for child in children] == [1, 1, 1, 1, 8, 8, 8, 8]
+
+
+def test_build_suite_children_reports_invalid_case() -> None:
+    suite = _suite(cases=[{"prompt": "ok"}, {"prompt": " "}])
+    with pytest.raises(HTTPException) as exc_info:
+        build_suite_children(suite)
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail["case_index"] == 1
+
+
+def test_suite_rejects_empty_matrix_dimension() -> None:
+    with pytest.raises(ValueError, match="batch_size"):
+        _suite(matrix={"batch_size": []})
+
+
+def test_suite_status_aggregates_child_counts() -> None:
+    assert suite_status({"pending": 4}, 4) == ("pending", 0, 0.0)
+    assert suite_status({"pending": 2, "succeeded": 2}, 4) == ("running", 2, 0.5)
+    assert suite_status({"succeeded": 3, "failed": 1}, 4) == ("failed", 4, 1.0)
+    assert suite_status({"succeeded": 3, "canceled": 1}, 4) == ("partial", 4, 1.0)
+    assert suite_status({"canceled": 4}, 4) == ("canceled", 4, 1.0)
+    assert suite_status({"succeeded": 4}, 4) == ("succeeded", 4, 1.0)
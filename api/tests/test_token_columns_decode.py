@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from studio_api import artifacts
+from studio_api.metrics import compare_results
+from studio_api.token_columns import (
+    TOKEN_COLUMNS_FORMAT,
+    TOKEN_COLUMNS_MAGIC,
+    TokenColumnsFormatError,
+    decode_token_columns,
+)
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\x00" * (-len(data) % 8)
+
+
+def _encode(tokens: list[str], logprobs: list[float], ranks: list[int]) -> bytes:
+    encoded = [token.encode("utf-8") for token in tokens]
+    offsets = np.cumsum([0] + [len(item) for item in encoded]).astype("<i4").tobytes()
+    buffers = [
+        ("tokens", "utf8", [offsets, b"".join(encoded)]),
+        ("token_logprobs", "<f8", [np.asarray(logprobs, dtype="<f8").tobytes()]),
+        ("token_ranks", "<i4", [np.asarray(ranks, dtype="<i4").tobytes()]),
+    ]
+    body = b""
+    columns = []
+    for name, dtype, parts in buffers:
+        spans = []
+        for part in parts:
+            spans.append([len(body), len(part)])
+            body += _pad(part)
+        columns.append({"name": name, "dtype": dtype, "buffers": spans})
+    header = _pad(json.dumps({"version": 1, "row_count": len(tokens), "columns": columns}).encode("utf-8"))
+    return TOKEN_COLUMNS_MAGIC + struct.pack("<Q", len(header)) + header + body
+
+
+def test_decode_returns_zero_copy_numeric_views() -> None:
+    data = _encode(["a", "β", "c"], [-0.1, -0.2, -0.3], [1, 2, 3])
+    columns = decode_token_columns(data)
+
+    assert columns["tokens"] == ["a", "β", "c"]
+    assert columns["token_logprobs"].tolist() == [-0.1, -0.2, -0.3]
+    assert columns["token_ranks"].tolist() == [1, 2, 3]
+    assert not columns["token_logprobs"].flags.owndata
+    assert not columns["token_logprobs"].flags.writeable
+
+
+def test_decode_rejects_foreign_payloads() -> None:
+    with pytest.raises(TokenColumnsFormatError):
+        decode_token_columns(b'{"tokens": []}')
+
+
+def test_compare_input_prefers_token_columns(monkeypatch: pytest.MonkeyPatch) -> None:
+    left_data = _encode(["a", "b"], [-0.1, -0.2], [1, 2])
+    right_data = _encode(["a", "b"], [-0.1, -0.5], [1, 4])
+    objects = {"left": left_data, "right": right_data}
+    monkeypatch.setattr(artifacts, "fetch_token_artifact", lambda key: objects[key])
+
+    def _stored(key: str) -> dict:
+        return {"score": -0.3, "token_artifact": {"key": key, "format": TOKEN_COLUMNS_FORMAT}}
+
+    diff = compare_results(artifacts.compare_input(_stored("left")), artifacts.compare_input(_stored("right")))
+
+    assert diff["token_pair_count"] == 2
+    assert diff["token_mismatch_count"] == 1
+    assert diff["first_divergence_index"] == 1
+    assert diff["token_diffs"][1]["token"] == "b"
+    assert diff["rank_delta_summary"]["worst_rank_drop"] == 0.0
+
+
+def test_token_arrays_kept_only_in_the_artifact_are_hydrated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(artifacts, "fetch_token_artifact", lambda key: _encode(["a", "b"], [-0.1, -0.2], [1, 2]))
+    stored = {
+        "score": -0.3,
+        "token_artifact": {
+            "key": "runs/r/tokens.stcol",
+            "format": TOKEN_COLUMNS_FORMAT,
+            "fields": ["tokens", "token_logprobs", "token_ranks"],
+        },
+    }
+
+    hydrated = artifacts.hydrate_result(stored)
+
+    assert hydrated["tokens"] == ["a", "b"]
+    assert hydrated["token_logprobs"] == [-0.1, -0.2]
+    assert hydrated["token_ranks"] == [1, 2]
+    assert "tokens" not in stored
+    assert artifacts.compare_input(stored)["token_logprobs"].tolist() == [-0.1, -0.2]
+
+    monkeypatch.setattr(artifacts, "fetch_token_artifact", lambda key: b"not an artifact")
+    with pytest.raises(artifacts.ResultDetailUnavailable):
+        artifacts.compare_input(stored)
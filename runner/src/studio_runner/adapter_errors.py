@@ -1,2 +1,6 @@
 class AdapterExecutionError(RuntimeError):
     """Raised when an adapter cannot produce a valid benchmark result."""
+
+
+class RunCanceledError(RuntimeError):
+    """Raised when a run is canceled mid-flight; deliberately not an adapter error so auto mode never falls back."""
@@ -51,6 +51,7 @@ def _run_jax_backend(
             score_input=score_input,
             mask_config=mask_config,
             tolerance=tolerance,
+            parameters=parameters,
         )
 
     if adapter_mode == "mock":
@@ -110,6 +111,7 @@ def _run_pytorch_backend(
             score_input=score_input,
             mask_config=mask_config,
             tolerance=tolerance,
+            parameters=parameters,
         )
 
     if adapter_mode == "mock":
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.progress import publish_progress
+
+# Two-sided normal quantiles for the supported confidence levels.
+_Z_SCORES = {0.8: 1.2816, 0.9: 1.6449, 0.95: 1.96, 0.99: 2.5758}
+# Per-iteration metric tracked for each estimate, in order of preference.
+_TRACKED_METRICS = {
+    "p50": ("latency_p50_ms", "latency_ms"),
+    "p95": ("latency_p95_ms", "latency_p99_ms", "latency_p90_ms"),
+}
+
+def parse_repeat_config(parameters: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Validate ``parameters["repeat"]``; ``None`` means the bench command runs exactly once.
+
+    The measured phase is repeated after ``warmup_iterations`` discarded runs until the
+    confidence intervals of the median per-iteration P50 and P95 latency are narrower than
+    ``target_ci_pct`` of the estimate, or ``budget_s`` / ``max_iterations`` is exhausted.
+    """
+    raw = (parameters or {}).get("repeat")
+    if raw is None or raw is False:
+        return None
+    if raw is True:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise AdapterExecutionError("parameters.repeat must be an object")
+
+    def _number(name: str, default: float, minimum: float) -> float:
+        value = raw.get(name, default)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < minimum:
+            raise AdapterExecutionError(f"parameters.repeat.{name} must be a number >= {minimum}; got {value!r}")
+        return float(value)
+
+    confidence = _number("confidence", 0.95, 0.0)
+    if confidence not in _Z_SCORES:
+        raise AdapterExecutionError(
+            f"parameters.repeat.confidence must be one of {sorted(_Z_SCORES)}; got {confidence!r}"
+        )
+    config = {
+        "warmup_iterations": int(_number("warmup_iterations", 1, 0)),
+        "min_iterations": int(_number("min_iterations", 3, 2)),
+        "max_iterations": int(_number("max_iterations", 30, 2)),
+        "target_ci_pct": _number("target_ci_pct", 5.0, 0.0),
+        "budget_s": _number("budget_s", 1800.0, 0.0),
+        "confidence": confidence,
+    }
+    if config["max_iterations"] < config["min_iterations"]:
+        raise AdapterExecutionError("parameters.repeat.max_iterations must be >= min_iterations")
+    return config
+
+
+def quantile_interval(samples: list[float], q: float, confidence: float) -> tuple[float, float] | None:
+    """Distribution-free confidence interval for the ``q`` quantile from order statistics.
+
+    Uses the normal approximation to the binomial rank distribution; ``None`` when there are
+    too few samples for the interval to be bounded by observed values.
+    """
+    n = len(samples)
+    if n < 2:
+        return None
+    z = _Z_SCORES[confidence]
+    spread = z * math.sqrt(n * q * (1.0 - q))
+    low_rank = math.floor(n * q - spread)
+    high_rank = math.ceil(n * q + spread) + 1
+    if low_rank < 1 or high_rank > n:
+        return None
+    ordered = sorted(samples)
+    return ordered[low_rank - 1], ordered[high_rank - 1]
+
+
+def _tracked_value(metrics: dict[str, float], names: tuple[str, ...]) -> float | None:
+    for name in names:
+        if name in metrics:
+            return float(metrics[name])
+    return None
+
+
+def summarize_latency_samples(samples: dict[str, list[float]], confidence: float) -> dict[str, Any]:
+    summary: dict[str, Any] = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        estimate = statistics.median(values)
+        interval = quantile_interval(values, 0.5, confidence)
+        width_pct = None
+        if interval is not None and estimate > 0.0:
+            width_pct = (interval[1] - interval[0]) / estimate * 100.0
+        summary[name] = {
+            "estimate_ms": round(estimate, 3),
+            "ci_low_ms": round(interval[0], 3) if interval else None,
+            "ci_high_ms": round(interval[1], 3) if interval else None,
+            "ci_width_pct": round(width_pct, 3) if width_pct is not None else None,
+        }
+    return summary
+
+
+def _converged(summary: dict[str, Any], target_ci_pct: float) -> bool:
+    # Adapters that report no tail percentile converge on P50 alone.
+    return bool(summary) and all(
+        estimate["ci_width_pct"] is not None and estimate["ci_width_pct"] <= target_ci_pct
+        for estimate in summary.values()
+    )
+
+
+def run_adaptive_repetitions(
+    run_id: str,
+    config: dict[str, Any],
+    run_iteration: Callable[[int, bool], dict[str, float]],
+    clock: Callable[[], float] = time.monotonic,
+) -> dict[str, Any]:
+    """Call ``run_iteration(index, warmup)`` until the latency estimates converge or the budget runs out.
+
+    ``run_iteration`` returns the parsed bench metrics for one pass and must include
+    ``latency_ms``; every measured pass is kept. The budget covers warmup too; a new iteration only starts when the
+    mean iteration duration so far still fits in what is left.
+    """
+    start = clock()
+    durations: list[float] = []
+    index = 0
+
+    def _fits_budget() -> bool:
+        if not durations:
+            return True
+        return clock() - start + statistics.fmean(durations) <= config["budget_s"]
+
+    for _ in range(config["warmup_iterations"]):
+        if not _fits_budget():
+            break
+        began = clock()
+        run_iteration(index, True)
+        durations.append(clock() - began)
+        index += 1
+
+    iterations: list[dict[str, float]] = []
+    samples: dict[str, list[float]] = {name: [] for name in _TRACKED_METRICS}
+    summary: dict[str, Any] = {}
+    stop_reason = "max_iterations"
+    while len(iterations) < config["max_iterations"]:
+        if not _fits_budget():
+            stop_reason = "budget"
+            break
+        began = clock()
+        metrics = run_iteration(index, False)
+        durations.append(clock() - began)
+        index += 1
+        iterations.append(metrics)
+        for name, metric_names in _TRACKED_METRICS.items():
+            value = _tracked_value(metrics, metric_names)
+            if value is not None:
+                samples[name].append(value)
+
+        summary = summarize_latency_samples(samples, config["confidence"])
+        publish_progress(
+            run_id,
+            {"repeat": {"iterations": len(iterations), "elapsed_s": round(clock() - start, 3), **summary}},
+        )
+        if len(iterations) >= config["min_iterations"] and _converged(summary, config["target_ci_pct"]):
+            stop_reason = "converged"
+            break
+
+    if not iterations:
+        raise AdapterExecutionError(
+            f"parameters.repeat.budget_s={config['budget_s']} left no time for a measured iteration"
+        )
+    return {
+        "config": config,
+        "iterations": iterations,
+        "latency_samples_ms": [round(float(metrics["latency_ms"]), 3) for metrics in iterations],
+        "tail_latency_samples_ms": [round(value, 3) for value in samples["p95"]],
+        "warmup_iterations_run": index - len(iterations),
+        "measured_iterations": len(iterations),
+        "converged": stop_reason == "converged",
+        "stop_reason": stop_reason,
+        "elapsed_s": round(clock() - start, 3),
+        **summary,
+    }
+
+
+def median_metrics(iterations: list[dict[str, float]]) -> dict[str, float]:
+    """Per-metric median across measured iterations; metrics missing from any iteration are dropped."""
+    keys = set(iterations[0]).intersection(*iterations[1:]) if iterations else set()
+    return {key: statistics.median(metrics[key] for metrics in iterations) for key in sorted(keys)}
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from studio_runner.adapter_errors import AdapterExecutionError, RunCanceledError
+from studio_runner.cancellation import CancellationToken, current_cancellation
+from studio_runner.progress import publish_progress
+from studio_runner.settings import settings
+
+
+class IncrementalMetricParser:
+    """Line-at-a-time equivalent of running each pattern over the full output and keeping the last match."""
+
+    def __init__(self, patterns: dict[str, str]) -> None:
+        self._patterns = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in patterns.items()}
+        self.values: dict[str, float] = {}
+
+    def feed(self, line: str) -> bool:
+        updated = False
+        for name, pattern in self._patterns.items():
+            matches = pattern.findall(line)
+            if matches:
+                value = matches[-1]
+                if isinstance(value, tuple):
+                    value = value[0]
+                self.values[name] = float(value)
+                updated = True
+        return updated
+
+    def feed_text(self, text: str) -> dict[str, float]:
+        for line in text.splitlines():
+            self.feed(line)
+        return self.values
+
+
+@dataclass
+class ProcessOutcome:
+    returncode: int
+    duration_ms: float
+    stdout_tail: str
+    stderr_tail: str
+    # How the pass was executed (warm worker or fresh process); see studio_runner.warm_worker.
+    worker: dict[str, Any] | None = None
+
+
+class _StreamPump(threading.Thread):
+    def __init__(
+        self,
+        name: str,
+        source: IO[str],
+        sink_path: Path,
+        tail_lines: int,
+        on_line: Callable[[str, str], None],
+    ) -> None:
+        super().__init__(name=f"bench-{name}-pump", daemon=True)
+        self.stream_name = name
+        self.source = source
+        self.sink_path = sink_path
+        self.tail: deque[str] = deque(maxlen=tail_lines)
+        self.line_count = 0
+        self.on_line = on_line
+
+    def run(self) -> None:
+        with self.sink_path.open("w", encoding="utf-8") as sink:
+            for line in self.source:
+                sink.write(line)
+                sink.flush()
+                self.tail.append(line)
+                self.line_count += 1
+                self.on_line(self.stream_name, line)
+
+
+def _signal_process_group(proc: subprocess.Popen, sig: int) -> None:
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _stop_process_group(proc: subprocess.Popen, grace_seconds: float) -> None:
+    # Bench wrappers spawn servers and workers; signal the whole session so the accelerator is freed.
+    _signal_process_group(proc, signal.SIGTERM)
+    try:
+        proc.wait(timeout=grace_seconds)
+    except subprocess.TimeoutExpired:
+        _signal_process_group(proc, signal.SIGKILL)
+        proc.wait()
+
+
+def run_streaming_process(
+    command: list[str],
+    cwd: str,
+    env: dict[str, str],
+    stdout_path: Path,
+    stderr_path: Path,
+    timeout_seconds: float,
+    on_line: Callable[[str, str], dict[str, Any] | None],
+    on_tick: Callable[[dict[str, Any]], None] | None = None,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+    tick_interval_seconds: float = 2.0,
+    tail_lines: int = 200,
+    cancel_token: CancellationToken | None = None,
+    kill_grace_seconds: float = 10.0,
+) -> ProcessOutcome:
+    """Run ``command`` streaming stdout/stderr line by line into log files and ``on_line``.
+
+    Only the last ``tail_lines`` of each stream are kept in memory. ``on_tick`` is called
+    every ``tick_interval_seconds`` with elapsed time, line counts and the age of the last
+    output line, so a silent process is visible before ``timeout_seconds`` kills it.
+
+    ``on_line`` runs under a lock shared by both streams and must stay cheap; whatever it
+    returns (other than ``None``) is handed to ``on_progress`` after the lock is released.
+    ``on_tick`` and ``on_progress`` may block (e.g. on the database) without holding up the
+    other stream's draining.
+
+    The command runs in its own process group. On timeout or cancellation the group gets
+    SIGTERM, then SIGKILL after ``kill_grace_seconds``; cancellation raises ``RunCanceledError``.
+    """
+    last_output = [time.monotonic()]
+    line_lock = threading.Lock()
+
+    def _on_line(stream: str, line: str) -> None:
+        with line_lock:
+            last_output[0] = time.monotonic()
+            progress = on_line(stream, line)
+        if progress is not None and on_progress is not None:
+            on_progress(progress)
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            errors="replace",
+            start_new_session=True,
+        )
+    except FileNotFoundError as exc:
+        raise AdapterExecutionError(f"Benchmark command not found: {exc}") from exc
+
+    pumps = [
+        _StreamPump("stdout", proc.stdout, stdout_path, tail_lines, _on_line),
+        _StreamPump("stderr", proc.stderr, stderr_path, tail_lines, _on_line),
+    ]
+    for pump in pumps:
+        pump.start()
+
+    # SIGTERM right away from the canceling thread; the wait loop below escalates if needed.
+    def _on_cancel() -> None:
+        _signal_process_group(proc, signal.SIGTERM)
+
+    if cancel_token is not None:
+        cancel_token.add_callback(_on_cancel)
+
+    deadline = time.monotonic() + timeout_seconds
+    try:
+        while True:
+            if cancel_token is not None and cancel_token.is_canceled:
+                _stop_process_group(proc, kill_grace_seconds)
+                raise RunCanceledError("Benchmark process canceled")
+            try:
+                proc.wait(timeout=max(0.0, min(tick_interval_seconds, deadline - time.monotonic())))
+                break
+            except subprocess.TimeoutExpired:
+                if time.monotonic() >= deadline:
+                    _stop_process_group(proc, kill_grace_seconds)
+                    raise
+            if on_tick is not None:
+                with line_lock:
+                    stats = {
+                        "elapsed_s": round(time.perf_counter() - start, 3),
+                        "stdout_lines": pumps[0].line_count,
+                        "stderr_lines": pumps[1].line_count,
+                        "last_output_age_s": round(time.monotonic() - last_output[0], 3),
+                    }
+                on_tick(stats)
+    finally:
+        if cancel_token is not None:
+            cancel_token.remove_callback(_on_cancel)
+        # Grandchildren can keep the pipes open after a kill; don't wait on them forever.
+        for pump in pumps:
+            pump.join(timeout=5.0)
+
+    # The SIGTERM from the cancel callback usually ends the process before the loop notices.
+    if cancel_token is not None and cancel_token.is_canceled:
+        raise RunCanceledError("Benchmark process canceled")
+
+    return ProcessOutcome(
+        returncode=proc.returncode,
+        duration_ms=(time.perf_counter() - start) * 1000.0,
+        stdout_tail="".join(pumps[0].tail),
+        stderr_tail="".join(pumps[1].tail),
+    )
+
+
+def run_benchmark_process(
+    run_id: str,
+    command: list[str],
+    cwd: str,
+    env: dict[str, str],
+    stdout_path: Path,
+    stderr_path: Path,
+    timeout_seconds: float,
+    parser: IncrementalMetricParser,
+    partial_metrics: Callable[[dict[str, float]], dict[str, float]] = dict,
+) -> ProcessOutcome:
+    """Stream a bench subprocess, publishing parsed partial metrics and liveness as run progress."""
+
+    def _on_line(stream: str, line: str) -> dict[str, Any] | None:
+        # Copy the parsed values here; publishing (DB write + NOTIFY) happens outside the line lock.
+        if parser.feed(line):
+            return {"metrics": partial_metrics(parser.values)}
+        return None
+
+    def _on_tick(stats: dict[str, Any]) -> None:
+        publish_progress(
+            run_id,
+            {**stats, "stalled": stats["last_output_age_s"] >= settings.bench_stall_warning_seconds},
+        )
+
+    return run_streaming_process(
+        command,
+        cwd=cwd,
+        env=env,
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
+        timeout_seconds=timeout_seconds,
+        on_line=_on_line,
+        on_tick=_on_tick,
+        on_progress=lambda progress: publish_progress(run_id, progress),
+        tick_interval_seconds=settings.run_progress_min_interval_seconds,
+        tail_lines=settings.bench_output_tail_lines,
+        cancel_token=current_cancellation(),
+        kill_grace_seconds=settings.bench_kill_grace_seconds,
+    )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from studio_runner.adapter_errors import RunCanceledError
+
+
+class CancellationToken:
+    """Thread-safe cancel flag with callbacks, used to interrupt blocking work from another thread."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def is_canceled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # pragma: no cover - process-level safety
+                pass
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Register ``callback`` to run on cancel; runs it immediately if already canceled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._event.wait(timeout)
+
+    def raise_if_canceled(self) -> None:
+        if self.is_canceled:
+            raise RunCanceledError("Run was canceled")
+
+
+_tokens: dict[str, CancellationToken] = {}
+_tokens_lock = threading.Lock()
+_current: contextvars.ContextVar[CancellationToken | None] = contextvars.ContextVar(
+    "studio_run_cancellation", default=None
+)
+
+
+@contextmanager
+def cancellable_run(run_id: str) -> Iterator[CancellationToken]:
+    """Register a token for ``run_id`` and make it the current token for code running in this thread."""
+    token = CancellationToken()
+    with _tokens_lock:
+        _tokens[run_id] = token
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+        with _tokens_lock:
+            if _tokens.get(run_id) is token:
+                del _tokens[run_id]
+
+
+def current_cancellation() -> CancellationToken | None:
+    return _current.get()
+
+
+def cancel_run(run_id: str) -> bool:
+    """Cancel ``run_id`` if it is executing in this process; returns whether it was."""
+    with _tokens_lock:
+        token = _tokens.get(run_id)
+    if token is None:
+        return False
+    token.cancel()
+    return True
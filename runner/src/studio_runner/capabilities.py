@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.jax_bench_adapter import _resolve_entrypoint as _resolve_jax_entrypoint
+from studio_runner.pytorch_bench_adapter import _resolve_entrypoint as _resolve_pytorch_entrypoint
+from studio_runner.score_api_adapter import _score_api_url
+from studio_runner.settings import settings
+from studio_runner.worker_pool import lane_key
+
+RUN_MODES = ("benchmark", "score")
+
+_BENCH_ENTRYPOINTS = {
+    "sglang-jax": _resolve_jax_entrypoint,
+    "sglang-pytorch": _resolve_pytorch_entrypoint,
+}
+
+
+def _adapter_mode(backend: str) -> str:
+    configured = settings.sglang_jax_adapter_mode if backend == "sglang-jax" else settings.sglang_pytorch_adapter_mode
+    return configured.strip().lower()
+
+
+def _lane_available(backend: str, mode: str) -> bool:
+    if _adapter_mode(backend) == "mock":
+        return True
+    try:
+        if mode == "score":
+            _score_api_url(backend)
+        else:
+            _BENCH_ENTRYPOINTS[backend]()
+    except AdapterExecutionError:
+        # In auto mode the adapter would fall back to mock results; only claim it when allowed.
+        return mode == "benchmark" and _adapter_mode(backend) == "auto" and settings.runner_allow_mock_fallback
+    return True
+
+
+def detect_capabilities() -> dict[str, Any]:
+    """What this runner can execute for real: ``backend:mode`` lanes, device class and slots."""
+    lanes = [lane_key("mock", mode) for mode in RUN_MODES]
+    for backend in _BENCH_ENTRYPOINTS:
+        lanes.extend(lane_key(backend, mode) for mode in RUN_MODES if _lane_available(backend, mode))
+    return {
+        "lanes": sorted(lanes),
+        "device_class": settings.runner_device_class,
+        "adapter_modes": {backend: _adapter_mode(backend) for backend in _BENCH_ENTRYPOINTS},
+        "slots": settings.runner_max_concurrent_runs,
+        "lane_slots": dict(settings.backend_concurrency_limits),
+        "global_slot_limits": dict(settings.global_backend_slot_limits),
+    }
+
+
+def register_runner(session: Session, runner_id: str, capabilities: dict[str, Any]) -> None:
+    with session.begin():
+        session.execute(
+            text(
+                """
+                INSERT INTO runners (id, device_class, capabilities, started_at, heartbeat_at)
+                VALUES (:id, :device_class, CAST(:capabilities AS JSON), now(), now())
+                ON CONFLICT (id) DO UPDATE
+                SET device_class = EXCLUDED.device_class,
+                    capabilities = EXCLUDED.capabilities,
+                    heartbeat_at = now()
+                """
+            ),
+            {
+                "id": runner_id,
+                "device_class": capabilities["device_class"],
+                "capabilities": json.dumps(capabilities, sort_keys=True),
+            },
+        )
+
+
+def touch_runner(session: Session, runner_id: str, in_flight: int) -> None:
+    with session.begin():
+        session.execute(
+            text("UPDATE runners SET heartbeat_at = now(), in_flight = :in_flight WHERE id = :id"),
+            {"id": runner_id, "in_flight": in_flight},
+        )
+
+
+def deregister_runner(session: Session, runner_id: str) -> None:
+    with session.begin():
+        session.execute(text("DELETE FROM runners WHERE id = :id"), {"id": runner_id})
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from studio_runner.models import RunEvent
+from studio_runner.settings import settings
+
+
+def record_run_event(
+    session: Session,
+    run_id: str,
+    event_type: str,
+    status: str | None,
+    payload: dict[str, Any] | None = None,
+) -> None:
+    """Append a lifecycle event; the API streams it to subscribers once the transaction commits."""
+    event_id = session.execute(
+        insert(RunEvent)
+        .values(run_id=run_id, event_type=event_type, status=status, payload=payload or {})
+        .returning(RunEvent.id)
+    ).scalar_one()
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.run_events_channel, "payload": str(event_id)},
+    )
+
+
+def result_event_payload(result: dict[str, Any]) -> dict[str, Any]:
+    return {key: result.get(key) for key in ("score", "latency_ms", "throughput_items_per_s")}
@@ -3,15 +3,17 @@ from __future__ import annotations
 import hashlib
 import json
 import os
-import re
 import shlex
 import subprocess
-import time
 from pathlib import Path
 from typing import Any
 
 from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.adaptive import median_metrics, parse_repeat_config, run_adaptive_repetitions
+from studio_runner.bench_process import IncrementalMetricParser
 from studio_runner.settings import settings
+from studio_runner.spans import span
+from studio_runner.warm_worker import bench_worker_summary, run_bench_pass
 
 
 
@@ -21,21 +23,23 @@ def _stable_score(prompt: str) -> float:
     return 0.1 + (0.8 * unit)
 
 
-def _parse_last_float(text: str, pattern: str) -> float | None:
-    matches = re.findall(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
-    if not matches:
-        return None
-    value = matches[-1]
-    if isinstance(value, tuple):
-        value = value[0]
-    return float(value)
+_METRIC_PATTERNS = {
+    "throughput_items_per_s": r"Throughput:\s*([0-9]+(?:\.[0-9]+)?)\s*items/sec",
+    "latency_p50_ms": r"Latency p50:\s*([0-9]+(?:\.[0-9]+)?)\s*ms",
+    "latency_p95_ms": r"Latency p95:\s*([0-9]+(?:\.[0-9]+)?)\s*ms",
+    "latency_p99_ms": r"Latency p99:\s*([0-9]+(?:\.[0-9]+)?)\s*ms",
+}
 
 
 def parse_benchmark_metrics(output: str) -> dict[str, float]:
-    throughput = _parse_last_float(output, r"Throughput:\s*([0-9]+(?:\.[0-9]+)?)\s*items/sec")
-    latency_p50 = _parse_last_float(output, r"Latency p50:\s*([0-9]+(?:\.[0-9]+)?)\s*ms")
-    latency_p95 = _parse_last_float(output, r"Latency p95:\s*([0-9]+(?:\.[0-9]+)?)\s*ms")
-    latency_p99 = _parse_last_float(output, r"Latency p99:\s*([0-9]+(?:\.[0-9]+)?)\s*ms")
+    return _metrics_from_values(IncrementalMetricParser(_METRIC_PATTERNS).feed_text(output))
+
+
+def _metrics_from_values(values: dict[str, float]) -> dict[str, float]:
+    throughput = values.get("throughput_items_per_s")
+    latency_p50 = values.get("latency_p50_ms")
+    latency_p95 = values.get("latency_p95_ms")
+    latency_p99 = values.get("latency_p99_ms")
 
     if throughput is None:
         raise AdapterExecutionError("Unable to parse benchmark throughput from sglang-jax output")
@@ -116,69 +120,94 @@ def _truncate(text: str, max_len: int = 1200) -> str:
 
 
 def run_sglang_jax_benchmark(run_id: str, prompt: str, parameters: dict[str, Any]) -> dict[str, Any]:
-    repo_root = Path(settings.sglang_jax_root)
-    entrypoint = _resolve_entrypoint()
-    command, cwd = _build_command(entrypoint)
-
-    artifacts_dir = Path(settings.local_artifacts_root) / run_id / "sglang-jax"
-    artifacts_dir.mkdir(parents=True, exist_ok=True)
-    stdout_path = artifacts_dir / "bench.stdout.log"
-    stderr_path = artifacts_dir / "bench.stderr.log"
-    metadata_path = artifacts_dir / "bench.metadata.json"
-
-    env = dict(os.environ)
-    env["STUDIO_RUN_ID"] = run_id
-
-    start = time.perf_counter()
-    try:
-        completed = subprocess.run(
-            command,
-            cwd=str(cwd),
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=settings.sglang_jax_bench_timeout_seconds,
-        )
-    except FileNotFoundError as exc:
-        raise AdapterExecutionError(f"Benchmark command not found: {exc}") from exc
-    except subprocess.TimeoutExpired as exc:
-        raise AdapterExecutionError(
-            f"sglang-jax benchmark timed out after {settings.sglang_jax_bench_timeout_seconds}s"
-        ) from exc
-
-    duration_ms = (time.perf_counter() - start) * 1000.0
-
-    stdout_path.write_text(completed.stdout or "", encoding="utf-8")
-    stderr_path.write_text(completed.stderr or "", encoding="utf-8")
-    metadata_path.write_text(
-        json.dumps(
+    with span("adapter_setup"):
+        repo_root = Path(settings.sglang_jax_root)
+        entrypoint = _resolve_entrypoint()
+        command, cwd = _build_command(entrypoint)
+
+        artifacts_dir = Path(settings.local_artifacts_root) / run_id / "sglang-jax"
+        artifacts_dir.mkdir(parents=True, exist_ok=True)
+        metadata_path = artifacts_dir / "bench.metadata.json"
+        repeat_config = parse_repeat_config(parameters)
+
+        env = dict(os.environ)
+        env["STUDIO_RUN_ID"] = run_id
+
+    passes: list[dict[str, Any]] = []
+    worker_config = {key: parameters[key] for key in settings.bench_warm_worker_config_params if key in parameters}
+
+    def _write_metadata() -> None:
+        metadata = {
+            "run_id": run_id,
+            "repo_root": str(repo_root),
+            "entrypoint": str(entrypoint),
+            "cwd": str(cwd),
+            "command": command,
+            "returncode": passes[-1]["returncode"],
+            "duration_ms": passes[-1]["duration_ms"],
+            "parameters": parameters,
+        }
+        if repeat_config is not None:
+            metadata["passes"] = passes
+        metadata_path.write_text(json.dumps(metadata, indent=2, sort_keys=True), encoding="utf-8")
+
+    def _run_pass(log_name: str, warmup: bool = False) -> dict[str, float]:
+        stdout_path = artifacts_dir / f"{log_name}.stdout.log"
+        stderr_path = artifacts_dir / f"{log_name}.stderr.log"
+        parser = IncrementalMetricParser(_METRIC_PATTERNS)
+        try:
+            completed = run_bench_pass(
+                run_id,
+                "sglang-jax",
+                command,
+                cwd=str(cwd),
+                env=env,
+                stdout_path=stdout_path,
+                stderr_path=stderr_path,
+                timeout_seconds=settings.sglang_jax_bench_timeout_seconds,
+                parser=parser,
+                config=worker_config,
+            )
+        except subprocess.TimeoutExpired as exc:
+            raise AdapterExecutionError(
+                f"sglang-jax benchmark timed out after {settings.sglang_jax_bench_timeout_seconds}s"
+            ) from exc
+
+        passes.append(
             {
-                "run_id": run_id,
-                "repo_root": str(repo_root),
-                "entrypoint": str(entrypoint),
-                "cwd": str(cwd),
-                "command": command,
+                "warmup": warmup,
                 "returncode": completed.returncode,
-                "duration_ms": round(duration_ms, 3),
-                "parameters": parameters,
-            },
-            indent=2,
-            sort_keys=True,
-        ),
-        encoding="utf-8",
-    )
-
-    if completed.returncode != 0:
-        summary = _truncate(completed.stderr or completed.stdout or "")
-        raise AdapterExecutionError(
-            f"sglang-jax benchmark failed with exit code {completed.returncode}: {summary}"
+                "duration_ms": round(completed.duration_ms, 3),
+                "stdout_path": str(stdout_path),
+                "stderr_path": str(stderr_path),
+                "worker": completed.worker,
+            }
+        )
+        with span("artifact_io"):
+            _write_metadata()
+
+        if completed.returncode != 0:
+            summary = _truncate(completed.stderr_tail or completed.stdout_tail or "")
+            raise AdapterExecutionError(
+                f"sglang-jax benchmark failed with exit code {completed.returncode}: {summary}"
+            )
+        with span("parse"):
+            return _metrics_from_values(parser.values)
+
+    repeat = None
+    if repeat_config is None:
+        raw_metrics = _run_pass("bench")
+    else:
+        repeat = run_adaptive_repetitions(
+            run_id,
+            repeat_config,
+            lambda index, warmup: _run_pass(f"bench.{index:03d}", warmup=warmup),
         )
+        raw_metrics = median_metrics(repeat.pop("iterations"))
 
-    combined_output = f"{completed.stdout}\n{completed.stderr}"
-    raw_metrics = parse_benchmark_metrics(combined_output)
     token_count = max(4, len(prompt.split()) * 2)
 
-    return {
+    result = {
         "score": round(_stable_score(prompt), 6),
         "latency_ms": round(raw_metrics["latency_ms"], 3),
         "throughput_items_per_s": round(raw_metrics["throughput_items_per_s"], 3),
@@ -188,8 +217,13 @@ def run_sglang_jax_benchmark(run_id: str, prompt: str, parameters: dict[str, Any
         "notes": "Wrap-first run via sglang-jax benchmark entrypoint",
         "raw_metrics": raw_metrics,
         "raw_artifacts": {
-            "stdout_path": str(stdout_path),
-            "stderr_path": str(stderr_path),
+            "stdout_path": passes[-1]["stdout_path"],
+            "stderr_path": passes[-1]["stderr_path"],
             "metadata_path": str(metadata_path),
         },
     }
+    result["bench_worker"] = bench_worker_summary(passes)
+    if repeat is not None:
+        result["latency_samples_ms"] = repeat.pop("latency_samples_ms")
+        result["repeat"] = repeat
+    return result
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from studio_runner.events import record_run_event
+from studio_runner.settings import settings
+
+
+def renew_leases(session: Session, owner: str, run_ids: list[str], lease_seconds: float) -> set[str]:
+    """Extend the leases of ``run_ids`` held by ``owner``; return the ids that were renewed."""
+    if not run_ids:
+        return set()
+
+    query = text(
+        """
+        UPDATE runs
+        SET lease_expires_at = now() + make_interval(secs => :lease_seconds),
+            heartbeat_at = now()
+        WHERE id IN :run_ids
+          AND lease_owner = :owner
+          AND status = 'running'
+        RETURNING id
+        """
+    ).bindparams(bindparam("run_ids", expanding=True))
+
+    with session.begin():
+        rows = session.execute(
+            query,
+            {"run_ids": run_ids, "owner": owner, "lease_seconds": lease_seconds},
+        ).all()
+    return {row.id for row in rows}
+
+
+def reap_expired_leases(session: Session, lease_seconds: float, max_attempts: int) -> list[tuple[str, str]]:
+    """Return expired running runs to ``pending`` (or ``failed`` once out of attempts).
+
+    Rows without a lease (claimed before leases existed) are treated as expired once they
+    have not been updated for a full lease period. Returns ``(run_id, new_status)`` pairs.
+    """
+    query = text(
+        """
+        UPDATE runs
+        SET status = CASE WHEN attempt_count >= :max_attempts THEN 'failed' ELSE 'pending' END,
+            error = CASE
+                WHEN attempt_count >= :max_attempts
+                THEN 'Run lease expired after ' || attempt_count || ' attempt(s); last owner ' || coalesce(lease_owner, 'unknown')
+                ELSE error
+            END,
+            completed_at = CASE WHEN attempt_count >= :max_attempts THEN now() ELSE NULL END,
+            lease_owner = NULL,
+            lease_expires_at = NULL,
+            updated_at = now()
+        WHERE id IN (
+            SELECT id
+            FROM runs
+            WHERE status = 'running'
+              AND (
+                lease_expires_at < now()
+                OR (lease_expires_at IS NULL AND updated_at < now() - make_interval(secs => :lease_seconds))
+              )
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, status, error
+        """
+    )
+
+    with session.begin():
+        rows = session.execute(
+            query,
+            {"lease_seconds": lease_seconds, "max_attempts": max_attempts},
+        ).all()
+        requeued = [row.id for row in rows if row.status == "pending"]
+        if requeued:
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                [{"channel": settings.run_notify_channel, "payload": run_id} for run_id in requeued],
+            )
+        for row in rows:
+            event_type = "requeued" if row.status == "pending" else "failed"
+            payload = {"reason": "lease_expired"} if row.status == "pending" else {"error": row.error}
+            record_run_event(session, row.id, event_type, row.status, payload)
+    return [(row.id, row.status) for row in rows]
+
+
+def prune_run_events(
+    session: Session,
+    retention_seconds: float,
+    progress_retention_seconds: float,
+    batch_size: int,
+) -> int:
+    """Delete events of finished runs; returns how many rows were removed.
+
+    ``progress`` events are superseded by ``runs.progress_json`` and the final result, so they go
+    ``progress_retention_seconds`` after the run finishes; every other event is kept for
+    ``retention_seconds``. At most ``batch_size`` rows go per call to keep the transaction short.
+    """
+    query = text(
+        """
+        DELETE FROM run_events
+        WHERE id IN (
+            SELECT run_events.id
+            FROM run_events
+            JOIN runs ON runs.id = run_events.run_id
+            WHERE runs.status IN ('succeeded', 'failed', 'canceled')
+              AND (
+                runs.completed_at < now() - make_interval(secs => :retention_seconds)
+                OR (
+                  run_events.event_type = 'progress'
+                  AND runs.completed_at < now() - make_interval(secs => :progress_retention_seconds)
+                )
+              )
+            LIMIT :batch_size
+        )
+        """
+    )
+
+    with session.begin():
+        return session.execute(
+            query,
+            {
+                "retention_seconds": retention_seconds,
+                "progress_retention_seconds": progress_retention_seconds,
+                "batch_size": batch_size,
+            },
+        ).rowcount
+
+
+class LeaseKeeper(threading.Thread):
+    """Heartbeats the leases of this runner's in-flight runs and periodically reaps expired ones.
+
+    Each reap also prunes old run events (see ``prune_run_events``) when ``event_retention_seconds``
+    is set.
+
+    ``on_lease_lost`` receives in-flight run ids whose lease could no longer be renewed;
+    ``on_heartbeat`` receives the in-flight run ids after every heartbeat.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        owner: str,
+        run_ids_fn: Callable[[], list[str]],
+        lease_seconds: float,
+        heartbeat_interval_seconds: float,
+        reaper_interval_seconds: float,
+        max_attempts: int,
+        on_lease_lost: Callable[[set[str]], None] | None = None,
+        on_heartbeat: Callable[[list[str]], None] | None = None,
+        event_retention_seconds: float | None = None,
+        progress_event_retention_seconds: float = 0.0,
+        event_prune_batch_size: int = 5000,
+    ) -> None:
+        super().__init__(name="studio-lease-keeper", daemon=True)
+        self.session_factory = session_factory
+        self.owner = owner
+        self.run_ids_fn = run_ids_fn
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        self.reaper_interval_seconds = reaper_interval_seconds
+        self.max_attempts = max_attempts
+        self.on_lease_lost = on_lease_lost
+        self.on_heartbeat = on_heartbeat
+        self.event_retention_seconds = event_retention_seconds
+        self.progress_event_retention_seconds = progress_event_retention_seconds
+        self.event_prune_batch_size = event_prune_batch_size
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def heartbeat_once(self) -> set[str]:
+        run_ids = self.run_ids_fn()
+        session = self.session_factory()
+        try:
+            renewed = renew_leases(session, self.owner, run_ids, self.lease_seconds)
+        finally:
+            session.close()
+        # A run we are still executing but could not renew was canceled, reaped or handed over.
+        lost = set(run_ids) - renewed
+        if lost and self.on_lease_lost is not None:
+            self.on_lease_lost(lost)
+        if self.on_heartbeat is not None:
+            self.on_heartbeat(run_ids)
+        return renewed
+
+    def reap_once(self) -> list[tuple[str, str]]:
+        session = self.session_factory()
+        try:
+            reaped = reap_expired_leases(session, self.lease_seconds, self.max_attempts)
+            if self.event_retention_seconds is not None:
+                prune_run_events(
+                    session,
+                    self.event_retention_seconds,
+                    self.progress_event_retention_seconds,
+                    self.event_prune_batch_size,
+                )
+            return reaped
+        finally:
+            session.close()
+
+    def run(self) -> None:
+        next_reap = time.monotonic()
+        while not self._stop_event.wait(self.heartbeat_interval_seconds):
+            try:
+                self.heartbeat_once()
+                if time.monotonic() >= next_reap:
+                    self.reap_once()
+                    next_reap = time.monotonic() + self.reaper_interval_seconds
+            except Exception:  # pragma: no cover - process-level safety
+                # A failed heartbeat is retried on the next tick; the lease period covers a few misses.
+                continue
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
 import io
-import json
 import time
-from datetime import datetime, timezone
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 
 from minio import Minio
 from minio.error import S3Error
-from sqlalchemy import text
+from sqlalchemy import func, text, update
 from sqlalchemy.orm import Session
 
+from studio_runner.adapter_errors import RunCanceledError
 from studio_runner.adapters import run_backend_inference
+from studio_runner.cancellation import cancel_run, cancellable_run
+from studio_runner.capabilities import deregister_runner, detect_capabilities, register_runner, touch_runner
 from studio_runner.db import SessionLocal, engine
+from studio_runner.events import record_run_event, result_event_payload
+from studio_runner.leases import LeaseKeeper
 from studio_runner.models import Run
+from studio_runner.notifications import RunNotificationListener
+from studio_runner.progress import ThrottledProgressSink, register_progress_sink, unregister_progress_sink
+from studio_runner.result_storage import prepare_result_upload
+from studio_runner.scheduling import (
+    build_claim_query,
+    build_fallback_claim_query,
+    claim_priority_ceiling,
+    globally_saturated_limits,
+)
 from studio_runner.settings import settings
+from studio_runner.spans import SpanRecorder, recording_spans
+from studio_runner.telemetry import CLAIM_SECONDS, observe_run, start_exporter, timed_upload
+from studio_runner.token_columns import (
+    TOKEN_COLUMN_FIELDS,
+    TOKEN_COLUMNS_FORMAT,
+    TokenColumnsEncodeError,
+    encode_token_columns,
+)
+from studio_runner.warm_worker import warm_workers
+from studio_runner.worker_pool import RunWorkerPool
 
 
 def _utcnow() -> datetime:
@@ -38,36 +62,86 @@ def _ensure_bucket(client: Minio) -> None:
         pass
 
 
-def _upload_result_artifact(client: Minio, run_id: str, result: dict) -> str | None:
-    key = f"runs/{run_id}/result.json"
-    payload = json.dumps(result, sort_keys=True).encode("utf-8")
+def _upload_token_columns(client: Minio, run_id: str, result: dict) -> dict:
+    """Upload the columnar token artifact and return ``result`` with a ``token_artifact`` reference.
+
+    Once the artifact is stored, the per-token arrays it carries are dropped from ``result`` so
+    the JSON artifact and ``runs.result_json`` do not hold a second copy. A result whose token
+    values cannot be encoded is returned unchanged, like one whose upload failed.
+    """
     try:
-        client.put_object(
-            settings.minio_bucket,
-            key,
-            io.BytesIO(payload),
-            len(payload),
-            content_type="application/json",
-        )
-        return key
+        body = encode_token_columns(result)
+    except TokenColumnsEncodeError:
+        return result
+    if body is None:
+        return result
+    key = f"runs/{run_id}/tokens.stcol"
+    try:
+        with timed_upload("tokens"):
+            client.put_object(
+                settings.minio_bucket,
+                key,
+                io.BytesIO(body),
+                len(body),
+                content_type="application/octet-stream",
+            )
     except S3Error:
-        return None
+        return result
+    fields = [name for name in TOKEN_COLUMN_FIELDS if isinstance(result.get(name), list) and result[name]]
+    return {
+        **{name: value for name, value in result.items() if name not in fields},
+        "token_artifact": {
+            "key": key,
+            "format": TOKEN_COLUMNS_FORMAT,
+            "size_bytes": len(body),
+            "fields": fields,
+        },
+    }
 
 
-def _claim_pending_run(session: Session) -> dict | None:
-    query = text(
-        """
-        SELECT id
-        FROM runs
-        WHERE status = 'pending'
-        ORDER BY created_at ASC
-        LIMIT 1
-        FOR UPDATE SKIP LOCKED
-        """
-    )
+def _upload_result_artifact(client: Minio, run_id: str, result: dict) -> tuple[dict, str | None]:
+    """Upload the result artifact; returns the ``result_json`` to store and the artifact key."""
+    upload = prepare_result_upload(run_id, result, settings.result_inline_max_bytes)
+    try:
+        with timed_upload("result"):
+            client.put_object(
+                settings.minio_bucket,
+                upload.key,
+                io.BytesIO(upload.body),
+                len(upload.body),
+                content_type="application/json",
+                metadata={"Content-Encoding": upload.content_encoding} if upload.content_encoding else None,
+            )
+        return upload.stored_result, upload.key
+    except S3Error:
+        # Without the artifact the heavy fields have nowhere else to live; keep them inline.
+        return result, None
+
 
+def _claim_pending_run(
+    session: Session,
+    excluded_backends: list[str] | None = None,
+    excluded_lanes: list[str] | None = None,
+    max_priority: int | None = None,
+    capabilities: dict | None = None,
+) -> dict | None:
     with session.begin():
-        row = session.execute(query).first()
+        if settings.global_backend_slot_limits:
+            global_backends, global_lanes = globally_saturated_limits(session, settings.global_backend_slot_limits)
+            excluded_backends = sorted({*(excluded_backends or []), *global_backends})
+            excluded_lanes = sorted({*(excluded_lanes or []), *global_lanes})
+        row = None
+        for build in (build_claim_query, build_fallback_claim_query):
+            query, params = build(
+                excluded_backends,
+                excluded_lanes,
+                max_priority,
+                capable_lanes=capabilities["lanes"] if capabilities else None,
+                device_class=capabilities["device_class"] if capabilities else None,
+            )
+            row = session.execute(query, params).first()
+            if row is not None:
+                break
         if row is None:
             return None
 
@@ -77,9 +151,15 @@ def _claim_pending_run(session: Session) -> dict | None:
 
         run.status = "running"
         run.updated_at = _utcnow()
+        run.lease_owner = settings.runner_id
+        run.lease_expires_at = func.now() + timedelta(seconds=settings.run_lease_seconds)
+        run.heartbeat_at = func.now()
+        run.attempt_count = Run.attempt_count + 1
+        record_run_event(session, run.id, "running", "running", {"runner_id": settings.runner_id})
 
         return {
             "id": run.id,
+            "queue_wait_ms": float(row.queue_wait_ms or 0.0),
             "backend": run.backend,
             "mode": run.mode,
             "prompt": run.prompt,
@@ -91,9 +171,33 @@ def _claim_pending_run(session: Session) -> dict | None:
         }
 
 
-def _mark_succeeded(session: Session, run_id: str, result: dict, artifact_key: str | None) -> None:
+def _get_owned_run(session: Session, run_id: str) -> Run | None:
+    # A run whose lease expired may have been handed to another runner; never overwrite it.
+    run = session.get(Run, run_id, with_for_update=True)
+    if run is None or run.status != "running" or run.lease_owner != settings.runner_id:
+        return None
+    return run
+
+
+def _release_lease(run: Run) -> None:
+    run.lease_owner = None
+    run.lease_expires_at = None
+
+
+def _record_timing(run: Run, spans: SpanRecorder | None, finalize_started: float) -> None:
+    # The final commit lands after this; "finalize" covers the row lock and bookkeeping before it.
+    if spans is None:
+        return
+    spans.record("finalize", (time.perf_counter() - finalize_started) * 1000.0)
+    run.timing_json = spans.as_json(attempt=run.attempt_count)
+
+
+def _mark_succeeded(
+    session: Session, run_id: str, result: dict, artifact_key: str | None, spans: SpanRecorder | None = None
+) -> None:
+    finalize_started = time.perf_counter()
     with session.begin():
-        run = session.get(Run, run_id)
+        run = _get_owned_run(session, run_id)
         if run is None:
             return
         run.status = "succeeded"
@@ -102,17 +206,39 @@ def _mark_succeeded(session: Session, run_id: str, result: dict, artifact_key: s
         run.completed_at = _utcnow()
         run.updated_at = _utcnow()
         run.error = None
+        _release_lease(run)
+        record_run_event(session, run_id, "succeeded", "succeeded", result_event_payload(result))
+        _record_timing(run, spans, finalize_started)
 
 
-def _mark_failed(session: Session, run_id: str, error: str) -> None:
+def _mark_failed(session: Session, run_id: str, error: str, spans: SpanRecorder | None = None) -> None:
+    finalize_started = time.perf_counter()
     with session.begin():
-        run = session.get(Run, run_id)
+        run = _get_owned_run(session, run_id)
         if run is None:
             return
         run.status = "failed"
         run.error = error[:4000]
         run.completed_at = _utcnow()
         run.updated_at = _utcnow()
+        _release_lease(run)
+        record_run_event(session, run_id, "failed", "failed", {"error": run.error})
+        _record_timing(run, spans, finalize_started)
+
+
+def _write_progress(run_id: str, progress: dict) -> None:
+    session = SessionLocal()
+    try:
+        with session.begin():
+            updated = session.execute(
+                update(Run)
+                .where(Run.id == run_id, Run.status == "running", Run.lease_owner == settings.runner_id)
+                .values(progress_json=progress)
+            ).rowcount
+            if updated:
+                record_run_event(session, run_id, "progress", "running", progress)
+    finally:
+        session.close()
 
 
 def _apply_online_schema_migrations() -> None:
@@ -124,47 +250,229 @@ def _apply_online_schema_migrations() -> None:
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS repro_metadata JSON",
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS score_input_hash VARCHAR(64)",
         "ALTER TABLE runs ADD COLUMN IF NOT EXISTS mask_hash VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(128)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS attempt_count INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS cache_key VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS cached_from_run_id VARCHAR(36)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS progress_json JSON",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS suite_id VARCHAR(36)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS suite_case_index INTEGER",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS matrix_cell JSON",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS matrix_cell_key VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(128)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS priority SMALLINT NOT NULL DEFAULT 0",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS submitter VARCHAR(128) NOT NULL DEFAULT 'anonymous'",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS device_class VARCHAR(64)",
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS timing_json JSON",
         "CREATE INDEX IF NOT EXISTS ix_runs_mode ON runs (mode)",
         "CREATE INDEX IF NOT EXISTS ix_runs_score_input_hash ON runs (score_input_hash)",
         "CREATE INDEX IF NOT EXISTS ix_runs_mask_hash ON runs (mask_hash)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_running_lease ON runs (lease_expires_at) WHERE status = 'running'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_created_at_id ON runs (created_at DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_suite_id ON runs (suite_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_runs_idempotency_key ON runs (idempotency_key)",
+        "CREATE INDEX IF NOT EXISTS ix_runs_succeeded_cache_key ON runs (cache_key, completed_at DESC) WHERE status = 'succeeded'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_pending_queue ON runs (priority, created_at) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_pending_fair_share ON runs (priority, submitter, backend, created_at) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS ix_runs_running_share ON runs (submitter, backend) WHERE status = 'running'",
+        """
+        CREATE TABLE IF NOT EXISTS run_events (
+            id BIGSERIAL PRIMARY KEY,
+            run_id VARCHAR(36) NOT NULL,
+            event_type VARCHAR(32) NOT NULL,
+            status VARCHAR(16),
+            payload JSON NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_run_events_run_id ON run_events (run_id)",
+        """
+        CREATE TABLE IF NOT EXISTS runners (
+            id VARCHAR(128) PRIMARY KEY,
+            device_class VARCHAR(64) NOT NULL,
+            capabilities JSON NOT NULL,
+            in_flight INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            heartbeat_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """,
     ]
     with engine.begin() as conn:
         for stmt in statements:
             conn.execute(text(stmt))
 
 
+def _execute_claimed_run(client: Minio, claimed: dict) -> None:
+    run_id = claimed["id"]
+    backend = claimed["backend"]
+    mode = claimed.get("mode") or "benchmark"
+    progress_sink = ThrottledProgressSink(
+        lambda progress: _write_progress(run_id, progress),
+        min_interval_seconds=settings.run_progress_min_interval_seconds,
+    )
+    register_progress_sink(run_id, progress_sink)
+    spans = SpanRecorder()
+    spans.record("queue_wait", claimed.get("queue_wait_ms", 0.0))
+    spans.record("claim", claimed.get("claim_ms", 0.0))
+    session = SessionLocal()
+    try:
+        with cancellable_run(run_id), recording_spans(spans), spans.span("execute"):
+            result = run_backend_inference(
+                run_id=run_id,
+                backend=backend,
+                prompt=claimed["prompt"],
+                parameters=claimed["parameters"] or {},
+                mode=mode,
+                score_input=claimed.get("score_input"),
+                mask_config=claimed.get("mask_config"),
+                tolerance=claimed.get("tolerance"),
+            )
+        progress_sink.flush()
+        with spans.span("upload"):
+            result = _upload_token_columns(client, run_id, result)
+            stored_result, artifact_key = _upload_result_artifact(client, run_id, result)
+        _mark_succeeded(session, run_id, stored_result, artifact_key, spans)
+        observe_run(backend, mode, "succeeded", spans, result)
+    except RunCanceledError:
+        # Whoever canceled (API or lease loss) already owns the row's final state.
+        observe_run(backend, mode, "canceled", spans)
+    except Exception as exc:  # pragma: no cover - process-level safety
+        _mark_failed(session, run_id, f"Runner failure: {exc}", spans)
+        observe_run(backend, mode, "failed", spans)
+    finally:
+        unregister_progress_sink(run_id)
+        session.close()
+        if settings.global_backend_slot_limits:
+            _notify_slot_released(run_id)
+
+
+def _notify_slot_released(run_id: str) -> None:
+    # Other replicas may be idling on a globally saturated lane; wake them to re-claim.
+    session = SessionLocal()
+    try:
+        with session.begin():
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": settings.run_notify_channel, "payload": run_id},
+            )
+    except Exception:  # pragma: no cover - process-level safety
+        pass
+    finally:
+        session.close()
+
+
+def _with_session(fn, *args) -> None:
+    session = SessionLocal()
+    try:
+        fn(session, *args)
+    finally:
+        session.close()
+
+
+def _cancel_runs(run_ids: set[str]) -> None:
+    for run_id in run_ids:
+        cancel_run(run_id)
+
+
+def _notification_handler(pool: RunWorkerPool) -> Callable[[str, str], None]:
+    """Cancel-channel payloads are run ids to cancel; anything else means work may be claimable."""
+
+    def on_notify(channel: str, payload: str) -> None:
+        if channel == settings.run_cancel_channel:
+            cancel_run(payload)
+        else:
+            pool.wake()
+
+    return on_notify
+
+
 def main() -> None:
     client = _minio_client()
     _ensure_bucket(client)
     _apply_online_schema_migrations()
+    capabilities = detect_capabilities()
+    _with_session(register_runner, settings.runner_id, capabilities)
+
+    pool = RunWorkerPool(
+        max_workers=settings.runner_max_concurrent_runs,
+        backend_limits=settings.backend_concurrency_limits,
+    )
+    start_exporter(settings.runner_metrics_port, pool)
+    listener: RunNotificationListener | None = None
+    if settings.run_notify_enabled:
+        listener = RunNotificationListener(
+            channels=[settings.run_notify_channel, settings.run_cancel_channel],
+            on_notify=_notification_handler(pool),
+            on_connect=pool.wake,
+        )
+        listener.start()
+
+    lease_keeper = LeaseKeeper(
+        session_factory=SessionLocal,
+        owner=settings.runner_id,
+        run_ids_fn=pool.in_flight_run_ids,
+        lease_seconds=settings.run_lease_seconds,
+        heartbeat_interval_seconds=settings.run_heartbeat_interval_seconds,
+        reaper_interval_seconds=settings.run_reaper_interval_seconds,
+        max_attempts=settings.run_max_attempts,
+        on_lease_lost=_cancel_runs,
+        on_heartbeat=lambda run_ids: _with_session(touch_runner, settings.runner_id, len(run_ids)),
+        event_retention_seconds=settings.run_event_retention_hours * 3600.0,
+        progress_event_retention_seconds=settings.run_progress_event_retention_seconds,
+    )
+    lease_keeper.start()
+
+    def idle_wait_seconds() -> float:
+        # With a live LISTEN connection the poll is only a safety net for missed notifications.
+        if listener is not None and listener.connected:
+            return max(settings.notify_fallback_poll_seconds, settings.poll_interval_seconds)
+        return settings.poll_interval_seconds
+
+    try:
+        while True:
+            if pool.free_slots() <= 0:
+                pool.wait(idle_wait_seconds())
+                continue
+
+            excluded_backends, excluded_lanes = pool.saturated_limits()
+            max_priority = claim_priority_ceiling(
+                pool.free_slots(), pool.max_workers, settings.runner_interactive_reserved_slots
+            )
+            claim_started = time.perf_counter()
+            claim_outcome = "error"
+            session = SessionLocal()
+            try:
+                claimed = _claim_pending_run(session, excluded_backends, excluded_lanes, max_priority, capabilities)
+                claim_outcome = "empty" if claimed is None else "claimed"
+            except Exception:  # pragma: no cover - process-level safety
+                claimed = None
+            finally:
+                session.close()
+            claim_seconds = time.perf_counter() - claim_started
+            CLAIM_SECONDS.labels(claim_outcome).observe(claim_seconds)
 
-    while True:
-        session = SessionLocal()
-        claimed: dict | None = None
-        try:
-            claimed = _claim_pending_run(session)
             if claimed is None:
-                time.sleep(settings.poll_interval_seconds)
+                pool.wait(idle_wait_seconds())
                 continue
+            claimed["claim_ms"] = claim_seconds * 1000.0
 
-            result = run_backend_inference(
-                run_id=claimed["id"],
-                backend=claimed["backend"],
-                prompt=claimed["prompt"],
-                parameters=claimed["parameters"] or {},
-                mode=claimed.get("mode") or "benchmark",
-                score_input=claimed.get("score_input"),
-                mask_config=claimed.get("mask_config"),
-                tolerance=claimed.get("tolerance"),
+            pool.submit(
+                claimed["id"],
+                claimed["backend"],
+                claimed.get("mode") or "benchmark",
+                _execute_claimed_run,
+                client,
+                claimed,
             )
-            artifact_key = _upload_result_artifact(client, claimed["id"], result)
-            _mark_succeeded(session, claimed["id"], result, artifact_key)
-        except Exception as exc:  # pragma: no cover - process-level safety
-            run_id = claimed["id"] if claimed else "unknown"
-            if run_id != "unknown":
-                _mark_failed(session, run_id, f"Runner failure: {exc}")
-        finally:
-            session.close()
+    finally:
+        if listener is not None:
+            listener.stop()
+        pool.shutdown(wait=True)
+        warm_workers.shutdown()
+        lease_keeper.stop()
+        _with_session(deregister_runner, settings.runner_id)
 
 
 if __name__ == "__main__":
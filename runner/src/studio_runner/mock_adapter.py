@@ -73,6 +73,11 @@ def run_mock_score(
 
     item_count = max(1, len(items))
     throughput_items_per_s = item_count / (base_latency_ms / 1000.0)
+    # Mostly item-determined so backends largely agree on ranking, with a small backend-specific wobble.
+    item_scores = [
+        round(_stable_unit_float(f"item:{item}") + 0.05 * _stable_unit_float(f"{backend}:item:{idx}:{item}"), 6)
+        for idx, item in enumerate(items)
+    ]
 
     return {
         "score": score,
@@ -83,6 +88,7 @@ def run_mock_score(
         "token_logprobs": token_logprobs,
         "token_nll": token_nll,
         "token_ranks": token_ranks,
+        "item_scores": item_scores,
         "mode": "score",
         "adapter_version": "mock-score-v1",
         "backend": backend,
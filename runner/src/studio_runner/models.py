@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, JSON, String, Text, func
+from sqlalchemy import BigInteger, DateTime, Integer, JSON, SmallInteger, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from studio_runner.db import Base
@@ -26,8 +26,42 @@ class Run(Base):
     result_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     artifact_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    cache_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    cached_from_run_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    progress_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    suite_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)
+    suite_case_index: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    matrix_cell: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    matrix_cell_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    idempotency_key: Mapped[str | None] = mapped_column(String(128), nullable=True, unique=True, index=True)
+    # Priority class rank (0 = interactive, 1 = ci, 2 = batch); lower ranks are claimed first.
+    priority: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
+    submitter: Mapped[str] = mapped_column(
+        String(128), nullable=False, default="anonymous", server_default="anonymous"
+    )
+    device_class: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Per-phase runner timings (queue wait, claim, execute, upload, ...) written when the run finishes.
+    timing_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class RunEvent(Base):
+    __tablename__ = "run_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
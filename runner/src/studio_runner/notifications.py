@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from studio_runner.settings import settings
+
+
+def libpq_dsn(sqlalchemy_dsn: str) -> str:
+    url = make_url(sqlalchemy_dsn).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class RunNotificationListener(threading.Thread):
+    """Background LISTEN loop that calls ``on_notify(channel, payload)`` for every notification.
+
+    The listener owns a dedicated autocommit connection and reconnects with a fixed backoff,
+    so callers should keep a fallback poll for the periods where it is disconnected.
+    """
+
+    def __init__(
+        self,
+        channels: list[str],
+        on_notify: Callable[[str, str], None],
+        on_connect: Callable[[], None] | None = None,
+        dsn: str | None = None,
+        reconnect_delay_seconds: float = 2.0,
+    ) -> None:
+        super().__init__(name="studio-run-listener", daemon=True)
+        self.channels = channels
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.dsn = dsn or libpq_dsn(settings.db_dsn)
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._stop_event = threading.Event()
+        self._connected = threading.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    for channel in self.channels:
+                        conn.execute(f'LISTEN "{channel}"')
+                    self._connected.set()
+                    # Anything enqueued while we were disconnected produced no notification.
+                    if self.on_connect is not None:
+                        self.on_connect()
+                    while not self._stop_event.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            self.on_notify(notify.channel, notify.payload)
+            except psycopg.Error:
+                pass
+            finally:
+                self._connected.clear()
+            self._stop_event.wait(self.reconnect_delay_seconds)
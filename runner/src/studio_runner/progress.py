@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+ProgressSink = Callable[[dict[str, Any]], None]
+
+_sinks: dict[str, ProgressSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def register_progress_sink(run_id: str, sink: ProgressSink) -> None:
+    with _sinks_lock:
+        _sinks[run_id] = sink
+
+
+def unregister_progress_sink(run_id: str) -> None:
+    with _sinks_lock:
+        _sinks.pop(run_id, None)
+
+
+def publish_progress(run_id: str, progress: dict[str, Any]) -> None:
+    """Report partial progress for ``run_id``; a no-op when nobody is listening (e.g. in tests)."""
+    with _sinks_lock:
+        sink = _sinks.get(run_id)
+    if sink is not None:
+        sink(progress)
+
+
+class ThrottledProgressSink:
+    """Merges progress updates and forwards the latest snapshot at most once per interval."""
+
+    def __init__(
+        self,
+        write: ProgressSink,
+        min_interval_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.write = write
+        self.min_interval_seconds = min_interval_seconds
+        self.clock = clock
+        self._latest: dict[str, Any] = {}
+        self._dirty = False
+        self._last_write: float | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, progress: dict[str, Any]) -> None:
+        with self._lock:
+            self._latest.update(progress)
+            self._dirty = True
+            now = self.clock()
+            if self._last_write is not None and now - self._last_write < self.min_interval_seconds:
+                return
+            self._last_write = now
+            self._dirty = False
+            snapshot = dict(self._latest)
+        self._safe_write(snapshot)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            snapshot = dict(self._latest)
+        self._safe_write(snapshot)
+
+    def _safe_write(self, snapshot: dict[str, Any]) -> None:
+        try:
+            self.write(snapshot)
+        except Exception:  # pragma: no cover - process-level safety
+            # Progress is advisory; a failed write must never fail the run itself.
+            pass
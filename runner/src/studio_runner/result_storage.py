@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from typing import Any
+
+# Per-token debug arrays grow with score_debug_max_tokens; everything else is a few scalars.
+HEAVY_RESULT_FIELDS = ("tokens", "token_logprobs", "token_nll", "token_ranks")
+
+
+@dataclass
+class ResultUpload:
+    key: str
+    body: bytes
+    content_encoding: str | None
+    # What ``runs.result_json`` should hold once the upload has succeeded.
+    stored_result: dict[str, Any]
+
+
+def prepare_result_upload(run_id: str, result: dict[str, Any], inline_max_bytes: int) -> ResultUpload:
+    """Build the result artifact upload, offloading heavy fields when the result is too big to inline.
+
+    Small results are uploaded as plain JSON and stored in the DB unchanged. Larger ones are
+    uploaded gzip-compressed, and the DB copy drops ``HEAVY_RESULT_FIELDS`` in favour of a
+    ``detail_ref`` the API resolves on demand.
+    """
+    payload = json.dumps(result, sort_keys=True).encode("utf-8")
+    offloaded = [field for field in HEAVY_RESULT_FIELDS if field in result]
+    if len(payload) <= inline_max_bytes or not offloaded:
+        return ResultUpload(
+            key=f"runs/{run_id}/result.json",
+            body=payload,
+            content_encoding=None,
+            stored_result=result,
+        )
+
+    key = f"runs/{run_id}/result.json.gz"
+    body = gzip.compress(payload, compresslevel=6)
+    summary = {name: value for name, value in result.items() if name not in HEAVY_RESULT_FIELDS}
+    summary["detail_ref"] = {
+        "key": key,
+        "encoding": "gzip",
+        "fields": offloaded,
+        "size_bytes": len(payload),
+        "stored_bytes": len(body),
+    }
+    return ResultUpload(key=key, body=body, content_encoding="gzip", stored_result=summary)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import TextClause, bindparam, text
+from sqlalchemy.orm import Session
+
+from studio_runner.worker_pool import saturated_limits
+
+# Must match the API's priority classes (studio_api.queue); lower ranks are claimed first.
+PRIORITY_RANKS = {"interactive": 0, "ci": 1, "batch": 2}
+INTERACTIVE_PRIORITY = PRIORITY_RANKS["interactive"]
+# Transaction-scoped advisory lock that serializes claims while global slot limits are enforced.
+CLAIM_LOCK_KEY = 0x53545544494F  # b"STUDIO"
+
+
+def claim_priority_ceiling(free_slots: int, max_workers: int, reserved_interactive_slots: int) -> int | None:
+    """Lowest-urgency priority rank this runner may claim now; ``None`` means any.
+
+    The last ``reserved_interactive_slots`` free slots are held back for interactive runs so a
+    large sweep cannot occupy every worker while someone is debugging from the UI. At least
+    one slot always stays open to every class.
+    """
+    reserved = min(reserved_interactive_slots, max_workers - 1)
+    if reserved > 0 and free_slots <= reserved:
+        return INTERACTIVE_PRIORITY
+    return None
+
+
+def _claim_filters(
+    excluded_backends: list[str] | None,
+    excluded_lanes: list[str] | None,
+    max_priority: int | None,
+    capable_lanes: list[str] | None,
+    device_class: str | None,
+) -> tuple[str, dict[str, Any]]:
+    filters = ["status = 'pending'"]
+    params: dict[str, Any] = {}
+    if excluded_backends:
+        filters.append("backend NOT IN :excluded_backends")
+        params["excluded_backends"] = excluded_backends
+    if excluded_lanes:
+        filters.append("(backend || ':' || mode) NOT IN :excluded_lanes")
+        params["excluded_lanes"] = excluded_lanes
+    if max_priority is not None:
+        filters.append("priority <= :max_priority")
+        params["max_priority"] = max_priority
+    if capable_lanes is not None:
+        filters.append("(backend || ':' || mode) IN :capable_lanes")
+        params["capable_lanes"] = capable_lanes
+    if device_class is not None:
+        filters.append("(device_class IS NULL OR device_class = :device_class)")
+        params["device_class"] = device_class
+    return " AND ".join(filters), params
+
+
+def _expand_list_params(query: TextClause, params: dict[str, Any]) -> TextClause:
+    for name in ("excluded_backends", "excluded_lanes", "capable_lanes"):
+        if name in params:
+            query = query.bindparams(bindparam(name, expanding=True))
+    return query
+
+
+def build_claim_query(
+    excluded_backends: list[str] | None = None,
+    excluded_lanes: list[str] | None = None,
+    max_priority: int | None = None,
+    capable_lanes: list[str] | None = None,
+    device_class: str | None = None,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Select the next pending run to claim (``id``, ``queue_wait_ms``), locking it with ``FOR UPDATE SKIP LOCKED``.
+
+    Strict priority between classes: only the most urgent class with an eligible run is
+    considered. Within it, each ``(submitter, backend)`` queue offers its oldest run, and the
+    queue whose submitter, then submitter/backend pair, has the fewest running runs wins, so
+    one submitter's sweep interleaves with everyone else's work instead of blocking it.
+
+    The queue heads are picked before row locks apply, so this returns nothing while every
+    head is locked by a concurrent claimer; callers then use ``build_fallback_claim_query``.
+
+    ``capable_lanes`` and ``device_class`` restrict candidates to runs this runner can execute;
+    runs without a ``device_class`` requirement match any runner.
+    """
+    eligible, params = _claim_filters(excluded_backends, excluded_lanes, max_priority, capable_lanes, device_class)
+    query = text(
+        f"""
+        WITH heads AS (
+            SELECT DISTINCT ON (submitter, backend) id, submitter, backend, created_at
+            FROM runs
+            WHERE {eligible}
+              AND priority = (SELECT min(priority) FROM runs WHERE {eligible})
+            ORDER BY submitter, backend, created_at ASC
+        ),
+        submitter_load AS (
+            SELECT submitter, count(*) AS active
+            FROM runs
+            WHERE status = 'running'
+            GROUP BY submitter
+        ),
+        queue_load AS (
+            SELECT submitter, backend, count(*) AS active
+            FROM runs
+            WHERE status = 'running'
+            GROUP BY submitter, backend
+        )
+        SELECT runs.id, EXTRACT(EPOCH FROM clock_timestamp() - runs.created_at) * 1000 AS queue_wait_ms
+        FROM heads
+        JOIN runs ON runs.id = heads.id
+        LEFT JOIN submitter_load ON submitter_load.submitter = heads.submitter
+        LEFT JOIN queue_load ON queue_load.submitter = heads.submitter AND queue_load.backend = heads.backend
+        WHERE runs.status = 'pending'
+        ORDER BY COALESCE(submitter_load.active, 0), COALESCE(queue_load.active, 0), heads.created_at ASC
+        LIMIT 1
+        FOR UPDATE OF runs SKIP LOCKED
+        """
+    )
+    return _expand_list_params(query, params), params
+
+
+def build_fallback_claim_query(
+    excluded_backends: list[str] | None = None,
+    excluded_lanes: list[str] | None = None,
+    max_priority: int | None = None,
+    capable_lanes: list[str] | None = None,
+    device_class: str | None = None,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Plain priority/FIFO claim that skips locked rows, for when every fair-share head is locked.
+
+    Concurrent claimers usually contend on the same head (one submitter's fan-out on one
+    backend); this lets them take the next pending run instead of idling until the next poll.
+    """
+    eligible, params = _claim_filters(excluded_backends, excluded_lanes, max_priority, capable_lanes, device_class)
+    query = text(
+        f"""
+        SELECT id, EXTRACT(EPOCH FROM clock_timestamp() - created_at) * 1000 AS queue_wait_ms
+        FROM runs
+        WHERE {eligible}
+        ORDER BY priority, created_at ASC
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+        """
+    )
+    return _expand_list_params(query, params), params
+
+
+def globally_saturated_limits(session: Session, limits: dict[str, int]) -> tuple[list[str], list[str]]:
+    """``(backends, lanes)`` at their slot limit across every runner replica.
+
+    Takes ``CLAIM_LOCK_KEY`` for the rest of the caller's transaction first, so no other
+    runner can claim between this count and the caller's claim commit.
+    """
+    session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CLAIM_LOCK_KEY})
+    rows = session.execute(
+        text("SELECT backend, mode, count(*) AS running FROM runs WHERE status = 'running' GROUP BY backend, mode")
+    ).all()
+    return saturated_limits({(row.backend, row.mode): row.running for row in rows}, limits)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import http.client
 import json
-import time
 from pathlib import Path
 from typing import Any
-from urllib import error, request
 
 from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.cancellation import current_cancellation
+from studio_runner.score_http_client import HttpClientError, get_connection_pool
+from studio_runner.score_load import parse_load_config, run_score_load_sweep
 from studio_runner.settings import settings
 
 
@@ -109,33 +111,51 @@ def _derive_score(response_json: dict[str, Any], token_logprobs: list[float]) ->
     raise AdapterExecutionError("Score API response missing score/scores/token_logprobs")
 
 
-def _post_json(url: str, payload: dict[str, Any]) -> tuple[dict[str, Any], int]:
-    body = json.dumps(payload, sort_keys=True).encode("utf-8")
-    req = request.Request(
-        url=url,
-        data=body,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    try:
-        with request.urlopen(req, timeout=settings.score_api_timeout_seconds) as resp:
-            status = int(getattr(resp, "status", 200))
-            content = resp.read().decode("utf-8")
-    except error.HTTPError as exc:
-        detail = _truncate(exc.read().decode("utf-8", errors="replace"))
-        raise AdapterExecutionError(f"Score API HTTP {exc.code}: {detail}") from exc
-    except error.URLError as exc:
-        raise AdapterExecutionError(f"Score API request failed: {exc}") from exc
+def _extract_item_scores(response_json: dict[str, Any], item_count: int) -> list[float]:
+    # /v1/score returns one entry per item: a number, or per-label-token scores where the first label is
+    # the one being ranked. Anything that does not line up with the submitted items is dropped.
+    raw_scores = response_json.get("scores")
+    if not isinstance(raw_scores, list) or len(raw_scores) != item_count:
+        return []
+    item_scores: list[float] = []
+    for entry in raw_scores:
+        values = _flatten_numbers(entry)
+        if not values:
+            return []
+        item_scores.append(round(values[0], 6))
+    return item_scores
+
+
+def _decode_json_response(status: int, content: bytes) -> dict[str, Any]:
+    text = content.decode("utf-8", errors="replace")
+    if status >= 400:
+        raise AdapterExecutionError(f"Score API HTTP {status}: {_truncate(text)}")
 
     try:
-        parsed = json.loads(content)
+        parsed = json.loads(text)
     except json.JSONDecodeError as exc:
-        raise AdapterExecutionError(f"Score API returned non-JSON response: {_truncate(content)}") from exc
+        raise AdapterExecutionError(f"Score API returned non-JSON response: {_truncate(text)}") from exc
 
     if not isinstance(parsed, dict):
         raise AdapterExecutionError("Score API response must be a JSON object")
 
-    return parsed, status
+    return parsed
+
+
+def _post_json(url: str, payload: dict[str, Any]) -> tuple[dict[str, Any], int, dict[str, Any]]:
+    body = json.dumps(payload, sort_keys=True).encode("utf-8")
+    try:
+        pool = get_connection_pool(url, max_idle=settings.score_api_max_idle_connections)
+        status, content, timing = pool.post(
+            body,
+            headers={"Content-Type": "application/json"},
+            timeout=settings.score_api_timeout_seconds,
+            cancel_token=current_cancellation(),
+        )
+    except (HttpClientError, OSError, http.client.HTTPException) as exc:
+        raise AdapterExecutionError(f"Score API request failed: {exc}") from exc
+
+    return _decode_json_response(status, content), status, timing
 
 
 def _apply_mask_to_payload(payload: dict[str, Any], mask_config: dict[str, Any] | None) -> None:
@@ -164,8 +184,10 @@ def run_score_api_inference(
     score_input: dict[str, Any],
     mask_config: dict[str, Any] | None,
     tolerance: dict[str, Any] | None,
+    parameters: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     url = _score_api_url(backend)
+    load_config = parse_load_config(parameters, default_timeout_s=settings.score_api_timeout_seconds)
 
     payload = dict(score_input)
     payload.setdefault("return_logprobs", True)
@@ -179,9 +201,9 @@ def run_score_api_inference(
 
     request_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
 
-    start = time.perf_counter()
-    response_json, status = _post_json(url, payload)
-    duration_ms = (time.perf_counter() - start) * 1000.0
+    response_json, status, timing = _post_json(url, payload)
+    # Connection setup is reported separately and kept out of the latency used for gating.
+    duration_ms = timing["server_ms"] + timing["transfer_ms"]
 
     response_path.write_text(json.dumps(response_json, indent=2, sort_keys=True), encoding="utf-8")
     metadata_path.write_text(
@@ -192,6 +214,7 @@ def run_score_api_inference(
                 "url": url,
                 "status_code": status,
                 "duration_ms": round(duration_ms, 3),
+                "timing": timing,
             },
             indent=2,
             sort_keys=True,
@@ -222,19 +245,21 @@ def run_score_api_inference(
     item_count = max(1, len(score_input.get("items") or []))
     throughput_items_per_s = item_count / (duration_ms / 1000.0) if duration_ms > 0 else 0.0
 
-    return {
+    result = {
         "score": round(score, 6),
         "latency_ms": round(duration_ms, 3),
         "throughput_items_per_s": round(throughput_items_per_s, 3),
         "token_count": len(tokens),
+        "timing": timing,
         "mode": "score",
         "score_source": "real-score-api",
-        "adapter_version": "score-api-wrap-v1",
+        "adapter_version": "score-api-wrap-v2",
         "backend": backend,
         "tokens": tokens,
         "token_logprobs": [round(value, 6) for value in token_logprobs[: len(tokens)]],
         "token_nll": token_nll[: len(tokens)],
         "token_ranks": token_ranks,
+        "item_scores": _extract_item_scores(response_json, len(score_input.get("items") or [])),
         "mask_metadata": mask_config or {"preset": "none"},
         "tolerance": tolerance or {"abs_epsilon": 1e-6, "rel_epsilon": 0.0},
         "notes": "Score-mode run executed against real /v1/score endpoint",
@@ -244,3 +269,40 @@ def run_score_api_inference(
             "metadata_path": str(metadata_path),
         },
     }
+    if load_config is not None:
+        _apply_load_sweep(result, url, payload, load_config, item_count, artifacts_dir)
+    return result
+
+
+def _apply_load_sweep(
+    result: dict[str, Any],
+    url: str,
+    payload: dict[str, Any],
+    load_config: dict[str, Any],
+    item_count: int,
+    artifacts_dir: Path,
+) -> None:
+    sweep = run_score_load_sweep(url, payload, load_config, item_count)
+    load_path = artifacts_dir / "score.load.json"
+    load_path.write_text(json.dumps(sweep, indent=2, sort_keys=True), encoding="utf-8")
+
+    steps = sweep["steps"]
+    if not any(step["succeeded"] for step in steps):
+        raise AdapterExecutionError(f"Score load sweep produced no successful requests against {url}")
+
+    # Headline latency comes from the first (lightest) sweep level; throughput is the peak sustained.
+    reference = steps[0]
+    result["probe_latency_ms"] = result["latency_ms"]
+    result["latency_ms"] = reference["latency_p50_ms"]
+    result["latency_p50_ms"] = reference["latency_p50_ms"]
+    result["latency_p95_ms"] = reference["latency_p95_ms"]
+    result["latency_p99_ms"] = reference["latency_p99_ms"]
+    result["throughput_items_per_s"] = max(step["throughput_items_per_s"] for step in steps)
+    result["latency_samples_ms"] = sweep["latency_samples_ms"][0][: settings.score_load_max_result_samples]
+    result["load"] = {
+        "config": sweep["config"],
+        "level_key": sweep["level_key"],
+        "steps": steps,
+        "saturation": sweep["saturation"],
+    }
+    result["raw_artifacts"]["load_path"] = str(load_path)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import queue
+import socket
+import ssl
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from studio_runner.adapter_errors import RunCanceledError
+from studio_runner.cancellation import CancellationToken
+
+# Errors that mean a pooled keep-alive socket was closed by the server between requests.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class HttpClientError(RuntimeError):
+    """Raised when a request cannot be completed at the transport level."""
+
+
+def _split_url(url: str) -> tuple[str, str, int, str]:
+    parts = urlsplit(url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        raise HttpClientError(f"Unsupported score API URL: {url!r}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return parts.scheme, parts.hostname, port, path
+
+
+def _timing(connect_ms: float, server_ms: float, transfer_ms: float, reused: bool) -> dict[str, Any]:
+    return {
+        "connect_ms": round(connect_ms, 3),
+        "server_ms": round(server_ms, 3),
+        "transfer_ms": round(transfer_ms, 3),
+        "total_ms": round(connect_ms + server_ms + transfer_ms, 3),
+        "connection_reused": reused,
+    }
+
+
+class KeepAliveConnectionPool:
+    """Thread-safe pool of persistent HTTP/1.1 connections to a single origin.
+
+    ``post`` reports connection setup (``connect_ms``) separately from request/response time
+    (``server_ms`` until response headers, ``transfer_ms`` for the body) so callers can
+    exclude handshake noise from measured latency.
+    """
+
+    def __init__(self, url: str, max_idle: int = 8) -> None:
+        self.scheme, self.host, self.port, self.path = _split_url(url)
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=max(1, max_idle))
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _acquire(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection(timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def post(
+        self,
+        body: bytes,
+        headers: dict[str, str],
+        timeout: float,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[int, bytes, dict[str, Any]]:
+        if cancel_token is not None:
+            cancel_token.raise_if_canceled()
+        conn, reused = self._acquire(timeout)
+        try:
+            return self._post_once(conn, reused, body, headers, cancel_token)
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+        # The server dropped an idle keep-alive socket; retry once on a fresh connection.
+        conn = self._new_connection(timeout)
+        return self._post_once(conn, False, body, headers, cancel_token)
+
+    def _post_once(
+        self,
+        conn: http.client.HTTPConnection,
+        reused: bool,
+        body: bytes,
+        headers: dict[str, str],
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[int, bytes, dict[str, Any]]:
+        # Shutting the socket down from the canceling thread unblocks the pending send/recv.
+        def _abort() -> None:
+            if conn.sock is not None:
+                try:
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        keep = False
+        if cancel_token is not None:
+            cancel_token.add_callback(_abort)
+        try:
+            connect_ms = 0.0
+            if conn.sock is None:
+                start = time.perf_counter()
+                conn.connect()
+                connect_ms = (time.perf_counter() - start) * 1000.0
+
+            sent = time.perf_counter()
+            conn.request("POST", self.path, body=body, headers=headers)
+            resp = conn.getresponse()
+            first_byte = time.perf_counter()
+            content = resp.read()
+            done = time.perf_counter()
+
+            keep = not resp.will_close
+            timing = _timing(
+                connect_ms=connect_ms,
+                server_ms=(first_byte - sent) * 1000.0,
+                transfer_ms=(done - first_byte) * 1000.0,
+                reused=reused,
+            )
+            if cancel_token is not None:
+                cancel_token.raise_if_canceled()
+            return resp.status, content, timing
+        except Exception as exc:
+            keep = False
+            if cancel_token is not None and cancel_token.is_canceled:
+                raise RunCanceledError("Score request canceled") from exc
+            raise
+        finally:
+            if cancel_token is not None:
+                cancel_token.remove_callback(_abort)
+            if keep:
+                self._release(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: dict[str, KeepAliveConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(url: str, max_idle: int = 8) -> KeepAliveConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(url)
+        if pool is None:
+            pool = KeepAliveConnectionPool(url, max_idle=max_idle)
+            _pools[url] = pool
+        return pool
+
+
+class AsyncKeepAliveClient:
+    """Minimal asyncio HTTP/1.1 client with persistent connections to a single origin."""
+
+    def __init__(self, url: str, timeout: float, max_idle: int = 64) -> None:
+        self.scheme, self.host, self.port, self.path = _split_url(url)
+        self.timeout = timeout
+        self.max_idle = max(1, max_idle)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+        return await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    async def post(self, body: bytes, headers: dict[str, str]) -> tuple[int, bytes, dict[str, Any]]:
+        if self._idle:
+            reader, writer = self._idle.pop()
+            try:
+                return await asyncio.wait_for(self._post_once(reader, writer, True, 0.0, body, headers), self.timeout)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+
+        start = time.perf_counter()
+        reader, writer = await asyncio.wait_for(self._open(), self.timeout)
+        connect_ms = (time.perf_counter() - start) * 1000.0
+        return await asyncio.wait_for(self._post_once(reader, writer, False, connect_ms, body, headers), self.timeout)
+
+    async def _post_once(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        reused: bool,
+        connect_ms: float,
+        body: bytes,
+        headers: dict[str, str],
+    ) -> tuple[int, bytes, dict[str, Any]]:
+        keep = False
+        try:
+            request_headers = {
+                "Host": f"{self.host}:{self.port}",
+                "Content-Length": str(len(body)),
+                "Connection": "keep-alive",
+                **headers,
+            }
+            head = f"POST {self.path} HTTP/1.1\r\n" + "".join(
+                f"{name}: {value}\r\n" for name, value in request_headers.items()
+            )
+            sent = time.perf_counter()
+            writer.write(head.encode("latin-1") + b"\r\n" + body)
+            await writer.drain()
+
+            status_line = await reader.readuntil(b"\r\n")
+            first_byte = time.perf_counter()
+            parts = status_line.decode("latin-1").split(" ", 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+                raise HttpClientError(f"Malformed HTTP status line: {status_line!r}")
+            status = int(parts[1])
+            http10 = parts[0] == "HTTP/1.0"
+
+            response_headers: dict[str, str] = {}
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+            connection = response_headers.get("connection", "").lower()
+            # HTTP/1.0 closes after the response unless it opts into keep-alive.
+            closes = connection == "close" or (http10 and connection != "keep-alive")
+            if "chunked" in response_headers.get("transfer-encoding", "").lower():
+                chunks: list[bytes] = []
+                while True:
+                    size_line = await reader.readuntil(b"\r\n")
+                    size = int(size_line.split(b";", 1)[0].strip(), 16)
+                    if size == 0:
+                        # Skip optional trailers up to the terminating blank line.
+                        while await reader.readuntil(b"\r\n") != b"\r\n":
+                            pass
+                        break
+                    chunks.append(await reader.readexactly(size))
+                    await reader.readexactly(2)
+                content = b"".join(chunks)
+                keep = not closes
+            elif "content-length" in response_headers:
+                content = await reader.readexactly(int(response_headers["content-length"]))
+                keep = not closes
+            elif status in (204, 304) or 100 <= status < 200:
+                content = b""
+                keep = not closes
+            elif closes:
+                # The body is delimited by the server closing the connection.
+                content = await reader.read()
+            else:
+                # Reading to EOF on a kept-alive socket would block until the request timeout.
+                raise HttpClientError(
+                    "Response has no Content-Length or chunked body and does not close the connection"
+                )
+            done = time.perf_counter()
+
+            timing = _timing(
+                connect_ms=connect_ms,
+                server_ms=(first_byte - sent) * 1000.0,
+                transfer_ms=(done - first_byte) * 1000.0,
+                reused=reused,
+            )
+            return status, content, timing
+        finally:
+            if keep and len(self._idle) < self.max_idle:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
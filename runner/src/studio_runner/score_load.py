@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any
+
+from studio_runner.adapter_errors import AdapterExecutionError, RunCanceledError
+from studio_runner.cancellation import CancellationToken, current_cancellation
+from studio_runner.score_http_client import AsyncKeepAliveClient
+
+LOAD_MODES = {"closed", "open"}
+
+
+def _as_positive_list(value: Any, name: str, cast: type) -> list:
+    values = value if isinstance(value, list) else [value]
+    out = []
+    for item in values:
+        if not isinstance(item, (int, float)) or isinstance(item, bool) or item <= 0:
+            raise AdapterExecutionError(f"parameters.load.{name} must be positive numbers; got {value!r}")
+        out.append(cast(item))
+    if not out:
+        raise AdapterExecutionError(f"parameters.load.{name} must not be empty")
+    return out
+
+
+def _as_number(value: Any, name: str, minimum: float | None = None, integer: bool = False) -> float:
+    valid_type = int if integer else (int, float)
+    if not isinstance(value, valid_type) or isinstance(value, bool) or (minimum is not None and value < minimum):
+        kind = "an integer" if integer else "a number"
+        bound = f" >= {minimum}" if minimum is not None else ""
+        raise AdapterExecutionError(f"parameters.load.{name} must be {kind}{bound}; got {value!r}")
+    return value
+
+
+def parse_load_config(parameters: dict[str, Any] | None, default_timeout_s: float) -> dict[str, Any] | None:
+    """Validate ``parameters["load"]``; ``None`` means a plain single-request score run.
+
+    Closed loop drives ``concurrency`` clients back-to-back; open loop issues Poisson
+    arrivals at each of ``rates_rps``. Each sweep step lasts ``duration_s`` after an
+    optional ``warmup_s`` whose requests are not recorded.
+    """
+    raw = (parameters or {}).get("load")
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise AdapterExecutionError("parameters.load must be an object")
+
+    mode = str(raw.get("mode", "closed")).lower()
+    if mode not in LOAD_MODES:
+        raise AdapterExecutionError(f"parameters.load.mode must be one of {sorted(LOAD_MODES)}; got {mode!r}")
+
+    config: dict[str, Any] = {
+        "mode": mode,
+        "duration_s": float(_as_positive_list(raw.get("duration_s", 10.0), "duration_s", float)[0]),
+        "warmup_s": float(_as_number(raw.get("warmup_s", 0.0), "warmup_s", minimum=0.0)),
+        "request_timeout_s": float(
+            _as_positive_list(raw.get("request_timeout_s", default_timeout_s), "request_timeout_s", float)[0]
+        ),
+        "knee_min_gain_pct": float(_as_number(raw.get("knee_min_gain_pct", 10.0), "knee_min_gain_pct", minimum=0.0)),
+        "seed": int(_as_number(raw.get("seed", 0), "seed", integer=True)),
+    }
+    if mode == "closed":
+        config["concurrency"] = _as_positive_list(raw.get("concurrency", [1, 2, 4, 8]), "concurrency", int)
+    else:
+        if "rates_rps" not in raw:
+            raise AdapterExecutionError("parameters.load.rates_rps is required for open-loop load")
+        config["rates_rps"] = _as_positive_list(raw["rates_rps"], "rates_rps", float)
+        config["max_in_flight"] = int(_as_positive_list(raw.get("max_in_flight", 256), "max_in_flight", int)[0])
+    return config
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_step(
+    latencies_ms: list[float],
+    errors: int,
+    timeouts: int,
+    elapsed_s: float,
+    item_count: int,
+) -> dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    total = len(ordered) + errors + timeouts
+    achieved_rps = len(ordered) / elapsed_s if elapsed_s > 0 else 0.0
+    return {
+        "requests": total,
+        "succeeded": len(ordered),
+        "errors": errors,
+        "timeouts": timeouts,
+        "error_rate": round(errors / total, 6) if total else 0.0,
+        "timeout_rate": round(timeouts / total, 6) if total else 0.0,
+        "achieved_rps": round(achieved_rps, 3),
+        "throughput_items_per_s": round(achieved_rps * item_count, 3),
+        "latency_mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "latency_p50_ms": round(percentile(ordered, 50.0), 3),
+        "latency_p95_ms": round(percentile(ordered, 95.0), 3),
+        "latency_p99_ms": round(percentile(ordered, 99.0), 3),
+        "latency_max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+def find_saturation_knee(steps: list[dict[str, Any]], level_key: str, min_gain_pct: float) -> dict[str, Any]:
+    """Locate the last sweep level that still bought meaningful throughput.
+
+    Saturation is the first step whose achieved RPS improves by less than ``min_gain_pct``
+    over the previous step; the knee is the level just before it.
+    """
+    peak = max(steps, key=lambda step: step["achieved_rps"]) if steps else None
+    knee: dict[str, Any] = {
+        "saturated": False,
+        "knee_level": steps[-1][level_key] if steps else None,
+        "peak_level": peak[level_key] if peak else None,
+        "peak_rps": peak["achieved_rps"] if peak else 0.0,
+    }
+    for previous, current in zip(steps, steps[1:]):
+        base = previous["achieved_rps"]
+        gain_pct = ((current["achieved_rps"] - base) / base * 100.0) if base > 0 else 0.0
+        if gain_pct < min_gain_pct:
+            knee["saturated"] = True
+            knee["knee_level"] = previous[level_key]
+            break
+    return knee
+
+
+class _StepRecorder:
+    def __init__(self, record_after: float) -> None:
+        self.record_after = record_after
+        self.latencies_ms: list[float] = []
+        # Connection setup is reported on its own so latency samples only cover the request.
+        self.connect_ms: list[float] = []
+        self.errors = 0
+        self.timeouts = 0
+
+    async def issue(self, client: AsyncKeepAliveClient, body: bytes) -> None:
+        issued = time.perf_counter()
+        connect_ms = 0.0
+        try:
+            status, _, timing = await client.post(body, {"Content-Type": "application/json"})
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except Exception:
+            outcome = "error"
+        else:
+            outcome = "ok" if status < 400 else "error"
+            connect_ms = timing["connect_ms"]
+        if issued < self.record_after:
+            return
+        if outcome == "ok":
+            if not timing["connection_reused"]:
+                self.connect_ms.append(connect_ms)
+            self.latencies_ms.append((time.perf_counter() - issued) * 1000.0 - connect_ms)
+        elif outcome == "timeout":
+            self.timeouts += 1
+        else:
+            self.errors += 1
+
+
+async def _run_closed_step(url: str, body: bytes, concurrency: int, config: dict[str, Any]) -> tuple[_StepRecorder, float]:
+    client = AsyncKeepAliveClient(url, timeout=config["request_timeout_s"], max_idle=concurrency)
+    started = time.perf_counter()
+    recorder = _StepRecorder(record_after=started + config["warmup_s"])
+    deadline = recorder.record_after + config["duration_s"]
+
+    async def _client_loop() -> None:
+        while time.perf_counter() < deadline:
+            await recorder.issue(client, body)
+
+    try:
+        await asyncio.gather(*(_client_loop() for _ in range(concurrency)))
+    finally:
+        await client.close()
+    return recorder, time.perf_counter() - recorder.record_after
+
+
+async def _run_open_step(
+    url: str, body: bytes, rate_rps: float, config: dict[str, Any], rng: random.Random
+) -> tuple[_StepRecorder, float]:
+    client = AsyncKeepAliveClient(url, timeout=config["request_timeout_s"], max_idle=config["max_in_flight"])
+    started = time.perf_counter()
+    recorder = _StepRecorder(record_after=started + config["warmup_s"])
+    deadline = recorder.record_after + config["duration_s"]
+    in_flight: set[asyncio.Task] = set()
+
+    try:
+        next_arrival = started
+        while next_arrival < deadline:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= config["max_in_flight"]:
+                # Arrivals beyond the in-flight cap count as client-side errors, not silent drops.
+                if next_arrival >= recorder.record_after:
+                    recorder.errors += 1
+            else:
+                task = asyncio.ensure_future(recorder.issue(client, body))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            next_arrival += rng.expovariate(rate_rps)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        await client.close()
+    return recorder, time.perf_counter() - recorder.record_after
+
+
+async def _run_sweep(url: str, body: bytes, config: dict[str, Any], item_count: int) -> dict[str, Any]:
+    rng = random.Random(config["seed"])
+    level_key = "concurrency" if config["mode"] == "closed" else "rate_rps"
+    levels = config["concurrency"] if config["mode"] == "closed" else config["rates_rps"]
+
+    steps: list[dict[str, Any]] = []
+    samples: list[list[float]] = []
+    for level in levels:
+        if config["mode"] == "closed":
+            recorder, elapsed = await _run_closed_step(url, body, level, config)
+        else:
+            recorder, elapsed = await _run_open_step(url, body, level, config, rng)
+        step = {level_key: level, "duration_s": round(elapsed, 3)}
+        step.update(summarize_step(recorder.latencies_ms, recorder.errors, recorder.timeouts, elapsed, item_count))
+        step["connections_opened"] = len(recorder.connect_ms)
+        step["connect_mean_ms"] = (
+            round(sum(recorder.connect_ms) / len(recorder.connect_ms), 3) if recorder.connect_ms else 0.0
+        )
+        steps.append(step)
+        samples.append([round(value, 3) for value in recorder.latencies_ms])
+
+    return {
+        "config": config,
+        "level_key": level_key,
+        "steps": steps,
+        "saturation": find_saturation_knee(steps, level_key, config["knee_min_gain_pct"]),
+        "latency_samples_ms": samples,
+    }
+
+
+async def _run_cancellable_sweep(
+    url: str,
+    body: bytes,
+    config: dict[str, Any],
+    item_count: int,
+    cancel_token: CancellationToken | None,
+) -> dict[str, Any]:
+    if cancel_token is None:
+        return await _run_sweep(url, body, config, item_count)
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+
+    def _on_cancel() -> None:
+        loop.call_soon_threadsafe(task.cancel)
+
+    cancel_token.add_callback(_on_cancel)
+    try:
+        return await _run_sweep(url, body, config, item_count)
+    except asyncio.CancelledError:
+        if cancel_token.is_canceled:
+            raise RunCanceledError("Score load sweep canceled") from None
+        raise
+    finally:
+        cancel_token.remove_callback(_on_cancel)
+
+
+def run_score_load_sweep(
+    url: str,
+    payload: dict[str, Any],
+    config: dict[str, Any],
+    item_count: int,
+) -> dict[str, Any]:
+    body = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return asyncio.run(_run_cancellable_sweep(url, body, config, item_count, current_cancellation()))
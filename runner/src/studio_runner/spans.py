@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Bump whenever the timing_json layout or span boundaries change.
+TIMING_VERSION = 1
+
+SPAN_NAMES = (
+    "queue_wait",
+    "claim",
+    "adapter_setup",
+    "worker_startup",
+    "execute",
+    "parse",
+    "artifact_io",
+    "upload",
+    "finalize",
+)
+# Time spent waiting for or running the benchmark itself; every other span is Studio overhead.
+_WORKLOAD_SPANS = frozenset({"queue_wait", "worker_startup", "execute"})
+
+
+class SpanRecorder:
+    """Per-run phase timings in milliseconds.
+
+    Spans nest: a span's recorded time excludes its children, so the phases of a run add up
+    to its wall time instead of double counting. A recorder belongs to the thread executing
+    the run and is not thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.spans_ms: dict[str, float] = {}
+        self._stack: list[list[Any]] = []
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.spans_ms[name] = self.spans_ms.get(name, 0.0) + max(duration_ms, 0.0)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed_ms = (time.perf_counter() - frame[0]) * 1000.0
+            self.record(name, elapsed_ms - frame[1])
+            if self._stack:
+                self._stack[-1][1] += elapsed_ms
+
+    def as_json(self, **extra: Any) -> dict[str, Any]:
+        spans = {name: round(value, 3) for name, value in self.spans_ms.items()}
+        return {
+            "version": TIMING_VERSION,
+            "spans_ms": spans,
+            "total_ms": round(sum(self.spans_ms.values()), 3),
+            "overhead_ms": round(
+                sum(value for name, value in self.spans_ms.items() if name not in _WORKLOAD_SPANS), 3
+            ),
+            **extra,
+        }
+
+
+_current: contextvars.ContextVar[SpanRecorder | None] = contextvars.ContextVar("studio_run_spans", default=None)
+
+
+@contextmanager
+def recording_spans(recorder: SpanRecorder) -> Iterator[SpanRecorder]:
+    """Make ``recorder`` the target of ``span`` for code running in this thread."""
+    reset = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(reset)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a phase of the current run; a no-op outside ``recording_spans``."""
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    with recorder.span(name):
+        yield
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from studio_runner.spans import SpanRecorder
+from studio_runner.worker_pool import RunWorkerPool
+
+# Run phases range from sub-millisecond bookkeeping to hour-long benchmarks.
+_PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0, 3600.0)
+_IO_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RUNS = Counter(
+    "studio_runner_runs_total",
+    "Runs finished by this runner, by outcome (succeeded, failed, canceled).",
+    ["backend", "mode", "outcome"],
+)
+ADAPTER_FALLBACKS = Counter(
+    "studio_runner_adapter_fallbacks_total",
+    "Auto-mode runs that returned deterministic fallback results because the real adapter failed.",
+    ["backend", "mode"],
+)
+RUN_PHASE_SECONDS = Histogram(
+    "studio_runner_run_phase_seconds",
+    "Per-run phase durations from the run's timing spans.",
+    ["backend", "mode", "span"],
+    buckets=_PHASE_BUCKETS,
+)
+CLAIM_SECONDS = Histogram(
+    "studio_runner_claim_duration_seconds",
+    "Claim transaction latency; outcome is claimed, empty or error.",
+    ["outcome"],
+    buckets=_IO_BUCKETS,
+)
+UPLOAD_SECONDS = Histogram(
+    "studio_runner_upload_duration_seconds",
+    "MinIO upload latency per artifact; outcome is ok or error.",
+    ["artifact", "outcome"],
+    buckets=_IO_BUCKETS,
+)
+IN_FLIGHT = Gauge("studio_runner_in_flight_runs", "Runs executing on this runner.")
+FREE_SLOTS = Gauge("studio_runner_free_slots", "Worker slots free to claim on this runner.")
+
+
+def start_exporter(port: int, pool: RunWorkerPool) -> None:
+    """Serve ``/metrics`` on ``port`` (``0`` disables it) and track ``pool``'s occupancy."""
+    IN_FLIGHT.set_function(lambda: len(pool.in_flight_run_ids()))
+    FREE_SLOTS.set_function(pool.free_slots)
+    if port > 0:
+        start_http_server(port)
+
+
+@contextmanager
+def timed_upload(artifact: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPLOAD_SECONDS.labels(artifact, outcome).observe(time.perf_counter() - started)
+
+
+def observe_run(backend: str, mode: str, outcome: str, spans: SpanRecorder, result: dict | None = None) -> None:
+    RUNS.labels(backend, mode, outcome).inc()
+    if result is not None and result.get("adapter_error"):
+        ADAPTER_FALLBACKS.labels(backend, mode).inc()
+    for name, duration_ms in spans.spans_ms.items():
+        RUN_PHASE_SECONDS.labels(backend, mode, name).observe(duration_ms / 1000.0)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+# Layout (little-endian): 8-byte magic, u64 header length, JSON header, then 8-byte aligned
+# column buffers. Each header column lists (offset, length) buffers relative to the data start;
+# utf8 columns carry an int32 offsets buffer (row_count + 1 entries) followed by the bytes.
+TOKEN_COLUMNS_MAGIC = b"STOKCOL\x00"
+TOKEN_COLUMNS_VERSION = 1
+TOKEN_COLUMNS_FORMAT = "studio-token-columns-v1"
+
+_NUMERIC_COLUMNS = {
+    "token_logprobs": "<f8",
+    "token_nll": "<f8",
+    "token_ranks": "<i4",
+}
+# Per-token result fields carried by the artifact, in column order.
+TOKEN_COLUMN_FIELDS = ("tokens", *_NUMERIC_COLUMNS)
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+
+
+class TokenColumnsEncodeError(ValueError):
+    pass
+
+
+def _typed_bytes(name: str, values: list, dtype: str) -> bytes:
+    """Little-endian column bytes; rejects values the column type cannot hold exactly."""
+    if dtype == "<i4":
+        for value in values:
+            if isinstance(value, bool) or not isinstance(value, int) or not _INT32_MIN <= value <= _INT32_MAX:
+                raise TokenColumnsEncodeError(f"{name} must hold int32 values; got {value!r}")
+    else:
+        for value in values:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TokenColumnsEncodeError(f"{name} must hold numbers; got {value!r}")
+    return np.asarray(values, dtype=dtype).tobytes()
+
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\x00" * (-len(data) % 8)
+
+
+def encode_token_columns(result: dict[str, Any]) -> bytes | None:
+    """Columnar encoding of the per-token arrays in ``result``, or ``None`` when there are none.
+
+    Raises ``TokenColumnsEncodeError`` when a column holds values its dtype cannot represent.
+    """
+    columns: list[tuple[str, str, list[bytes]]] = []
+    row_count = 0
+    tokens = result.get("tokens")
+    if isinstance(tokens, list) and tokens:
+        encoded = [str(token).encode("utf-8") for token in tokens]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        columns.append(("tokens", "utf8", [_typed_bytes("tokens", offsets, "<i4"), b"".join(encoded)]))
+        row_count = max(row_count, len(tokens))
+    for name, dtype in _NUMERIC_COLUMNS.items():
+        values = result.get(name)
+        if isinstance(values, list) and values:
+            columns.append((name, dtype, [_typed_bytes(name, values, dtype)]))
+            row_count = max(row_count, len(values))
+    if not columns:
+        return None
+
+    header_columns = []
+    body = bytearray()
+    for name, dtype, buffers in columns:
+        spans = []
+        for buffer in buffers:
+            spans.append([len(body), len(buffer)])
+            body += _padded(buffer)
+        header_columns.append({"name": name, "dtype": dtype, "buffers": spans})
+    header = _padded(
+        json.dumps(
+            {"version": TOKEN_COLUMNS_VERSION, "row_count": row_count, "columns": header_columns},
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+    return TOKEN_COLUMNS_MAGIC + struct.pack("<Q", len(header)) + header + bytes(body)
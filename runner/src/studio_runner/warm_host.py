@@ -0,0 +1,121 @@
+"""Long-lived benchmark host for warm worker mode.
+
+Runs under the benchmark's own interpreter (which need not have studio_runner installed), so it
+only uses the standard library. Requests and responses are JSON lines: requests on stdin,
+responses on the original stdout, which is moved to a private fd at startup. Each request's
+stdout/stderr (including child processes) is redirected at the fd level into the files it names.
+Imported modules, JIT caches and anything the benchmark memoizes stay loaded between requests.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+import unittest
+
+
+def _set_import_root(argv: list[str]) -> None:
+    # Match what a fresh interpreter puts first on sys.path: the cwd for -m, else the script's directory.
+    if argv[:1] == ["-m"]:
+        sys.path[0] = os.getcwd()
+    else:
+        sys.path[0] = os.path.dirname(os.path.abspath(argv[0]))
+
+
+def _run_argv(argv: list[str]) -> int:
+    _set_import_root(argv)
+    if argv[:2] == ["-m", "unittest"]:
+        program = unittest.main(module=None, argv=["python -m unittest", *argv[2:]], exit=False)
+        return 0 if program.result.wasSuccessful() else 1
+    if argv[:1] == ["-m"]:
+        sys.argv = [argv[1], *argv[2:]]
+        runpy.run_module(argv[1], run_name="__main__", alter_sys=True)
+        return 0
+    sys.argv = list(argv)
+    runpy.run_path(argv[0], run_name="__main__")
+    return 0
+
+
+def _execute(request: dict) -> dict:
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    saved_argv = list(sys.argv)
+    saved_path = list(sys.path)
+    saved_fds = (os.dup(1), os.dup(2))
+    error = None
+    start = time.perf_counter()
+    with open(request["stdout_path"], "w", encoding="utf-8") as out, open(
+        request["stderr_path"], "w", encoding="utf-8"
+    ) as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            os.environ.clear()
+            os.environ.update(request.get("env") or {})
+            os.chdir(request.get("cwd") or saved_cwd)
+            returncode = _run_argv(request["argv"])
+        except SystemExit as exc:
+            code = exc.code
+            returncode = code if isinstance(code, int) else (0 if code is None else 1)
+        except BaseException:  # noqa: BLE001 - report everything the benchmark raises
+            traceback.print_exc()
+            error = traceback.format_exc(limit=5)
+            returncode = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+            sys.argv = saved_argv
+            sys.path[:] = saved_path
+    return {
+        "id": request.get("id"),
+        "returncode": returncode,
+        "duration_ms": (time.perf_counter() - start) * 1000.0,
+        "error": error,
+    }
+
+
+def main() -> None:
+    start = time.perf_counter()
+    # sys.path[0] is this file's directory, which would expose studio_runner's modules as top-level
+    # names (settings, models, ...) to the benchmark. Start from the worker's cwd instead, like -m.
+    sys.path[0] = os.getcwd()
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    # Anything printed outside a request (e.g. during preload) must not reach the protocol stream.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    preload_error = None
+    for module in filter(None, os.environ.get("STUDIO_WARM_PRELOAD", "").split(",")):
+        try:
+            importlib.import_module(module.strip())
+        except Exception as exc:  # noqa: BLE001 - a failed preload only costs warmth
+            preload_error = f"{module}: {exc}"
+    ready = {"event": "ready", "pid": os.getpid(), "startup_ms": (time.perf_counter() - start) * 1000.0}
+    if preload_error:
+        ready["preload_error"] = preload_error
+    protocol.write(json.dumps(ready) + "\n")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if request.get("op") == "shutdown":
+            break
+        protocol.write(json.dumps(_execute(request)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
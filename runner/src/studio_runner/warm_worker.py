@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+from studio_runner import warm_host
+from studio_runner.adapter_errors import AdapterExecutionError, RunCanceledError
+from studio_runner.bench_process import IncrementalMetricParser, ProcessOutcome, run_benchmark_process
+from studio_runner.cancellation import current_cancellation
+from studio_runner.progress import publish_progress
+from studio_runner.settings import settings
+from studio_runner.spans import span
+
+_HOST_SCRIPT = str(Path(warm_host.__file__).resolve())
+
+
+def warm_argv(command: list[str]) -> list[str] | None:
+    """Arguments the warm host should run for ``command``; ``None`` if it is not a Python invocation.
+
+    Supports ``python script.py ...``, ``python -m module ...`` and ``python -m unittest ...``.
+    """
+    if len(command) < 2 or "python" not in Path(command[0]).name:
+        return None
+    argv = command[1:]
+    if argv[0] == "-m":
+        return argv if len(argv) >= 2 else None
+    if argv[0].startswith("-"):
+        return None
+    return argv
+
+
+def worker_key(backend: str, command: list[str], cwd: str, config: dict[str, Any]) -> str:
+    payload = json.dumps([backend, command, cwd, config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class WarmWorker:
+    """One long-lived ``warm_host`` process serving benchmark requests one at a time."""
+
+    def __init__(self, key: str, python_executable: str, cwd: str, env: dict[str, str]) -> None:
+        self.key = key
+        self.runs_served = 0
+        self._responses: queue.Queue[dict | None] = queue.Queue()
+        started = time.perf_counter()
+        try:
+            self.proc = subprocess.Popen(
+                [python_executable, _HOST_SCRIPT],
+                cwd=cwd,
+                env={**env, "STUDIO_WARM_PRELOAD": ",".join(settings.bench_warm_worker_preload)},
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                start_new_session=True,
+            )
+        except FileNotFoundError as exc:
+            raise AdapterExecutionError(f"Warm worker interpreter not found: {exc}") from exc
+        threading.Thread(target=self._read, args=(self.proc.stdout,), name="warm-worker-reader", daemon=True).start()
+
+        try:
+            ready = self._next_response(settings.bench_warm_worker_startup_timeout_seconds)
+        except subprocess.TimeoutExpired as exc:
+            self.kill()
+            raise AdapterExecutionError(
+                f"Warm benchmark worker not ready after {settings.bench_warm_worker_startup_timeout_seconds}s"
+            ) from exc
+        if ready is None or ready.get("event") != "ready":
+            self.stop()
+            raise AdapterExecutionError("Warm benchmark worker exited before it was ready")
+        # Spawn to ready, interpreter boot and preloads included; never part of a run's numbers.
+        self.startup_ms = (time.perf_counter() - started) * 1000.0
+        self.preload_error = ready.get("preload_error")
+
+    def _read(self, stream: IO[str]) -> None:
+        for line in stream:
+            try:
+                self._responses.put(json.loads(line))
+            except ValueError:
+                continue
+        self._responses.put(None)
+
+    def _next_response(self, timeout: float) -> dict | None:
+        try:
+            return self._responses.get(timeout=timeout)
+        except queue.Empty as exc:
+            raise subprocess.TimeoutExpired("warm worker", timeout) from exc
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def execute(
+        self,
+        request: dict[str, Any],
+        timeout_seconds: float,
+        on_tick: Callable[[], None],
+        tick_interval_seconds: float,
+    ) -> dict:
+        self.proc.stdin.write(json.dumps(request) + "\n")
+        self.proc.stdin.flush()
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("warm worker", timeout_seconds)
+            try:
+                response = self._responses.get(timeout=min(tick_interval_seconds, remaining))
+            except queue.Empty:
+                on_tick()
+                continue
+            if response is None:
+                raise AdapterExecutionError("Warm benchmark worker exited mid-run")
+            self.runs_served += 1
+            return response
+
+    def stop(self, grace_seconds: float = 10.0) -> None:
+        if not self.alive:
+            return
+        try:
+            self.proc.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+            self.proc.stdin.flush()
+            self.proc.wait(timeout=grace_seconds)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.proc.wait()
+
+
+class WarmWorkerPool:
+    """Keeps one warm worker per backend, recycled on config change or after ``max_runs`` runs.
+
+    A backend's worker serves one pass at a time: ``acquire`` holds the backend's lock until
+    ``release``, so recycling never races a pass in flight.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._backend_locks: dict[str, threading.Lock] = {}
+        self._workers: dict[str, WarmWorker] = {}
+
+    def acquire(
+        self, backend: str, key: str, python_executable: str, cwd: str, env: dict[str, str]
+    ) -> tuple[WarmWorker, bool]:
+        """Return ``(worker, cold_start)``; the caller must ``release(backend)`` afterwards."""
+        with self._lock:
+            backend_lock = self._backend_locks.setdefault(backend, threading.Lock())
+        backend_lock.acquire()
+        try:
+            worker = self._workers.get(backend)
+            if worker is not None and worker.key == key and worker.alive:
+                return worker, False
+            if worker is not None:
+                self.discard(backend, worker, graceful=True)
+            with span("worker_startup"):
+                worker = WarmWorker(key, python_executable, cwd, env)
+            with self._lock:
+                self._workers[backend] = worker
+            return worker, True
+        except BaseException:
+            backend_lock.release()
+            raise
+
+    def release(self, backend: str) -> None:
+        self._backend_locks[backend].release()
+
+    def discard(self, backend: str, worker: WarmWorker, graceful: bool = False) -> None:
+        with self._lock:
+            if self._workers.get(backend) is worker:
+                del self._workers[backend]
+        if graceful:
+            worker.stop()
+        else:
+            worker.kill()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+warm_workers = WarmWorkerPool()
+
+
+def _tail(path: Path, lines: int) -> str:
+    try:
+        with path.open("r", encoding="utf-8", errors="replace") as handle:
+            return "".join(deque(handle, maxlen=lines))
+    except OSError:
+        return ""
+
+
+def _run_warm_pass(
+    run_id: str,
+    backend: str,
+    argv: list[str],
+    python_executable: str,
+    key: str,
+    cwd: str,
+    env: dict[str, str],
+    stdout_path: Path,
+    stderr_path: Path,
+    timeout_seconds: float,
+    parser: IncrementalMetricParser,
+    partial_metrics: Callable[[dict[str, float]], dict[str, float]],
+) -> ProcessOutcome:
+    cancel_token = current_cancellation()
+    stdout_path.touch()
+    follow = stdout_path.open("r", encoding="utf-8", errors="replace")
+    try:
+        worker, cold_start = warm_workers.acquire(backend, key, python_executable, cwd, env)
+    except BaseException:
+        follow.close()
+        raise
+    canceled = threading.Event()
+
+    def _on_cancel() -> None:
+        canceled.set()
+        worker.kill()
+
+    def _feed_new_output() -> None:
+        # Streaming parity with cold runs: parse what the benchmark has written so far.
+        updated = False
+        for line in follow.readlines():
+            updated = parser.feed(line) or updated
+        if updated:
+            publish_progress(run_id, {"metrics": partial_metrics(parser.values), "worker": "warm"})
+
+    if cancel_token is not None:
+        cancel_token.add_callback(_on_cancel)
+    try:
+        if canceled.is_set():
+            # Canceled while the worker was starting; _on_cancel has already killed it.
+            raise AdapterExecutionError("Benchmark canceled before it started")
+        response = worker.execute(
+            {
+                "id": run_id,
+                "argv": argv,
+                "cwd": cwd,
+                "env": env,
+                "stdout_path": str(stdout_path),
+                "stderr_path": str(stderr_path),
+            },
+            timeout_seconds,
+            on_tick=_feed_new_output,
+            tick_interval_seconds=settings.run_progress_min_interval_seconds,
+        )
+        if response["returncode"] != 0:
+            # A failed benchmark may leave the interpreter in a bad state; start fresh next time.
+            warm_workers.discard(backend, worker)
+        elif worker.runs_served >= settings.bench_warm_worker_max_runs:
+            warm_workers.discard(backend, worker, graceful=True)
+    except (subprocess.TimeoutExpired, AdapterExecutionError, OSError):
+        # OSError covers writing to a worker that a concurrent cancel has just killed.
+        warm_workers.discard(backend, worker)
+        if canceled.is_set():
+            raise RunCanceledError("Benchmark process canceled") from None
+        raise
+    finally:
+        if cancel_token is not None:
+            cancel_token.remove_callback(_on_cancel)
+        _feed_new_output()
+        follow.close()
+        warm_workers.release(backend)
+
+    return ProcessOutcome(
+        returncode=int(response["returncode"]),
+        duration_ms=float(response["duration_ms"]),
+        stdout_tail=_tail(stdout_path, settings.bench_output_tail_lines),
+        stderr_tail=_tail(stderr_path, settings.bench_output_tail_lines) or (response.get("error") or ""),
+        worker={
+            "mode": "warm",
+            "cold_start": cold_start,
+            "startup_ms": round(worker.startup_ms, 3) if cold_start else None,
+            "worker_run_index": worker.runs_served,
+            "preload_error": worker.preload_error,
+        },
+    )
+
+
+def run_bench_pass(
+    run_id: str,
+    backend: str,
+    command: list[str],
+    cwd: str,
+    env: dict[str, str],
+    stdout_path: Path,
+    stderr_path: Path,
+    timeout_seconds: float,
+    parser: IncrementalMetricParser,
+    partial_metrics: Callable[[dict[str, float]], dict[str, float]] = dict,
+    config: dict[str, Any] | None = None,
+) -> ProcessOutcome:
+    """Run one benchmark pass in a warm worker when enabled and possible, else as a fresh process.
+
+    ``config`` holds the run parameters that change what the benchmark loads (model, dtype, ...);
+    a different value recycles the backend's warm worker.
+    """
+    argv = warm_argv(command) if settings.bench_warm_worker_enabled else None
+    if argv is None:
+        outcome = run_benchmark_process(
+            run_id,
+            command,
+            cwd=cwd,
+            env=env,
+            stdout_path=stdout_path,
+            stderr_path=stderr_path,
+            timeout_seconds=timeout_seconds,
+            parser=parser,
+            partial_metrics=partial_metrics,
+        )
+        outcome.worker = {"mode": "cold"}
+        return outcome
+
+    key = worker_key(backend, command, cwd, config or {})
+    return _run_warm_pass(
+        run_id,
+        backend,
+        argv,
+        command[0],
+        key,
+        cwd,
+        env,
+        stdout_path,
+        stderr_path,
+        timeout_seconds,
+        parser,
+        partial_metrics,
+    )
+
+
+def bench_worker_summary(passes: list[dict[str, Any]]) -> dict[str, Any]:
+    """How a run's passes were executed, with warm-worker startup kept out of the measured numbers."""
+    workers = [entry.get("worker") or {"mode": "cold"} for entry in passes]
+    startup = [worker["startup_ms"] for worker in workers if worker.get("startup_ms") is not None]
+    return {
+        "mode": workers[-1]["mode"],
+        "cold_starts": sum(1 for worker in workers if worker.get("cold_start")),
+        "measured_cold_start": any(
+            worker.get("cold_start") for entry, worker in zip(passes, workers) if not entry.get("warmup")
+        ),
+        "startup_ms": round(sum(startup), 3) if startup else None,
+    }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+
+def lane_key(backend: str, mode: str) -> str:
+    return f"{backend}:{mode}"
+
+
+def saturated_limits(
+    running: Mapping[tuple[str, str], int], limits: Mapping[str, int]
+) -> tuple[list[str], list[str]]:
+    """Split ``limits`` keys into ``(backends, lanes)`` whose running count has reached the limit.
+
+    ``running`` maps ``(backend, mode)`` to the number of runs executing in that lane.
+    """
+    backends: list[str] = []
+    lanes: list[str] = []
+    for key, limit in sorted(limits.items()):
+        if ":" in key:
+            count = sum(n for (backend, mode), n in running.items() if lane_key(backend, mode) == key)
+            if count >= limit:
+                lanes.append(key)
+        else:
+            count = sum(n for (backend, _), n in running.items() if backend == key)
+            if count >= limit:
+                backends.append(key)
+    return backends, lanes
+
+
+class RunWorkerPool:
+    """Bounded thread pool that executes claimed runs under per-backend concurrency limits.
+
+    Limit keys are either a backend name (``sglang-jax``) covering every mode of that
+    backend, or a ``backend:mode`` lane (``sglang-jax:benchmark``) so cheap score runs
+    are not queued behind long benchmark runs on the same backend.
+    """
+
+    def __init__(self, max_workers: int, backend_limits: dict[str, int] | None = None) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.backend_limits = {key: max(0, int(limit)) for key, limit in (backend_limits or {}).items()}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="studio-run")
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, tuple[str, str]] = {}
+        self._wakeup = threading.Event()
+
+    def free_slots(self) -> int:
+        with self._lock:
+            return self.max_workers - len(self._in_flight)
+
+    def in_flight_run_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._in_flight)
+
+    def saturated_limits(self) -> tuple[list[str], list[str]]:
+        """Return ``(backends, lanes)`` whose concurrency limit is currently reached."""
+        with self._lock:
+            running = Counter(self._in_flight.values())
+        return saturated_limits(running, self.backend_limits)
+
+    def submit(self, run_id: str, backend: str, mode: str, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if len(self._in_flight) >= self.max_workers:
+                raise RuntimeError("Worker pool has no free slots")
+            self._in_flight[run_id] = (backend, mode)
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release(run_id)
+            raise
+        future.add_done_callback(lambda _: self._release(run_id))
+        return future
+
+    def wait(self, timeout: float) -> bool:
+        woke = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return woke
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _release(self, run_id: str) -> None:
+        with self._lock:
+            self._in_flight.pop(run_id, None)
+        self.wake()
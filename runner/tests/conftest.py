@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _EchoScoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[tuple[str, int]] = set()
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        _EchoScoreHandler.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(float(payload.get("delay_s", 0.0)))
+        body = json.dumps({"score": 0.5, "echo": payload}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+@pytest.fixture
+def score_server_url() -> Iterator[str]:
+    _EchoScoreHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoScoreHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1/score"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def score_server_connections(score_server_url: str) -> set[tuple[str, int]]:
+    return _EchoScoreHandler.connections
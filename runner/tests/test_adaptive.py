@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.adaptive import (
+    median_metrics,
+    parse_repeat_config,
+    quantile_interval,
+    run_adaptive_repetitions,
+)
+from studio_runner.pytorch_bench_adapter import run_sglang_pytorch_benchmark
+from studio_runner.settings import settings
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_repeat_config_defaults_and_validation() -> None:
+    assert parse_repeat_config({}) is None
+    assert parse_repeat_config({"repeat": False}) is None
+
+    config = parse_repeat_config({"repeat": True})
+    assert config is not None
+    assert config["warmup_iterations"] == 1
+    assert config["target_ci_pct"] == 5.0
+
+    with pytest.raises(AdapterExecutionError, match="must be an object"):
+        parse_repeat_config({"repeat": 3})
+    with pytest.raises(AdapterExecutionError, match="confidence must be one of"):
+        parse_repeat_config({"repeat": {"confidence": 0.42}})
+    with pytest.raises(AdapterExecutionError, match="max_iterations must be >= min_iterations"):
+        parse_repeat_config({"repeat": {"min_iterations": 10, "max_iterations": 5}})
+
+
+def test_quantile_interval_needs_enough_samples() -> None:
+    assert quantile_interval([1.0] * 7, 0.5, 0.95) is None
+    low, high = quantile_interval([float(value) for value in range(1, 101)], 0.5, 0.95)
+    assert low < 50.5 < high
+
+
+def test_adaptive_repetitions_stop_when_estimates_converge() -> None:
+    clock = _FakeClock()
+    calls: list[tuple[int, bool]] = []
+
+    def _iteration(index: int, warmup: bool) -> dict[str, float]:
+        calls.append((index, warmup))
+        clock.now += 1.0
+        jitter = 0.1 * (index % 3)
+        return {"latency_ms": 20.0 + jitter, "latency_p95_ms": 40.0 + jitter}
+
+    config = parse_repeat_config({"repeat": {"warmup_iterations": 2, "target_ci_pct": 2.0}})
+    outcome = run_adaptive_repetitions("run-1", config, _iteration, clock=clock)
+
+    assert calls[:2] == [(0, True), (1, True)]
+    assert outcome["stop_reason"] == "converged"
+    assert outcome["warmup_iterations_run"] == 2
+    assert outcome["measured_iterations"] == len(outcome["latency_samples_ms"]) == len(calls) - 2
+    assert outcome["p50"]["ci_width_pct"] <= 2.0
+    assert outcome["p95"]["estimate_ms"] == pytest.approx(40.1)
+
+
+def test_adaptive_repetitions_respect_the_time_budget() -> None:
+    clock = _FakeClock()
+
+    def _noisy(index: int, warmup: bool) -> dict[str, float]:
+        clock.now += 10.0
+        return {"latency_ms": 10.0 + 15.0 * (index % 4)}
+
+    config = parse_repeat_config({"repeat": {"warmup_iterations": 0, "budget_s": 45.0}})
+    outcome = run_adaptive_repetitions("run-1", config, _noisy, clock=clock)
+
+    assert outcome["stop_reason"] == "budget"
+    assert outcome["converged"] is False
+    assert outcome["measured_iterations"] == 4
+    assert "p95" not in outcome
+
+
+def test_median_metrics_keeps_shared_keys() -> None:
+    merged = median_metrics([{"latency_ms": 3.0, "extra": 1.0}, {"latency_ms": 1.0}, {"latency_ms": 2.0}])
+    assert merged == {"latency_ms": 2.0}
+
+
+def test_pytorch_bench_adapter_repeats_the_benchmark(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text(
+        "print('Achieved RPS: 100.0')\n"
+        "print('Item count: 2')\n"
+        "print('P50 response time: 12.5 ms')\n"
+        "print('P99 response time: 30.0 ms')\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(settings, "sglang_pytorch_root", str(tmp_path))
+    monkeypatch.setattr(settings, "sglang_pytorch_bench_entrypoint", str(script))
+    monkeypatch.setattr(settings, "sglang_pytorch_python_executable", sys.executable)
+    monkeypatch.setattr(settings, "local_artifacts_root", str(tmp_path / "artifacts"))
+
+    result = run_sglang_pytorch_benchmark(
+        run_id="run-repeat",
+        prompt="hello world",
+        parameters={"repeat": {"warmup_iterations": 1, "min_iterations": 8, "max_iterations": 8}},
+    )
+
+    assert result["latency_ms"] == pytest.approx(12.5)
+    assert result["latency_samples_ms"] == [12.5] * 8
+    assert result["repeat"]["stop_reason"] == "converged"
+    assert result["repeat"]["p95"]["estimate_ms"] == pytest.approx(30.0)
+    metadata = json.loads(Path(result["raw_artifacts"]["metadata_path"]).read_text(encoding="utf-8"))
+    assert [entry["warmup"] for entry in metadata["passes"]] == [True] + [False] * 8
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from studio_runner import bench_process
+from studio_runner.bench_process import IncrementalMetricParser, run_streaming_process
+from studio_runner.progress import ThrottledProgressSink, publish_progress, register_progress_sink, unregister_progress_sink
+
+_SCRIPT = """
+import sys
+for i in range(50):
+    print(f"step {i} Throughput: {i}.5 items/sec", flush=True)
+print("warming up", file=sys.stderr, flush=True)
+"""
+
+
+def test_streaming_process_writes_logs_and_keeps_bounded_tail(tmp_path) -> None:
+    lines: list[tuple[str, str]] = []
+    outcome = run_streaming_process(
+        [sys.executable, "-c", _SCRIPT],
+        cwd=str(tmp_path),
+        env={},
+        stdout_path=tmp_path / "out.log",
+        stderr_path=tmp_path / "err.log",
+        timeout_seconds=30.0,
+        on_line=lambda stream, line: lines.append((stream, line)),
+        tail_lines=5,
+    )
+
+    assert outcome.returncode == 0
+    assert len((tmp_path / "out.log").read_text().splitlines()) == 50
+    assert outcome.stdout_tail.splitlines() == [f"step {i} Throughput: {i}.5 items/sec" for i in range(45, 50)]
+    assert outcome.stderr_tail == "warming up\n"
+    assert len(lines) == 51
+
+
+def test_streaming_process_kills_on_timeout(tmp_path) -> None:
+    ticks: list[dict] = []
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_streaming_process(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            cwd=str(tmp_path),
+            env={},
+            stdout_path=tmp_path / "out.log",
+            stderr_path=tmp_path / "err.log",
+            timeout_seconds=0.5,
+            on_line=lambda stream, line: None,
+            on_tick=ticks.append,
+            tick_interval_seconds=0.1,
+        )
+    assert ticks
+    assert ticks[-1]["stdout_lines"] == 0
+    assert ticks[-1]["last_output_age_s"] > 0.0
+
+
+def test_slow_progress_publish_does_not_block_the_other_stream(tmp_path) -> None:
+    script = "import sys\nprint('Throughput: 1.5', flush=True)\nprint('stderr done', file=sys.stderr, flush=True)\n"
+    stderr_done = threading.Event()
+    published: list[bool] = []
+
+    def on_line(stream: str, line: str) -> dict | None:
+        if stream == "stderr":
+            stderr_done.set()
+            return None
+        return {"metrics": {"tp": 1.5}}
+
+    def on_progress(progress: dict) -> None:
+        # Stands in for a slow DB write: it only returns once stderr was drained meanwhile.
+        published.append(stderr_done.wait(timeout=5.0))
+
+    run_streaming_process(
+        [sys.executable, "-c", script],
+        cwd=str(tmp_path),
+        env={},
+        stdout_path=tmp_path / "out.log",
+        stderr_path=tmp_path / "err.log",
+        timeout_seconds=30.0,
+        on_line=on_line,
+        on_progress=on_progress,
+    )
+
+    assert published == [True]
+
+
+def test_incremental_parser_keeps_last_match() -> None:
+    parser = IncrementalMetricParser({"tp": r"Throughput:\s*([0-9.]+)"})
+    assert parser.feed("noise") is False
+    assert parser.feed("Throughput: 10.0") is True
+    parser.feed("Throughput: 12.5")
+    assert parser.values == {"tp": 12.5}
+
+
+def test_benchmark_process_publishes_partial_metrics(tmp_path) -> None:
+    published: list[dict] = []
+    register_progress_sink("run-1", published.append)
+    try:
+        bench_process.run_benchmark_process(
+            "run-1",
+            [sys.executable, "-c", _SCRIPT],
+            cwd=str(tmp_path),
+            env={},
+            stdout_path=tmp_path / "out.log",
+            stderr_path=tmp_path / "err.log",
+            timeout_seconds=30.0,
+            parser=IncrementalMetricParser({"throughput_items_per_s": r"Throughput:\s*([0-9.]+)"}),
+        )
+    finally:
+        unregister_progress_sink("run-1")
+
+    metrics = [update["metrics"] for update in published if "metrics" in update]
+    assert metrics[0] == {"throughput_items_per_s": 0.5}
+    assert metrics[-1] == {"throughput_items_per_s": 49.5}
+
+
+def test_throttled_sink_merges_updates_between_writes() -> None:
+    now = [0.0]
+    writes: list[dict] = []
+    sink = ThrottledProgressSink(writes.append, min_interval_seconds=2.0, clock=lambda: now[0])
+
+    sink({"elapsed_s": 1.0})
+    sink({"metrics": {"tp": 1.0}})
+    now[0] = 1.0
+    sink({"elapsed_s": 2.0})
+    assert writes == [{"elapsed_s": 1.0}]
+
+    now[0] = 2.5
+    sink({"metrics": {"tp": 2.0}})
+    assert writes[-1] == {"elapsed_s": 2.0, "metrics": {"tp": 2.0}}
+
+    sink({"elapsed_s": 3.0})
+    sink.flush()
+    assert writes[-1]["elapsed_s"] == 3.0
+    sink.flush()
+    assert len(writes) == 3
+
+
+def test_publish_progress_without_sink_is_noop() -> None:
+    publish_progress("unknown-run", {"elapsed_s": 1.0})
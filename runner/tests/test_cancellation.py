@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from studio_runner.adapter_errors import AdapterExecutionError, RunCanceledError
+from studio_runner.bench_process import run_streaming_process
+from studio_runner.cancellation import CancellationToken, cancel_run, cancellable_run, current_cancellation
+from studio_runner.leases import LeaseKeeper
+from studio_runner.score_http_client import KeepAliveConnectionPool
+
+
+def test_run_canceled_error_is_not_an_adapter_error() -> None:
+    # Auto adapter mode falls back to mock results on AdapterExecutionError; a cancel must not.
+    assert not issubclass(RunCanceledError, AdapterExecutionError)
+
+
+def test_token_runs_callbacks_once_and_immediately_when_already_canceled() -> None:
+    token = CancellationToken()
+    calls: list[str] = []
+    token.add_callback(lambda: calls.append("first"))
+    token.cancel()
+    token.cancel()
+    token.add_callback(lambda: calls.append("late"))
+
+    assert calls == ["first", "late"]
+    with pytest.raises(RunCanceledError):
+        token.raise_if_canceled()
+
+
+def test_cancel_run_targets_registered_run_only() -> None:
+    assert cancel_run("run-x") is False
+    with cancellable_run("run-x") as token:
+        assert current_cancellation() is token
+        assert cancel_run("run-x") is True
+        assert token.is_canceled
+    assert current_cancellation() is None
+    assert cancel_run("run-x") is False
+
+
+def _wait_for_exit(pid: int, timeout: float = 5.0) -> bool:
+    # Orphans are reparented and may linger as zombies; those count as exited.
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as stat:
+                if stat.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_cancel_kills_bench_process_group(tmp_path) -> None:
+    # The child spawns a grandchild that would outlive a plain proc.kill().
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    token = CancellationToken()
+    pids: list[int] = []
+
+    def _on_line(stream: str, line: str) -> None:
+        pids.append(int(line))
+        threading.Timer(0.1, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(RunCanceledError):
+        run_streaming_process(
+            [sys.executable, "-c", script],
+            cwd=str(tmp_path),
+            env={},
+            stdout_path=tmp_path / "out.log",
+            stderr_path=tmp_path / "err.log",
+            timeout_seconds=60.0,
+            on_line=_on_line,
+            tick_interval_seconds=0.1,
+            cancel_token=token,
+            kill_grace_seconds=2.0,
+        )
+
+    assert time.monotonic() - started < 10.0
+    assert _wait_for_exit(pids[0])
+
+
+def test_cancel_aborts_in_flight_score_request(score_server_url: str) -> None:
+    pool = KeepAliveConnectionPool(score_server_url)
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(RunCanceledError):
+        pool.post(b'{"delay_s": 5}', {"Content-Type": "application/json"}, timeout=30.0, cancel_token=token)
+    assert time.monotonic() - started < 3.0
+    pool.close()
+
+
+class _FakeSession:
+    def close(self) -> None:
+        pass
+
+
+def test_lease_keeper_reports_runs_it_could_not_renew(monkeypatch) -> None:
+    from studio_runner import leases
+
+    monkeypatch.setattr(leases, "renew_leases", lambda session, owner, run_ids, lease_seconds: {"run-1"})
+    lost: list[set[str]] = []
+    keeper = LeaseKeeper(
+        session_factory=_FakeSession,
+        owner="runner-a",
+        run_ids_fn=lambda: ["run-1", "run-2"],
+        lease_seconds=60.0,
+        heartbeat_interval_seconds=5.0,
+        reaper_interval_seconds=30.0,
+        max_attempts=3,
+        on_lease_lost=lost.append,
+    )
+
+    keeper.heartbeat_once()
+    assert lost == [{"run-2"}]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from studio_runner.capabilities import detect_capabilities
+from studio_runner.settings import settings
+
+
+@pytest.fixture
+def _unprovisioned(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    for prefix in ("sglang_jax", "sglang_pytorch"):
+        monkeypatch.setattr(settings, f"{prefix}_adapter_mode", "auto")
+        monkeypatch.setattr(settings, f"{prefix}_root", str(tmp_path / prefix))
+        monkeypatch.setattr(settings, f"{prefix}_bench_entrypoint", None)
+        monkeypatch.setattr(settings, f"{prefix}_score_api_url", None)
+    monkeypatch.setattr(settings, "runner_allow_mock_fallback", False)
+    return tmp_path
+
+
+def test_unprovisioned_runner_only_advertises_mock_lanes(_unprovisioned: Path) -> None:
+    capabilities = detect_capabilities()
+
+    assert capabilities["lanes"] == ["mock:benchmark", "mock:score"]
+    assert capabilities["adapter_modes"] == {"sglang-jax": "auto", "sglang-pytorch": "auto"}
+
+
+def test_runner_advertises_provisioned_lanes(_unprovisioned: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    entrypoint = _unprovisioned / "bench_score.py"
+    entrypoint.write_text("print('ok')\n", encoding="utf-8")
+    monkeypatch.setattr(settings, "sglang_pytorch_bench_entrypoint", str(entrypoint))
+    monkeypatch.setattr(settings, "sglang_jax_score_api_url", "http://jax:30000")
+    monkeypatch.setattr(settings, "runner_device_class", "tpu-v5e")
+
+    capabilities = detect_capabilities()
+
+    assert capabilities["lanes"] == ["mock:benchmark", "mock:score", "sglang-jax:score", "sglang-pytorch:benchmark"]
+    assert capabilities["device_class"] == "tpu-v5e"
+
+
+def test_mock_mode_and_explicit_fallback_opt_in(_unprovisioned: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "sglang_jax_adapter_mode", "mock")
+    monkeypatch.setattr(settings, "runner_allow_mock_fallback", True)
+
+    lanes = detect_capabilities()["lanes"]
+
+    assert {"sglang-jax:benchmark", "sglang-jax:score"} <= set(lanes)
+    # Fallback covers benchmark runs only; score parity never falls back to mock.
+    assert "sglang-pytorch:benchmark" in lanes
+    assert "sglang-pytorch:score" not in lanes
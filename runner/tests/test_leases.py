@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import contextlib
+from types import SimpleNamespace
+
+from studio_runner import leases
+
+
+class _FakeSession:
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_renew_leases_skips_query_without_in_flight_runs() -> None:
+    assert leases.renew_leases(session=None, owner="runner-a", run_ids=[], lease_seconds=60.0) == set()
+
+
+def test_lease_keeper_heartbeats_in_flight_runs(monkeypatch) -> None:
+    calls: list[tuple[str, list[str], float]] = []
+    session = _FakeSession()
+
+    def _renew(session_arg, owner, run_ids, lease_seconds):
+        assert session_arg is session
+        calls.append((owner, run_ids, lease_seconds))
+        return set(run_ids[:1])
+
+    monkeypatch.setattr(leases, "renew_leases", _renew)
+    keeper = leases.LeaseKeeper(
+        session_factory=lambda: session,
+        owner="runner-a",
+        run_ids_fn=lambda: ["run-1", "run-2"],
+        lease_seconds=45.0,
+        heartbeat_interval_seconds=5.0,
+        reaper_interval_seconds=30.0,
+        max_attempts=3,
+    )
+
+    assert keeper.heartbeat_once() == {"run-1"}
+    assert calls == [("runner-a", ["run-1", "run-2"], 45.0)]
+    assert session.closed is True
+
+
+class _RecordingSession(_FakeSession):
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+
+    def begin(self):
+        return contextlib.nullcontext()
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return SimpleNamespace(rowcount=3, all=lambda: [])
+
+
+def test_prune_run_events_drops_progress_sooner_than_lifecycle_events() -> None:
+    session = _RecordingSession()
+
+    assert leases.prune_run_events(session, 72 * 3600.0, 300.0, 1000) == 3
+
+    [(sql, params)] = session.statements
+    assert sql.lstrip().startswith("DELETE FROM run_events")
+    assert "runs.status IN ('succeeded', 'failed', 'canceled')" in sql
+    assert "run_events.event_type = 'progress'" in sql
+    assert params == {"retention_seconds": 259200.0, "progress_retention_seconds": 300.0, "batch_size": 1000}
+
+
+def test_reaper_prunes_events_only_when_retention_is_set(monkeypatch) -> None:
+    pruned: list[tuple[float, float, int]] = []
+    monkeypatch.setattr(leases, "reap_expired_leases", lambda session, lease_seconds, max_attempts: [])
+    monkeypatch.setattr(leases, "prune_run_events", lambda session, *args: pruned.append(args) or 0)
+
+    def keeper(**overrides) -> leases.LeaseKeeper:
+        return leases.LeaseKeeper(
+            session_factory=_FakeSession,
+            owner="runner-a",
+            run_ids_fn=lambda: [],
+            lease_seconds=45.0,
+            heartbeat_interval_seconds=5.0,
+            reaper_interval_seconds=30.0,
+            max_attempts=3,
+            **overrides,
+        )
+
+    keeper().reap_once()
+    assert pruned == []
+    keeper(event_retention_seconds=3600.0, progress_event_retention_seconds=60.0).reap_once()
+    assert pruned == [(3600.0, 60.0, 5000)]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+
+from studio_runner import notifications
+from studio_runner.cancellation import cancellable_run
+from studio_runner.main import _notification_handler
+from studio_runner.notifications import RunNotificationListener, libpq_dsn
+from studio_runner.settings import settings
+from studio_runner.worker_pool import RunWorkerPool
+
+
+class _FakeConnection:
+    """Delivers one batch of notifications, then fails the way a dropped socket does."""
+
+    def __init__(self, batch: list[SimpleNamespace]) -> None:
+        self.batch = batch
+        self.executed: list[str] = []
+
+    def __enter__(self) -> _FakeConnection:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+    def execute(self, statement: str) -> None:
+        self.executed.append(statement)
+
+    def notifies(self, timeout: float | None = None) -> Iterator[SimpleNamespace]:
+        yield from self.batch
+        raise psycopg.OperationalError("server closed the connection unexpectedly")
+
+
+def _notify(channel: str, payload: str) -> SimpleNamespace:
+    return SimpleNamespace(channel=channel, payload=payload, pid=1)
+
+
+def _run_listener(
+    monkeypatch: pytest.MonkeyPatch, batches: list[list[SimpleNamespace]], on_notify
+) -> tuple[list[_FakeConnection], int]:
+    """Run the listener until every fake connection has been used; returns them and the connect count."""
+    connections: list[_FakeConnection] = []
+    connected = threading.Semaphore(0)
+    done = threading.Event()
+
+    def connect(dsn: str, autocommit: bool = False) -> _FakeConnection:
+        assert autocommit
+        if len(connections) == len(batches):
+            done.set()
+            raise psycopg.OperationalError("connection refused")
+        connections.append(_FakeConnection(batches[len(connections)]))
+        return connections[-1]
+
+    monkeypatch.setattr(notifications.psycopg, "connect", connect)
+    listener = RunNotificationListener(
+        channels=[settings.run_notify_channel, settings.run_cancel_channel],
+        on_notify=on_notify,
+        on_connect=connected.release,
+        dsn="postgresql://studio@db/studio",
+        reconnect_delay_seconds=0.01,
+    )
+    listener.start()
+    assert done.wait(5.0)
+    listener.stop()
+    listener.join(5.0)
+    assert not listener.is_alive()
+    assert not listener.connected
+    connects = 0
+    while connected.acquire(blocking=False):
+        connects += 1
+    return connections, connects
+
+
+def test_libpq_dsn_strips_sqlalchemy_driver() -> None:
+    dsn = libpq_dsn("postgresql+psycopg://studio:secret@db:5432/studio")
+    assert dsn == "postgresql://studio:secret@db:5432/studio"
+
+
+def test_run_notification_wakes_the_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = RunWorkerPool(max_workers=1)
+    try:
+        _run_listener(monkeypatch, [[_notify(settings.run_notify_channel, "run-1")]], _notification_handler(pool))
+        assert pool.wait(0)
+    finally:
+        pool.shutdown()
+
+
+def test_listener_reconnects_after_a_dropped_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    received: list[tuple[str, str]] = []
+    batches = [
+        [_notify(settings.run_notify_channel, "run-1")],
+        [_notify(settings.run_notify_channel, "run-2")],
+    ]
+
+    connections, connects = _run_listener(monkeypatch, batches, lambda channel, payload: received.append((channel, payload)))
+
+    assert len(connections) == 2
+    assert connects == 2
+    assert received == [(settings.run_notify_channel, "run-1"), (settings.run_notify_channel, "run-2")]
+    for connection in connections:
+        assert connection.executed == [
+            f'LISTEN "{settings.run_notify_channel}"',
+            f'LISTEN "{settings.run_cancel_channel}"',
+        ]
+
+
+def test_cancel_channel_cancels_the_running_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = RunWorkerPool(max_workers=1)
+    try:
+        with cancellable_run("run-7") as token:
+            _run_listener(
+                monkeypatch, [[_notify(settings.run_cancel_channel, "run-7")]], _notification_handler(pool)
+            )
+            assert token.is_canceled
+        # A cancel is not new work, so it must not wake the claim loop.
+        assert not pool.wait(0)
+    finally:
+        pool.shutdown()
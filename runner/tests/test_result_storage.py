@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+from studio_runner.result_storage import prepare_result_upload
+
+
+def _score_result(token_count: int) -> dict:
+    return {
+        "score": -1.5,
+        "latency_ms": 12.0,
+        "token_count": token_count,
+        "tokens": [f"tok_{idx}" for idx in range(token_count)],
+        "token_logprobs": [-0.1] * token_count,
+        "token_nll": [0.1] * token_count,
+        "token_ranks": [1] * token_count,
+    }
+
+
+def test_small_results_stay_inline() -> None:
+    result = _score_result(4)
+    upload = prepare_result_upload("run-1", result, inline_max_bytes=64 * 1024)
+
+    assert upload.key == "runs/run-1/result.json"
+    assert upload.content_encoding is None
+    assert upload.stored_result is result
+    assert json.loads(upload.body) == result
+
+
+def test_large_results_offload_heavy_fields_compressed() -> None:
+    result = _score_result(5000)
+    upload = prepare_result_upload("run-1", result, inline_max_bytes=1024)
+
+    assert upload.key == "runs/run-1/result.json.gz"
+    assert upload.content_encoding == "gzip"
+    assert json.loads(gzip.decompress(upload.body)) == result
+    assert len(upload.body) < len(json.dumps(result))
+
+    stored = upload.stored_result
+    assert "tokens" not in stored and "token_logprobs" not in stored
+    assert stored["score"] == -1.5 and stored["token_count"] == 5000
+    assert stored["detail_ref"]["key"] == upload.key
+    assert stored["detail_ref"]["fields"] == ["tokens", "token_logprobs", "token_nll", "token_ranks"]
+
+
+def test_large_results_without_heavy_fields_stay_inline() -> None:
+    result = {"score": 1.0, "notes": "x" * 4096}
+    upload = prepare_result_upload("run-1", result, inline_max_bytes=1024)
+    assert upload.stored_result is result
+    assert upload.content_encoding is None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+from prometheus_client import REGISTRY
+
+from studio_runner.spans import SpanRecorder
+from studio_runner.telemetry import observe_run, start_exporter, timed_upload
+from studio_runner.worker_pool import RunWorkerPool
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_observe_run_counts_outcomes_fallbacks_and_phases() -> None:
+    run_labels = {"backend": "sglang-jax", "mode": "benchmark"}
+    phase_labels = {**run_labels, "span": "execute"}
+    before = (
+        _sample("studio_runner_runs_total", {**run_labels, "outcome": "succeeded"}),
+        _sample("studio_runner_adapter_fallbacks_total", run_labels),
+        _sample("studio_runner_run_phase_seconds_sum", phase_labels),
+    )
+    spans = SpanRecorder()
+    spans.record("execute", 1500.0)
+
+    observe_run("sglang-jax", "benchmark", "succeeded", spans, {"adapter_error": "no entrypoint"})
+
+    assert _sample("studio_runner_runs_total", {**run_labels, "outcome": "succeeded"}) == before[0] + 1
+    assert _sample("studio_runner_adapter_fallbacks_total", run_labels) == before[1] + 1
+    assert _sample("studio_runner_run_phase_seconds_sum", phase_labels) == pytest.approx(before[2] + 1.5)
+
+
+def test_timed_upload_records_failures() -> None:
+    labels = {"artifact": "result", "outcome": "error"}
+    before = _sample("studio_runner_upload_duration_seconds_count", labels)
+
+    with pytest.raises(OSError):
+        with timed_upload("result"):
+            raise OSError("minio unreachable")
+
+    assert _sample("studio_runner_upload_duration_seconds_count", labels) == before + 1
+
+
+def test_exporter_tracks_pool_occupancy() -> None:
+    pool = RunWorkerPool(max_workers=3)
+    start_exporter(0, pool)
+
+    assert _sample("studio_runner_free_slots") == 3
+    assert _sample("studio_runner_in_flight_runs") == 0
+    pool.shutdown()
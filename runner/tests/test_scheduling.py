@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from studio_runner.main import _claim_pending_run
+from studio_runner.models import Run
+from studio_runner.scheduling import (
+    INTERACTIVE_PRIORITY,
+    build_claim_query,
+    build_fallback_claim_query,
+    claim_priority_ceiling,
+    globally_saturated_limits,
+)
+
+
+def _compile(query, params) -> str:
+    return str(query.bindparams(**params).compile(dialect=postgresql.dialect()))
+
+
+def test_claim_query_orders_by_class_then_fair_share() -> None:
+    query, params = build_claim_query()
+    sql = _compile(query, params)
+
+    assert params == {}
+    assert "priority = (SELECT min(priority) FROM runs WHERE status = 'pending')" in sql
+    assert "DISTINCT ON (submitter, backend)" in sql
+    assert "ORDER BY COALESCE(submitter_load.active, 0), COALESCE(queue_load.active, 0), heads.created_at ASC" in sql
+    assert "FOR UPDATE OF runs SKIP LOCKED" in sql
+
+
+def test_claim_query_applies_exclusions_and_priority_ceiling() -> None:
+    query, params = build_claim_query(["sglang-jax"], ["mock:score"], max_priority=INTERACTIVE_PRIORITY)
+    sql = _compile(query, params)
+
+    assert params == {"excluded_backends": ["sglang-jax"], "excluded_lanes": ["mock:score"], "max_priority": 0}
+    # Both the candidate scan and the min(priority) probe see the same filters.
+    assert sql.count("backend NOT IN (__[POSTCOMPILE_excluded_backends])") == 2
+    assert sql.count("priority <= %(max_priority)s") == 2
+
+
+def test_claim_priority_ceiling_reserves_interactive_slots() -> None:
+    assert claim_priority_ceiling(free_slots=4, max_workers=4, reserved_interactive_slots=1) is None
+    assert claim_priority_ceiling(free_slots=1, max_workers=4, reserved_interactive_slots=1) == INTERACTIVE_PRIORITY
+    assert claim_priority_ceiling(free_slots=1, max_workers=4, reserved_interactive_slots=0) is None
+    # A single-slot runner never locks out batch work.
+    assert claim_priority_ceiling(free_slots=1, max_workers=1, reserved_interactive_slots=1) is None
+
+
+def test_claim_query_matches_runner_capabilities() -> None:
+    query, params = build_claim_query(capable_lanes=["mock:score", "sglang-jax:benchmark"], device_class="tpu-v5e")
+    sql = _compile(query, params)
+
+    assert params["capable_lanes"] == ["mock:score", "sglang-jax:benchmark"]
+    assert sql.count("(backend || ':' || mode) IN (__[POSTCOMPILE_capable_lanes])") == 2
+    assert sql.count("(device_class IS NULL OR device_class = %(device_class)s)") == 2
+
+
+class _Row:
+    def __init__(self, backend: str, mode: str, running: int) -> None:
+        self.backend = backend
+        self.mode = mode
+        self.running = running
+
+
+class _Result:
+    def __init__(self, rows: list[_Row]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[_Row]:
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, rows: list[_Row]) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+
+    def execute(self, statement, params=None) -> _Result:
+        self.statements.append(str(statement))
+        return _Result(self.rows)
+
+
+def test_global_saturation_locks_before_counting_running_runs() -> None:
+    session = _FakeSession([_Row("sglang-jax", "benchmark", 2), _Row("sglang-pytorch", "score", 1)])
+
+    backends, lanes = globally_saturated_limits(
+        session, {"sglang-jax:benchmark": 2, "sglang-pytorch": 2, "sglang-pytorch:score": 1}
+    )
+
+    assert "pg_advisory_xact_lock" in session.statements[0]
+    assert backends == []
+    assert lanes == ["sglang-jax:benchmark", "sglang-pytorch:score"]
+
+
+def test_fallback_claim_query_keeps_filters_and_skips_locked_rows() -> None:
+    query, params = build_fallback_claim_query(["sglang-jax"], max_priority=INTERACTIVE_PRIORITY, device_class="cpu")
+    sql = _compile(query, params)
+
+    assert "backend NOT IN (__[POSTCOMPILE_excluded_backends])" in sql
+    assert "priority <= %(max_priority)s" in sql
+    assert "ORDER BY priority, created_at ASC" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+class _LockedHeadSession:
+    """Fair-share query finds only the queue head another claimer has locked; the next row is free."""
+
+    def __init__(self) -> None:
+        self.claims: list[str] = []
+        self.run = Run(id="run-2", backend="mock", mode="score", prompt="p", parameters={}, attempt_count=0)
+
+    def begin(self):
+        return nullcontext()
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "FOR UPDATE" in sql:
+            self.claims.append(sql)
+            row = None if "DISTINCT ON" in sql else SimpleNamespace(id="run-2", queue_wait_ms=12.5)
+            return SimpleNamespace(first=lambda: row)
+        return SimpleNamespace(scalar_one=lambda: 1)
+
+    def get(self, model, run_id):
+        return self.run if run_id == self.run.id else None
+
+
+def test_claim_falls_back_when_every_fair_share_head_is_locked() -> None:
+    session = _LockedHeadSession()
+
+    claimed = _claim_pending_run(session)
+
+    assert len(session.claims) == 2
+    assert "ORDER BY priority, created_at ASC" in session.claims[1]
+    assert claimed["id"] == "run-2"
+    assert claimed["queue_wait_ms"] == 12.5
+    assert session.run.status == "running"
@@ -21,6 +21,7 @@ def test_run_score_api_inference_normalizes_token_fields(
                 "token_ranks": [1, 1, 3],
             },
             200,
+            {"connect_ms": 4.0, "server_ms": 10.0, "transfer_ms": 0.5, "total_ms": 14.5, "connection_reused": False},
         ),
     )
 
@@ -38,6 +39,8 @@ def test_run_score_api_inference_normalizes_token_fields(
     assert out["token_count"] == 3
     assert out["token_nll"] == [0.1, 0.2, 1.2]
     assert out["token_ranks"] == [1, 1, 3]
+    assert out["latency_ms"] == 10.5
+    assert out["timing"]["connect_ms"] == 4.0
     assert "raw_artifacts" in out
 
 
@@ -57,6 +60,7 @@ def test_run_score_api_inference_derives_score_from_scores_field(
                 "token_logprobs": [-0.2, -0.4],
             },
             200,
+            {"connect_ms": 0.0, "server_ms": 8.0, "transfer_ms": 0.0, "total_ms": 8.0, "connection_reused": True},
         ),
     )
 
@@ -71,3 +75,4 @@ def test_run_score_api_inference_derives_score_from_scores_field(
 
     assert out["score"] == 1.0
     assert out["token_count"] == 2
+    assert out["item_scores"] == [0.5, 0.1]
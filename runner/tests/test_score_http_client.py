@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from studio_runner.score_http_client import AsyncKeepAliveClient, HttpClientError, KeepAliveConnectionPool
+
+
+def test_keep_alive_pool_reuses_connection_and_splits_timing(
+    score_server_url: str, score_server_connections: set
+) -> None:
+    pool = KeepAliveConnectionPool(score_server_url)
+    try:
+        status, content, first = pool.post(b'{"q": 1}', {"Content-Type": "application/json"}, timeout=5.0)
+        _, _, second = pool.post(b'{"q": 2}', {"Content-Type": "application/json"}, timeout=5.0)
+    finally:
+        pool.close()
+
+    assert status == 200
+    assert json.loads(content)["echo"] == {"q": 1}
+    assert first["connection_reused"] is False
+    assert first["connect_ms"] > 0.0
+    assert second["connection_reused"] is True
+    assert second["connect_ms"] == 0.0
+    assert len(score_server_connections) == 1
+
+
+def test_async_client_reuses_connection(score_server_url: str, score_server_connections: set) -> None:
+    async def _exercise() -> list[tuple[int, bytes, dict]]:
+        client = AsyncKeepAliveClient(score_server_url, timeout=5.0)
+        try:
+            return [await client.post(b'{"q": %d}' % idx, {"Content-Type": "application/json"}) for idx in range(3)]
+        finally:
+            await client.close()
+
+    responses = asyncio.run(_exercise())
+
+    assert [status for status, _, _ in responses] == [200, 200, 200]
+    assert json.loads(responses[2][1])["echo"] == {"q": 2}
+    assert [timing["connection_reused"] for _, _, timing in responses] == [False, True, True]
+    assert len(score_server_connections) == 1
+
+
+def _raw_response(response: bytes) -> tuple[int, bytes, dict] | Exception:
+    """POST once to a server that answers every request with ``response`` and leaves the socket open."""
+
+    async def _exercise() -> tuple[int, bytes, dict]:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(response)
+            await writer.drain()
+            if b"Connection: close" in response:
+                writer.close()
+            else:
+                await asyncio.sleep(10.0)
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncKeepAliveClient(f"http://127.0.0.1:{port}/v1/score", timeout=5.0)
+        try:
+            return await client.post(b"{}", {"Content-Type": "application/json"})
+        finally:
+            await client.close()
+            server.close()
+
+    try:
+        return asyncio.run(_exercise())
+    except Exception as exc:
+        return exc
+
+
+def test_async_client_reads_unframed_bodies_only_until_close() -> None:
+    status, content, _ = _raw_response(b'HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n{"score": 1}')
+    assert (status, content) == (200, b'{"score": 1}')
+
+    started = time.perf_counter()
+    error = _raw_response(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{"score": 1}')
+    assert isinstance(error, HttpClientError)
+    assert time.perf_counter() - started < 5.0
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from studio_runner import score_api_adapter
+from studio_runner.adapter_errors import AdapterExecutionError
+from studio_runner.score_load import (
+    _StepRecorder,
+    find_saturation_knee,
+    parse_load_config,
+    percentile,
+    run_score_load_sweep,
+)
+from studio_runner.settings import settings
+
+
+def test_parse_load_config_defaults_and_validation() -> None:
+    assert parse_load_config({}, default_timeout_s=30.0) is None
+
+    config = parse_load_config({"load": {"concurrency": 4, "duration_s": 2}}, default_timeout_s=30.0)
+    assert config is not None
+    assert config["mode"] == "closed"
+    assert config["concurrency"] == [4]
+    assert config["request_timeout_s"] == 30.0
+
+    with pytest.raises(AdapterExecutionError, match="rates_rps is required"):
+        parse_load_config({"load": {"mode": "open"}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match="concurrency must be positive"):
+        parse_load_config({"load": {"concurrency": [0]}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match=r"warmup_s must be a number >= 0.0; got 'soon'"):
+        parse_load_config({"load": {"warmup_s": "soon"}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match="warmup_s must be a number >= 0.0"):
+        parse_load_config({"load": {"warmup_s": -1}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match="knee_min_gain_pct must be a number"):
+        parse_load_config({"load": {"knee_min_gain_pct": None}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match="seed must be an integer"):
+        parse_load_config({"load": {"seed": "abc"}}, default_timeout_s=30.0)
+    with pytest.raises(AdapterExecutionError, match="seed must be an integer"):
+        parse_load_config({"load": {"seed": 1.5}}, default_timeout_s=30.0)
+
+
+def test_percentile_interpolates_between_ranks() -> None:
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 50.0) == pytest.approx(25.0)
+    assert percentile(values, 100.0) == pytest.approx(40.0)
+    assert percentile([], 95.0) == 0.0
+
+
+def test_find_saturation_knee_stops_at_flat_throughput() -> None:
+    steps = [
+        {"concurrency": 1, "achieved_rps": 50.0},
+        {"concurrency": 2, "achieved_rps": 98.0},
+        {"concurrency": 4, "achieved_rps": 150.0},
+        {"concurrency": 8, "achieved_rps": 155.0},
+    ]
+    knee = find_saturation_knee(steps, "concurrency", min_gain_pct=10.0)
+    assert knee == {"saturated": True, "knee_level": 4, "peak_level": 8, "peak_rps": 155.0}
+
+
+def test_closed_loop_sweep_records_every_request(score_server_url: str) -> None:
+    config = parse_load_config(
+        {"load": {"concurrency": [1, 2], "duration_s": 0.2}},
+        default_timeout_s=5.0,
+    )
+    sweep = run_score_load_sweep(score_server_url, {"query": "q"}, config, item_count=2)
+
+    assert [step["concurrency"] for step in sweep["steps"]] == [1, 2]
+    for step, samples in zip(sweep["steps"], sweep["latency_samples_ms"]):
+        assert step["succeeded"] == len(samples) > 0
+        assert step["errors"] == 0
+        assert step["throughput_items_per_s"] == pytest.approx(step["achieved_rps"] * 2, rel=1e-3)
+        assert step["latency_p50_ms"] <= step["latency_p99_ms"]
+
+
+def test_open_loop_sweep_runs_poisson_arrivals(score_server_url: str) -> None:
+    config = parse_load_config(
+        {"load": {"mode": "open", "rates_rps": [50], "duration_s": 0.3, "seed": 7}},
+        default_timeout_s=5.0,
+    )
+    sweep = run_score_load_sweep(score_server_url, {"query": "q"}, config, item_count=1)
+
+    step = sweep["steps"][0]
+    assert step["rate_rps"] == 50.0
+    assert step["succeeded"] > 0
+    assert sweep["level_key"] == "rate_rps"
+
+
+def test_run_score_api_inference_load_mode_reports_distribution(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(settings, "local_artifacts_root", str(tmp_path))
+    monkeypatch.setattr(score_api_adapter, "_score_api_url", lambda backend: "http://example/v1/score")
+    monkeypatch.setattr(
+        score_api_adapter,
+        "_post_json",
+        lambda url, payload: (
+            {"score": 0.4, "tokens": ["A"], "token_logprobs": [-0.1]},
+            200,
+            {"connect_ms": 1.0, "server_ms": 5.0, "transfer_ms": 0.0, "total_ms": 6.0, "connection_reused": False},
+        ),
+    )
+    monkeypatch.setattr(
+        score_api_adapter,
+        "run_score_load_sweep",
+        lambda url, payload, config, item_count: {
+            "config": config,
+            "level_key": "concurrency",
+            "steps": [
+                {"concurrency": 1, "succeeded": 3, "achieved_rps": 10.0, "throughput_items_per_s": 10.0,
+                 "latency_p50_ms": 4.0, "latency_p95_ms": 6.0, "latency_p99_ms": 7.0},
+                {"concurrency": 2, "succeeded": 5, "achieved_rps": 18.0, "throughput_items_per_s": 18.0,
+                 "latency_p50_ms": 5.0, "latency_p95_ms": 8.0, "latency_p99_ms": 9.0},
+            ],
+            "saturation": {"saturated": False, "knee_level": 2, "peak_level": 2, "peak_rps": 18.0},
+            "latency_samples_ms": [[4.0, 4.0, 7.0], [5.0, 5.0, 5.0, 8.0, 9.0]],
+        },
+    )
+
+    out = score_api_adapter.run_score_api_inference(
+        run_id="run-load",
+        backend="sglang-jax",
+        prompt="prompt",
+        score_input={"query": "Q", "items": ["A"]},
+        mask_config=None,
+        tolerance=None,
+        parameters={"load": {"concurrency": [1, 2], "duration_s": 1}},
+    )
+
+    assert out["probe_latency_ms"] == 5.0
+    assert out["latency_ms"] == 4.0
+    assert out["latency_p95_ms"] == 6.0
+    assert out["throughput_items_per_s"] == 18.0
+    assert out["latency_samples_ms"] == [4.0, 4.0, 7.0]
+    assert out["load"]["saturation"]["peak_rps"] == 18.0
+    assert "load_path" in out["raw_artifacts"]
+
+
+def test_step_latency_excludes_connection_setup() -> None:
+    class _Client:
+        def __init__(self) -> None:
+            self.reused = False
+
+        async def post(self, body: bytes, headers: dict) -> tuple[int, bytes, dict]:
+            # 40 ms in total, of which 30 ms was the (new) connection's setup.
+            await asyncio.sleep(0.04)
+            timing = {"connect_ms": 0.0 if self.reused else 30.0, "connection_reused": self.reused}
+            self.reused = True
+            return 200, b"{}", timing
+
+    recorder = _StepRecorder(record_after=time.perf_counter())
+    client = _Client()
+
+    async def _issue_twice() -> None:
+        await recorder.issue(client, b"{}")
+        await recorder.issue(client, b"{}")
+
+    asyncio.run(_issue_twice())
+
+    assert recorder.connect_ms == [30.0]
+    first, second = recorder.latencies_ms
+    assert first < 30.0
+    assert second >= 40.0
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from studio_runner.pytorch_bench_adapter import run_sglang_pytorch_benchmark
+from studio_runner.settings import settings
+from studio_runner.spans import SpanRecorder, recording_spans, span
+
+
+def test_nested_spans_record_self_time() -> None:
+    spans = SpanRecorder()
+    spans.record("queue_wait", 100.0)
+    started = time.perf_counter()
+    with spans.span("execute"):
+        time.sleep(0.02)
+        with spans.span("parse"):
+            time.sleep(0.02)
+    wall_ms = (time.perf_counter() - started) * 1000.0
+
+    assert spans.spans_ms["parse"] >= 20.0
+    assert spans.spans_ms["execute"] >= 20.0
+    assert spans.spans_ms["execute"] + spans.spans_ms["parse"] <= wall_ms
+    timing = spans.as_json(attempt=1)
+    assert timing["total_ms"] == pytest.approx(sum(timing["spans_ms"].values()), abs=0.01)
+    assert timing["overhead_ms"] == timing["spans_ms"]["parse"]
+    assert timing["attempt"] == 1
+
+
+def test_span_is_a_no_op_without_a_recorder() -> None:
+    with span("execute"):
+        pass
+
+    spans = SpanRecorder()
+    with recording_spans(spans):
+        with span("upload"):
+            pass
+    with span("upload"):
+        pass
+    assert list(spans.spans_ms) == ["upload"]
+
+
+def test_bench_adapter_reports_its_phases(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text(
+        "print('Achieved RPS: 100.0')\nprint('Item count: 2')\nprint('P50 response time: 12.5 ms')\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(settings, "sglang_pytorch_root", str(tmp_path))
+    monkeypatch.setattr(settings, "sglang_pytorch_bench_entrypoint", str(script))
+    monkeypatch.setattr(settings, "sglang_pytorch_python_executable", sys.executable)
+    monkeypatch.setattr(settings, "local_artifacts_root", str(tmp_path / "artifacts"))
+
+    spans = SpanRecorder()
+    with recording_spans(spans), spans.span("execute"):
+        run_sglang_pytorch_benchmark(run_id="run-spans", prompt="hello", parameters={})
+
+    assert {"adapter_setup", "execute", "parse", "artifact_io"} <= set(spans.spans_ms)
+    assert spans.spans_ms["execute"] > spans.spans_ms["parse"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import struct
+from array import array
+
+import pytest
+from minio.error import S3Error
+
+from studio_runner.main import _upload_token_columns
+from studio_runner.token_columns import TOKEN_COLUMNS_MAGIC, TokenColumnsEncodeError, encode_token_columns
+
+
+class _FakeMinio:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, bucket: str, key: str, data, length: int, **kwargs) -> None:
+        if self.error is not None:
+            raise self.error
+        self.objects[key] = data.read()
+
+
+def _parse(data: bytes) -> tuple[dict, bytes]:
+    assert data.startswith(TOKEN_COLUMNS_MAGIC)
+    (header_length,) = struct.unpack_from("<Q", data, len(TOKEN_COLUMNS_MAGIC))
+    start = len(TOKEN_COLUMNS_MAGIC) + 8
+    header = json.loads(data[start : start + header_length].rstrip(b"\x00"))
+    return header, data[start + header_length :]
+
+
+def test_encode_token_columns_writes_typed_aligned_buffers() -> None:
+    data = encode_token_columns(
+        {
+            "score": -0.3,
+            "tokens": ["▁Paris", "é", ""],
+            "token_logprobs": [-0.1, -0.2, -0.000001],
+            "token_ranks": [1, 3, 2],
+        }
+    )
+    assert data is not None
+    header, body = _parse(data)
+
+    assert header["version"] == 1
+    assert header["row_count"] == 3
+    columns = {column["name"]: column for column in header["columns"]}
+    assert set(columns) == {"tokens", "token_logprobs", "token_ranks"}
+    assert all(offset % 8 == 0 for column in header["columns"] for offset, _ in column["buffers"])
+
+    (offsets_span, bytes_span) = columns["tokens"]["buffers"]
+    offsets = array("i", body[offsets_span[0] : offsets_span[0] + offsets_span[1]]).tolist()
+    raw = body[bytes_span[0] : bytes_span[0] + bytes_span[1]]
+    assert [raw[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])] == ["▁Paris", "é", ""]
+
+    (span,) = columns["token_logprobs"]["buffers"]
+    assert columns["token_logprobs"]["dtype"] == "<f8"
+    assert array("d", body[span[0] : span[0] + span[1]]).tolist() == [-0.1, -0.2, -0.000001]
+    (span,) = columns["token_ranks"]["buffers"]
+    assert array("i", body[span[0] : span[0] + span[1]]).tolist() == [1, 3, 2]
+
+
+def test_encode_token_columns_skips_results_without_token_data() -> None:
+    assert encode_token_columns({"score": 1.0, "latency_ms": 2.0}) is None
+    assert encode_token_columns({"tokens": [], "token_logprobs": []}) is None
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        {"token_ranks": [1, 2.0]},
+        {"token_ranks": [1, None]},
+        {"token_ranks": [2**31]},
+        {"token_logprobs": [-0.1, None]},
+        {"token_nll": ["0.3"]},
+    ],
+)
+def test_encode_token_columns_rejects_values_the_column_cannot_hold(result: dict) -> None:
+    with pytest.raises(TokenColumnsEncodeError):
+        encode_token_columns(result)
+
+
+def test_uploaded_token_columns_replace_the_json_arrays() -> None:
+    client = _FakeMinio()
+    result = {"score": -0.3, "tokens": ["a", "b"], "token_logprobs": [-0.1, -0.2], "token_nll": []}
+
+    stored = _upload_token_columns(client, "run-1", result)
+
+    assert list(client.objects) == ["runs/run-1/tokens.stcol"]
+    assert stored["token_artifact"]["fields"] == ["tokens", "token_logprobs"]
+    assert stored["token_artifact"]["size_bytes"] == len(client.objects["runs/run-1/tokens.stcol"])
+    assert "tokens" not in stored and "token_logprobs" not in stored
+    assert stored["score"] == -0.3
+    assert stored["token_nll"] == []
+
+
+def test_token_columns_failures_keep_the_result_unchanged() -> None:
+    malformed = {"score": -0.3, "tokens": ["a"], "token_ranks": [None]}
+    assert _upload_token_columns(_FakeMinio(), "run-1", malformed) is malformed
+
+    result = {"score": -0.3, "tokens": ["a"], "token_logprobs": [-0.1]}
+    unreachable = _FakeMinio(S3Error("SlowDown", "busy", "r", "req", "host", None))
+    assert _upload_token_columns(unreachable, "run-1", result) is result
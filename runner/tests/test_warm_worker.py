@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from studio_runner.adapter_errors import RunCanceledError
+from studio_runner.bench_process import IncrementalMetricParser
+from studio_runner.cancellation import cancellable_run
+from studio_runner.pytorch_bench_adapter import run_sglang_pytorch_benchmark
+from studio_runner.settings import settings
+from studio_runner.warm_worker import run_bench_pass, warm_argv, warm_workers
+
+
+@pytest.fixture
+def warm_mode(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "bench_warm_worker_enabled", True)
+    monkeypatch.setattr(settings, "bench_warm_worker_startup_timeout_seconds", 30.0)
+    yield
+    warm_workers.shutdown()
+
+
+def test_warm_argv_only_accepts_python_invocations() -> None:
+    assert warm_argv(["python3", "bench.py", "--n", "2"]) == ["bench.py", "--n", "2"]
+    assert warm_argv(["/usr/bin/python", "-m", "unittest", "-v", "test_x"]) == ["-m", "unittest", "-v", "test_x"]
+    assert warm_argv(["python", "-c", "print(1)"]) is None
+    assert warm_argv(["bash", "bench.sh"]) is None
+
+
+def test_warm_worker_keeps_module_state_between_passes(warm_mode, tmp_path: Path) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text(
+        "import sys\n"
+        "sys.warm_hits = getattr(sys, 'warm_hits', 0) + 1\n"
+        "print(f'Achieved RPS: {sys.warm_hits}.0')\n",
+        encoding="utf-8",
+    )
+    command = [sys.executable, str(script)]
+
+    def _pass(index: int, config: dict) -> tuple[float, dict]:
+        parser = IncrementalMetricParser({"throughput_rps": r"Achieved RPS:\s*([0-9.]+)"})
+        outcome = run_bench_pass(
+            "run-warm",
+            "sglang-pytorch",
+            command,
+            cwd=str(tmp_path),
+            env={"PATH": "/usr/bin:/bin"},
+            stdout_path=tmp_path / f"out.{index}.log",
+            stderr_path=tmp_path / f"err.{index}.log",
+            timeout_seconds=30.0,
+            parser=parser,
+            config=config,
+        )
+        assert outcome.returncode == 0
+        return parser.values["throughput_rps"], outcome.worker
+
+    first_rps, first = _pass(0, {"model": "a"})
+    second_rps, second = _pass(1, {"model": "a"})
+    third_rps, third = _pass(2, {"model": "b"})
+
+    assert (first["cold_start"], second["cold_start"], third["cold_start"]) == (True, False, True)
+    assert first["startup_ms"] > 0 and second["startup_ms"] is None
+    assert (first_rps, second_rps, third_rps) == (1.0, 2.0, 1.0)
+
+
+def test_failed_pass_recycles_the_worker(warm_mode, tmp_path: Path) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text("raise SystemExit(3)\n", encoding="utf-8")
+
+    def _pass(index: int):
+        return run_bench_pass(
+            "run-fail",
+            "sglang-jax",
+            [sys.executable, str(script)],
+            cwd=str(tmp_path),
+            env={},
+            stdout_path=tmp_path / f"out.{index}.log",
+            stderr_path=tmp_path / f"err.{index}.log",
+            timeout_seconds=30.0,
+            parser=IncrementalMetricParser({}),
+        )
+
+    assert _pass(0).returncode == 3
+    assert _pass(1).worker["cold_start"] is True
+
+
+def _warm_pass(tmp_path: Path, command: list[str], cwd: Path, index: int, run_id: str = "run-warm"):
+    parser = IncrementalMetricParser({"throughput_rps": r"Achieved RPS:\s*([0-9.]+)"})
+    outcome = run_bench_pass(
+        run_id,
+        "sglang-jax",
+        command,
+        cwd=str(cwd),
+        env={"PATH": "/usr/bin:/bin"},
+        stdout_path=tmp_path / f"out.{index}.log",
+        stderr_path=tmp_path / f"err.{index}.log",
+        timeout_seconds=30.0,
+        parser=parser,
+    )
+    return outcome, parser.values
+
+
+def test_warm_worker_imports_like_a_fresh_interpreter(warm_mode, tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    # A repo-local "test" package must win over the stdlib one, as it does for `python -m unittest`.
+    package = repo / "test" / "srt"
+    package.mkdir(parents=True)
+    (repo / "test" / "__init__.py").write_text("", encoding="utf-8")
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "bench_utils.py").write_text("RPS = 42.0\n", encoding="utf-8")
+    (package / "test_bench_x.py").write_text(
+        "import unittest\n"
+        "from test.srt.bench_utils import RPS\n"
+        "import settings\n"
+        "\n"
+        "class BenchTest(unittest.TestCase):\n"
+        "    def test_bench(self):\n"
+        "        print(f'Achieved RPS: {RPS + settings.BONUS}', flush=True)\n",
+        encoding="utf-8",
+    )
+    # Would be shadowed by studio_runner/settings.py if the host's own directory stayed on sys.path.
+    (repo / "settings.py").write_text("BONUS = 1.0\n", encoding="utf-8")
+
+    outcome, values = _warm_pass(tmp_path, [sys.executable, "-m", "unittest", "test.srt.test_bench_x"], repo, 0)
+    assert outcome.returncode == 0, (tmp_path / "err.0.log").read_text(encoding="utf-8")
+    assert values["throughput_rps"] == 43.0
+
+    # A script run from another cwd still finds its sibling modules.
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    (scripts / "helper.py").write_text("RPS = 7.0\n", encoding="utf-8")
+    (scripts / "bench.py").write_text("from helper import RPS\nprint(f'Achieved RPS: {RPS}')\n", encoding="utf-8")
+    outcome, values = _warm_pass(tmp_path, [sys.executable, str(scripts / "bench.py")], repo, 1)
+    assert outcome.returncode == 0, (tmp_path / "err.1.log").read_text(encoding="utf-8")
+    assert values["throughput_rps"] == 7.0
+
+
+def test_cancel_before_execute_raises_run_canceled(warm_mode, tmp_path: Path) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text("print('Achieved RPS: 1.0')\n", encoding="utf-8")
+    command = [sys.executable, str(script)]
+
+    with cancellable_run("run-canceled") as token:
+        token.cancel()
+        with pytest.raises(RunCanceledError):
+            _warm_pass(tmp_path, command, tmp_path, 0, run_id="run-canceled")
+
+    outcome, _ = _warm_pass(tmp_path, command, tmp_path, 1)
+    assert outcome.returncode == 0
+    assert outcome.worker["cold_start"] is True
+
+
+def test_pytorch_adapter_reports_warm_startup_separately(
+    warm_mode, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    script = tmp_path / "bench.py"
+    script.write_text(
+        "print('Achieved RPS: 100.0')\nprint('Item count: 2')\nprint('P50 response time: 12.5 ms')\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(settings, "sglang_pytorch_root", str(tmp_path))
+    monkeypatch.setattr(settings, "sglang_pytorch_bench_entrypoint", str(script))
+    monkeypatch.setattr(settings, "sglang_pytorch_python_executable", sys.executable)
+    monkeypatch.setattr(settings, "local_artifacts_root", str(tmp_path / "artifacts"))
+
+    result = run_sglang_pytorch_benchmark(
+        run_id="run-warm-adapter",
+        prompt="hello",
+        parameters={"repeat": {"warmup_iterations": 1, "min_iterations": 3, "max_iterations": 3}},
+    )
+
+    assert result["latency_ms"] == pytest.approx(12.5)
+    assert result["bench_worker"]["mode"] == "warm"
+    assert result["bench_worker"]["cold_starts"] == 1
+    assert result["bench_worker"]["measured_cold_start"] is False
+    assert result["bench_worker"]["startup_ms"] > 0
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from studio_runner.worker_pool import RunWorkerPool
+
+
+def test_worker_pool_tracks_backend_and_lane_saturation() -> None:
+    release = threading.Event()
+    pool = RunWorkerPool(
+        max_workers=3,
+        backend_limits={"sglang-pytorch": 1, "sglang-jax:benchmark": 1},
+    )
+    try:
+        pool.submit("run-1", "sglang-jax", "benchmark", release.wait)
+        pool.submit("run-2", "sglang-pytorch", "score", release.wait)
+
+        backends, lanes = pool.saturated_limits()
+        assert backends == ["sglang-pytorch"]
+        assert lanes == ["sglang-jax:benchmark"]
+        assert pool.free_slots() == 1
+        assert sorted(pool.in_flight_run_ids()) == ["run-1", "run-2"]
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
+
+    assert pool.free_slots() == 3
+    assert pool.saturated_limits() == ([], [])
+
+
+def test_worker_pool_rejects_submit_when_full() -> None:
+    release = threading.Event()
+    pool = RunWorkerPool(max_workers=1)
+    try:
+        pool.submit("run-1", "mock", "benchmark", release.wait)
+        with pytest.raises(RuntimeError, match="no free slots"):
+            pool.submit("run-2", "mock", "benchmark", release.wait)
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
+
+
+def test_worker_pool_wakes_waiter_when_run_finishes() -> None:
+    pool = RunWorkerPool(max_workers=1)
+    try:
+        future = pool.submit("run-1", "mock", "score", lambda: None)
+        future.result(timeout=5)
+        assert pool.wait(timeout=5) is True
+        assert pool.free_slots() == 1
+    finally:
+        pool.shutdown(wait=True)
@@ -0,0 +1,176 @@
+"""Micro-benchmark: vectorized token compare vs. the original per-token Python loop.
+
+Usage: PYTHONPATH=api/src python3 scripts/bench_token_diff.py [--sizes 1000 32000 256000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from studio_api.metrics import _as_float_list, _as_int_list, _build_token_diff
+
+
+# Reference implementation kept verbatim from the pre-NumPy metrics module.
+def scalar_token_diff(
+    left: dict[str, Any],
+    right: dict[str, Any],
+    abs_epsilon: float,
+    rel_epsilon: float,
+) -> dict[str, Any]:
+    left_tokens = left.get("tokens") if isinstance(left.get("tokens"), list) else []
+    right_tokens = right.get("tokens") if isinstance(right.get("tokens"), list) else []
+    left_logprobs = _as_float_list(left.get("token_logprobs"))
+    right_logprobs = _as_float_list(right.get("token_logprobs"))
+
+    pair_count = min(len(left_logprobs), len(right_logprobs))
+    token_diffs: list[dict[str, Any]] = []
+    mismatch_count = 0
+    first_divergence_index: int | None = None
+    max_abs_diff = 0.0
+    sum_abs_diff = 0.0
+
+    for idx in range(pair_count):
+        left_lp = left_logprobs[idx]
+        right_lp = right_logprobs[idx]
+        abs_diff = abs(left_lp - right_lp)
+        denom = abs(right_lp) if abs(right_lp) > 1e-12 else 1.0
+        rel_diff = abs_diff / denom
+
+        is_match = abs_diff <= abs_epsilon or (rel_epsilon > 0.0 and rel_diff <= rel_epsilon)
+        if not is_match:
+            mismatch_count += 1
+            if first_divergence_index is None:
+                first_divergence_index = idx
+
+        max_abs_diff = max(max_abs_diff, abs_diff)
+        sum_abs_diff += abs_diff
+
+        token_value = (
+            str(left_tokens[idx])
+            if idx < len(left_tokens)
+            else (str(right_tokens[idx]) if idx < len(right_tokens) else f"tok_{idx}")
+        )
+        token_diffs.append(
+            {
+                "index": idx,
+                "token": token_value,
+                "left_logprob": left_lp,
+                "right_logprob": right_lp,
+                "abs_diff": abs_diff,
+                "rel_diff": rel_diff,
+                "is_match": is_match,
+            }
+        )
+
+    mean_abs_diff = (sum_abs_diff / pair_count) if pair_count > 0 else 0.0
+    left_nll = _as_float_list(left.get("token_nll"))
+    right_nll = _as_float_list(right.get("token_nll"))
+    nll_pair_count = min(len(left_nll), len(right_nll))
+    if nll_pair_count > 0:
+        nll_abs_diffs = [abs(left_nll[idx] - right_nll[idx]) for idx in range(nll_pair_count)]
+        token_loss_diff_summary = {
+            "pair_count": nll_pair_count,
+            "max_abs_nll_diff": max(nll_abs_diffs),
+            "mean_abs_nll_diff": sum(nll_abs_diffs) / nll_pair_count,
+        }
+    else:
+        token_loss_diff_summary = {
+            "pair_count": 0,
+            "max_abs_nll_diff": 0.0,
+            "mean_abs_nll_diff": 0.0,
+        }
+
+    left_ranks = _as_int_list(left.get("token_ranks"))
+    right_ranks = _as_int_list(right.get("token_ranks"))
+    rank_pair_count = min(len(left_ranks), len(right_ranks))
+    if rank_pair_count > 0:
+        rank_deltas = [left_ranks[idx] - right_ranks[idx] for idx in range(rank_pair_count)]
+        worst_rank_drop = max(rank_deltas)
+        mean_abs_rank_delta = sum(abs(delta) for delta in rank_deltas) / rank_pair_count
+        mrr_left = sum(1.0 / max(rank, 1) for rank in left_ranks[:rank_pair_count]) / rank_pair_count
+        mrr_right = sum(1.0 / max(rank, 1) for rank in right_ranks[:rank_pair_count]) / rank_pair_count
+    else:
+        worst_rank_drop = 0.0
+        mean_abs_rank_delta = 0.0
+        mrr_left = 0.0
+        mrr_right = 0.0
+
+    rank_delta_summary = {
+        "pair_count": float(rank_pair_count),
+        "worst_rank_drop": float(worst_rank_drop),
+        "mean_abs_rank_delta": float(mean_abs_rank_delta),
+        "mrr_left": float(mrr_left),
+        "mrr_right": float(mrr_right),
+        "mrr_delta": float(mrr_left - mrr_right),
+    }
+
+    return {
+        "token_data_available": pair_count > 0,
+        "token_pair_count": pair_count,
+        "token_mismatch_count": mismatch_count,
+        "first_divergence_index": first_divergence_index,
+        "max_token_abs_diff": max_abs_diff,
+        "mean_token_abs_diff": mean_abs_diff,
+        "token_diffs": token_diffs,
+        "token_loss_diff_summary": token_loss_diff_summary,
+        "rank_delta_summary": rank_delta_summary,
+    }
+
+
+def _make_payload(size: int, seed: int, drift: float) -> dict[str, Any]:
+    rng = random.Random(seed)
+    logprobs = [round(-rng.random() * 4.0 - drift * rng.random(), 6) for _ in range(size)]
+    return {
+        "tokens": [f"t{idx}" for idx in range(size)],
+        "token_logprobs": logprobs,
+        "token_nll": [-value for value in logprobs],
+        "token_ranks": [1 + rng.randrange(8) for _ in range(size)],
+    }
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 32_000, 256_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'tokens':>8}  {'scalar_ms':>10}  {'vector_ms':>10}  {'speedup':>8}"
+        f"  {'stats_only_ms':>13}  {'speedup':>8}"
+    )
+    for size in args.sizes:
+        left = _make_payload(size, seed=1, drift=0.0)
+        right = _make_payload(size, seed=1, drift=1e-3)
+        right["token_logprobs"][size // 2] += 0.5
+
+        scalar = scalar_token_diff(left, right, 1e-6, 0.0)
+        vector = _build_token_diff(left, right, 1e-6, 0.0)
+        for key in ("token_pair_count", "token_mismatch_count", "first_divergence_index"):
+            assert scalar[key] == vector[key], key
+        assert abs(scalar["mean_token_abs_diff"] - vector["mean_token_abs_diff"]) < 1e-9
+
+        scalar_s = _best_of(lambda: scalar_token_diff(left, right, 1e-6, 0.0), args.repeats)
+        vector_s = _best_of(lambda: _build_token_diff(left, right, 1e-6, 0.0), args.repeats)
+        stats_s = _best_of(
+            lambda: _build_token_diff(left, right, 1e-6, 0.0, token_window={"limit": 0}),
+            args.repeats,
+        )
+        print(
+            f"{size:>8}  {scalar_s * 1000:>10.2f}  {vector_s * 1000:>10.2f}  {scalar_s / vector_s:>7.1f}x"
+            f"  {stats_s * 1000:>13.2f}  {scalar_s / stats_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
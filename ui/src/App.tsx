@@ -1,11 +1,34 @@
 import { useEffect, useMemo, useState } from "react";
-import { compareRuns, createRun, listRuns, type RunCreatePayload } from "./api";
-import type { CompareResponse, Run } from "./types";
+import { cancelRun, compareRuns, createRun, listRuns, subscribeRunEvents, type RunCreatePayload } from "./api";
+import type { CompareResponse, RunEvent, RunSummary } from "./types";
+
+const RUN_HISTORY_LIMIT = 100;
+// Used only while the run event stream is not connected.
+const RUN_POLL_FALLBACK_MS = 2000;
+const TOKEN_DIFF_ROWS = 80;
 
 function shortId(id: string): string {
   return id.slice(0, 8);
 }
 
+type RunProgress = {
+  metrics?: Record<string, number>;
+  elapsed_s?: number;
+  last_output_age_s?: number;
+  stalled?: boolean;
+};
+
+function formatThroughput(run: RunSummary, progress: RunProgress | undefined): string {
+  if (run.throughput_items_per_s !== null) {
+    return run.throughput_items_per_s.toFixed(3);
+  }
+  const live = progress?.metrics?.throughput_items_per_s;
+  if (run.status === "running" && live !== undefined) {
+    return `~${live.toFixed(3)}${progress?.stalled ? " (stalled)" : ""}`;
+  }
+  return run.status === "running" && progress?.stalled ? "stalled" : "-";
+}
+
 export function App() {
   const [prompt, setPrompt] = useState("Rate this answer quality from 0-1: Paris is the capital of France.");
   const [runMode, setRunMode] = useState<"benchmark" | "score">("benchmark");
@@ -20,7 +43,8 @@ export function App() {
   const [customMaskJson, setCustomMaskJson] = useState("[[1,1],[0,1]]");
   const [absEpsilon, setAbsEpsilon] = useState("0.000001");
   const [relEpsilon, setRelEpsilon] = useState("0.0");
-  const [runs, setRuns] = useState<Run[]>([]);
+  const [runs, setRuns] = useState<RunSummary[]>([]);
+  const [progressByRun, setProgressByRun] = useState<Record<string, RunProgress>>({});
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
@@ -30,19 +54,63 @@ export function App() {
 
   async function refreshRuns() {
     try {
-      const data = await listRuns(100);
-      setRuns(data);
+      const page = await listRuns(RUN_HISTORY_LIMIT);
+      setRuns(page.items);
     } catch (err) {
       setError((err as Error).message);
     }
   }
 
+  function applyRunEvent(event: RunEvent) {
+    if (event.event_type === "progress") {
+      setProgressByRun((current) => ({ ...current, [event.run_id]: event.payload as RunProgress }));
+    }
+    const summary = event.run;
+    if (!summary) {
+      return;
+    }
+    setRuns((current) => {
+      const index = current.findIndex((run) => run.id === summary.id);
+      if (index === -1) {
+        // Only brand-new runs belong at the top; updates to runs outside the page are ignored.
+        return event.event_type === "created" ? [summary, ...current].slice(0, RUN_HISTORY_LIMIT) : current;
+      }
+      const next = current.slice();
+      next[index] = summary;
+      return next;
+    });
+  }
+
   useEffect(() => {
+    let pollTimer: number | undefined;
+    function startPolling() {
+      if (pollTimer === undefined) {
+        pollTimer = window.setInterval(() => void refreshRuns(), RUN_POLL_FALLBACK_MS);
+      }
+    }
+    function stopPolling() {
+      if (pollTimer !== undefined) {
+        window.clearInterval(pollTimer);
+        pollTimer = undefined;
+      }
+    }
+
+    // Load immediately and poll until the stream is open, in case it is blocked, buffered or slow.
     void refreshRuns();
-    const timer = window.setInterval(() => {
-      void refreshRuns();
-    }, 2000);
-    return () => window.clearInterval(timer);
+    startPolling();
+    const unsubscribe = subscribeRunEvents(
+      applyRunEvent,
+      () => {
+        // Every (re)connect reloads the first page, covering anything missed while disconnected.
+        stopPolling();
+        void refreshRuns();
+      },
+      startPolling
+    );
+    return () => {
+      stopPolling();
+      unsubscribe();
+    };
   }, []);
 
   const scoreItems = useMemo(() => {
@@ -123,6 +191,9 @@ export function App() {
       }
 
       const run = await createRun(payload);
+      if (run.warnings.length > 0) {
+        setError(run.warnings.join(" "));
+      }
       await refreshRuns();
       if (run.backend === "sglang-jax") {
         setLeftRunId(run.id);
@@ -137,11 +208,22 @@ export function App() {
     }
   }
 
+  async function onCancelRun(runId: string) {
+    setError(null);
+    try {
+      await cancelRun(runId);
+    } catch (err) {
+      setError((err as Error).message);
+    }
+  }
+
   async function onCompare() {
     setLoading(true);
     setError(null);
     try {
-      const result = await compareRuns(leftRunId, rightRunId);
+      const result = await compareRuns(leftRunId, rightRunId, {
+        token_window: { mode: "first_divergence", limit: TOKEN_DIFF_ROWS }
+      });
       setCompareResult(result);
     } catch (err) {
       setError((err as Error).message);
@@ -347,7 +429,7 @@ export function App() {
                       </tr>
                     </thead>
                     <tbody>
-                      {compareResult.token_diffs.slice(0, 80).map((row) => (
+                      {compareResult.token_diffs.map((row) => (
                         <tr key={row.index} className={row.is_match ? "" : "mismatch-row"}>
                           <td>{row.index}</td>
                           <td>{row.token}</td>
@@ -385,29 +467,29 @@ export function App() {
                   <th>Score</th>
                   <th>Latency (ms)</th>
                   <th>Throughput</th>
+                  <th />
                 </tr>
               </thead>
               <tbody>
-                {runs.map((run) => {
-                  const result = run.result_json ?? {};
-                  return (
-                    <tr key={run.id}>
-                      <td title={run.id}>{shortId(run.id)}</td>
-                      <td>{run.backend}</td>
-                      <td>{run.mode}</td>
-                      <td>
-                        <span className={`status ${run.status}`}>{run.status}</span>
-                      </td>
-                      <td>{typeof result.score === "number" ? result.score.toFixed(6) : "-"}</td>
-                      <td>{typeof result.latency_ms === "number" ? result.latency_ms.toFixed(3) : "-"}</td>
-                      <td>
-                        {typeof result.throughput_items_per_s === "number"
-                          ? result.throughput_items_per_s.toFixed(3)
-                          : "-"}
-                      </td>
-                    </tr>
-                  );
-                })}
+                {runs.map((run) => (
+                  <tr key={run.id}>
+                    <td title={run.id}>{shortId(run.id)}</td>
+                    <td>{run.backend}</td>
+                    <td>{run.mode}</td>
+                    <td>
+                      <span className={`status ${run.status}`}>{run.status}</span>
+                      {run.cached_from_run_id ? <span title={run.cached_from_run_id}> cached</span> : null}
+                    </td>
+                    <td>{run.score !== null ? run.score.toFixed(6) : "-"}</td>
+                    <td>{run.latency_ms !== null ? run.latency_ms.toFixed(3) : "-"}</td>
+                    <td>{formatThroughput(run, progressByRun[run.id])}</td>
+                    <td>
+                      {run.status === "pending" || run.status === "running" ? (
+                        <button className="ghost" onClick={() => void onCancelRun(run.id)}>Cancel</button>
+                      ) : null}
+                    </td>
+                  </tr>
+                ))}
               </tbody>
             </table>
           </div>
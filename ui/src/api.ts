@@ -1,4 +1,11 @@
-import type { CompareResponse, Run } from "./types";
+import type {
+  CompareResponse,
+  PriorityClass,
+  Run,
+  RunEvent,
+  RunPage,
+  TokenDiffWindow
+} from "./types";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL ?? "http://localhost:8000";
 
@@ -24,6 +31,20 @@ export type RunCreatePayload = {
     abs_epsilon: number;
     rel_epsilon: number;
   };
+  repro_metadata?: {
+    backend_commit_sha?: string;
+    model_revision?: string;
+    tokenizer_revision?: string;
+    config_hash?: string;
+    branch?: string;
+    pr_label?: string;
+    extra?: Record<string, unknown>;
+  };
+  reuse_cached_result?: boolean;
+  idempotency_key?: string;
+  priority?: PriorityClass;
+  submitter?: string;
+  device_class?: string;
 };
 
 async function parseJson<T>(res: Response): Promise<T> {
@@ -43,16 +64,74 @@ export async function createRun(payload: RunCreatePayload): Promise<Run> {
   return parseJson<Run>(res);
 }
 
-export async function listRuns(limit = 50): Promise<Run[]> {
-  const res = await fetch(`${API_BASE_URL}/api/v1/runs?limit=${limit}`);
-  return parseJson<Run[]>(res);
+export type RunListFilters = {
+  backend?: string;
+  mode?: string;
+  status?: string;
+  score_input_hash?: string;
+  mask_hash?: string;
+  suite_id?: string;
+  priority?: PriorityClass;
+  submitter?: string;
+};
+
+export async function listRuns(limit = 50, cursor?: string, filters: RunListFilters = {}): Promise<RunPage> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  for (const [key, value] of Object.entries(filters)) {
+    if (value) {
+      params.set(key, value);
+    }
+  }
+  const res = await fetch(`${API_BASE_URL}/api/v1/runs?${params.toString()}`);
+  return parseJson<RunPage>(res);
+}
+
+export async function getRun(runId: string): Promise<Run> {
+  const res = await fetch(`${API_BASE_URL}/api/v1/runs/${runId}`);
+  return parseJson<Run>(res);
+}
+
+export async function cancelRun(runId: string): Promise<Run> {
+  const res = await fetch(`${API_BASE_URL}/api/v1/runs/${runId}/cancel`, { method: "POST" });
+  return parseJson<Run>(res);
 }
 
-export async function compareRuns(leftRunId: string, rightRunId: string): Promise<CompareResponse> {
+export function subscribeRunEvents(
+  onEvent: (event: RunEvent) => void,
+  onOpen?: () => void,
+  onError?: () => void
+): () => void {
+  // EventSource reconnects on its own and resends Last-Event-ID so the server resumes after it.
+  const source = new EventSource(`${API_BASE_URL}/api/v1/run-events`);
+  source.addEventListener("run", (message) => {
+    onEvent(JSON.parse((message as MessageEvent<string>).data) as RunEvent);
+  });
+  if (onOpen) {
+    source.onopen = onOpen;
+  }
+  if (onError) {
+    source.onerror = onError;
+  }
+  return () => source.close();
+}
+
+export type CompareOptions = {
+  tolerance?: RunCreatePayload["tolerance"];
+  token_window?: Partial<TokenDiffWindow>;
+};
+
+export async function compareRuns(
+  leftRunId: string,
+  rightRunId: string,
+  options: CompareOptions = {}
+): Promise<CompareResponse> {
   const res = await fetch(`${API_BASE_URL}/api/v1/compares`, {
     method: "POST",
     headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ left_run_id: leftRunId, right_run_id: rightRunId })
+    body: JSON.stringify({ left_run_id: leftRunId, right_run_id: rightRunId, ...options })
   });
   return parseJson<CompareResponse>(res);
 }
@@ -1,3 +1,13 @@
+export type PriorityClass = "interactive" | "ci" | "batch";
+
+export type RunTiming = {
+  version: number;
+  spans_ms: Record<string, number>;
+  total_ms: number;
+  overhead_ms: number;
+  attempt?: number;
+};
+
 export type Run = {
   id: string;
   backend: string;
@@ -14,11 +24,66 @@ export type Run = {
   result_json: Record<string, unknown> | null;
   artifact_key: string | null;
   error: string | null;
+  lease_owner: string | null;
+  lease_expires_at: string | null;
+  heartbeat_at: string | null;
+  attempt_count: number;
+  cache_key: string | null;
+  cached_from_run_id: string | null;
+  progress_json: Record<string, unknown> | null;
+  suite_id: string | null;
+  suite_case_index: number | null;
+  matrix_cell: Record<string, unknown> | null;
+  idempotency_key: string | null;
+  priority: PriorityClass;
+  submitter: string;
+  device_class: string | null;
+  queue_position: number | null;
+  timing_json: RunTiming | null;
+  warnings: string[];
   created_at: string;
   updated_at: string;
   completed_at: string | null;
 };
 
+export type RunSummary = {
+  id: string;
+  backend: string;
+  mode: string;
+  prompt_preview: string;
+  status: string;
+  score_input_hash: string | null;
+  mask_hash: string | null;
+  artifact_key: string | null;
+  error: string | null;
+  attempt_count: number;
+  cached_from_run_id: string | null;
+  suite_id: string | null;
+  priority: PriorityClass;
+  submitter: string;
+  score: number | null;
+  latency_ms: number | null;
+  throughput_items_per_s: number | null;
+  created_at: string;
+  updated_at: string;
+  completed_at: string | null;
+};
+
+export type RunPage = {
+  items: RunSummary[];
+  next_cursor: string | null;
+};
+
+export type RunEvent = {
+  id: number;
+  run_id: string;
+  event_type: string;
+  status: string | null;
+  payload: Record<string, unknown>;
+  created_at: string;
+  run: RunSummary | null;
+};
+
 export type TokenDiffRow = {
   index: number;
   token: string;
@@ -29,6 +94,19 @@ export type TokenDiffRow = {
   is_match: boolean;
 };
 
+export type TokenDiffWindow = {
+  mode: "range" | "first_divergence" | "top_k";
+  offset: number;
+  limit: number;
+};
+
+export type AbsDiffBucket = {
+  start: number;
+  end: number;
+  min: number;
+  max: number;
+};
+
 export type CompareResponse = {
   left_run_id: string;
   right_run_id: string;
@@ -51,6 +129,8 @@ export type CompareResponse = {
   max_token_abs_diff: number;
   mean_token_abs_diff: number;
   token_diffs: TokenDiffRow[];
+  token_diffs_window: TokenDiffWindow | null;
+  abs_diff_envelope: AbsDiffBucket[];
   token_loss_diff_summary: {
     pair_count: number;
     max_abs_nll_diff: number;